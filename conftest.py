@@ -0,0 +1,35 @@
+"""pytest ortak ayarları: betik "wab" modülü olarak yüklenir (import wab).
+
+Giriş noktası main() yalnızca __main__ altında çalışır; içe aktarmak GUI'yi
+ya da konsol modunu başlatmaz.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).with_name("whatsapp_bot.py")
+
+# Profil klasörü ilk kullanımda oluşturulur → gerçek ev dizinine dokunma
+os.environ.pop("APPDATA", None)
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="wab_test_home_")
+
+_spec = importlib.util.spec_from_file_location("wab", SCRIPT)
+_wab = importlib.util.module_from_spec(_spec)
+sys.modules["wab"] = _wab
+_spec.loader.exec_module(_wab)
+
+
+@pytest.fixture
+def profile(tmp_path, monkeypatch):
+    """Geçici profil klasörü; kalıcı depolar orada yeniden açılır."""
+    p = tmp_path / "whatsapp_profile"
+    p.mkdir()
+    monkeypatch.setattr(_wab, "_PROFILE", str(p))
+    monkeypatch.setattr(_wab, "_JOURNAL", None)
+    monkeypatch.setattr(_wab, "_NEG_CACHE", None)
+    return p
@@ -0,0 +1,126 @@
+"""CDPEngine, yerel sahte DevTools websocket sunucusuna karşı (tarayıcı gerekmez).
+
+Sunucu Runtime.evaluate çağrılarına numaraya göre yanıt verir:
+  900000000001 → geçersiz numara, 900000000002 → betik hatası (tıklanmış
+  olabilir → yeniden denenmez), 900000000003 → gönder düğmesi yok (URL
+  yedeğine düşülür; Page.navigate hata döndürür), diğerleri → gönderildi.
+websockets bir geliştirme bağımlılığıdır (pip install -r requirements-dev.txt).
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+import wab
+
+INVALID, BROKEN, NO_BUTTON = "900000000001", "900000000002", "900000000003"
+
+
+@pytest.fixture(scope="module")
+def devtools():
+    """Arka planda sahte DevTools sunucusu → {"url", "calls"}."""
+    calls, ready, state = [], threading.Event(), {}
+
+    async def handler(ws, *_):
+        async for raw in ws:
+            m = json.loads(raw)
+            calls.append(m["method"])
+            if m["method"] == "Runtime.evaluate":
+                expr = m["params"]["expression"]
+                if f'"{INVALID}"' in expr:
+                    res = {"result": {"value": {"status": "invalid", "reason": "popup"}}}
+                elif f'"{BROKEN}"' in expr:
+                    res = {"exceptionDetails": {"text": "boom"}}
+                elif f'"{NO_BUTTON}"' in expr:
+                    res = {"result": {"value": {"status": "no_button"}}}
+                else:
+                    await asyncio.sleep(0.02)
+                    res = {"result": {"value": {"status": "sent",
+                                                "clickedAt": time.time() * 1000,
+                                                "timings": {"confirm": 10}}}}
+                await ws.send(json.dumps({"id": m["id"], "result": res}))
+            elif m["method"] == "Page.navigate":
+                await ws.send(json.dumps({"id": m["id"], "error": {"message": "nav fail"}}))
+            else:
+                await ws.send(json.dumps({"id": m["id"], "result": {}}))
+
+    def serve():
+        async def main():
+            async with websockets.serve(handler, "127.0.0.1", 0) as server:
+                state["url"] = "ws://127.0.0.1:{}".format(server.sockets[0].getsockname()[1])
+                ready.set()
+                await asyncio.Future()
+        asyncio.run(main())
+
+    threading.Thread(target=serve, daemon=True).start()
+    assert ready.wait(10)
+    yield {"url": state["url"], "calls": calls}
+    if wab._CDP_ENGINE is not None:
+        wab.cdp_run(wab._CDP_ENGINE.close())
+        wab._CDP_ENGINE = None
+
+
+@pytest.fixture
+def engine(devtools, profile, monkeypatch):
+    monkeypatch.setattr(wab, "ENGINE", "cdp")
+    monkeypatch.setattr(wab, "_lane_drivers", lambda n: [object()] * n)
+    monkeypatch.setattr(wab, "_cdp_ws_url", lambda drv: devtools["url"])
+    devtools["calls"].clear()
+    return devtools
+
+
+def test_single_send(engine):
+    assert wab.send_single("+905551112233", "merhaba", 2, 0)
+
+
+def test_bulk_over_lanes(engine):
+    bad = ["+" + INVALID, "+" + BROKEN, "+" + NO_BUTTON]
+    nums = [f"+9055511{i:05d}" for i in range(40)] + bad
+    res = wab.send_bulk(nums, "merhaba", 1, 0, workers=4, campaign="cdp-bulk")
+    assert len(res) == 43 and sum(res.values()) == 40
+    assert not any(res[n] for n in bad)
+    assert "+" + INVALID in wab.get_negative_cache()
+    # yalnızca tıklamadan önce biten alıcı URL yedeğine düştü
+    assert engine["calls"].count("Page.navigate") == 1
+    assert wab.get_engine(4) is wab._CDP_ENGINE     # bağlantılar yeniden kullanılır
+
+
+def test_smaller_runs_reuse_the_engine(engine):
+    eng = wab.get_engine(3)
+    assert wab.get_engine(1) is eng and wab.get_engine(2) is eng
+    assert wab.send_single("+905551112244", "merhaba", 2, 0)
+    assert wab.get_engine() is eng                  # tek gönderim motoru yıkmaz
+
+    used = []
+
+    async def afn(_, lane, num, payload):
+        used.append(lane)
+        return True
+
+    items = [(f"+9055533{i:05d}", None) for i in range(12)]
+    wab.cdp_run(eng.run_stream(items, afn, lanes=2))
+    assert len(used) == 12 and set(used) <= {0, 1}
+    assert wab.get_engine(eng.size + 1) is not eng  # yalnızca büyütmek yeniden kurar
+
+
+def test_cancel_stops_new_recipients(engine):
+    cancel = threading.Event()
+    cancel.set()
+    res = wab.send_bulk([f"+9055522{i:05d}" for i in range(10)], "x", 1, 0,
+                        workers=2, campaign="cdp-cancel", cancel=cancel)
+    assert res == {}
+    assert "Runtime.evaluate" not in engine["calls"]
+
+
+def test_missing_websockets_falls_back(monkeypatch):
+    import importlib.util
+    real = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec",
+                        lambda name, *a: None if name == "websockets" else real(name, *a))
+    monkeypatch.setattr(wab, "ENGINE", "cdp")
+    assert not wab._use_cdp()
+    assert wab.ENGINE == "selenium"
@@ -0,0 +1,63 @@
+"""Sayfa içi gönderim betiği (_JS_SEND_IN_PAGE) node + sahte DOM ile; tarayıcı gerekmez.
+
+Sahte DOM test_send_in_page_dom.js içindedir; --bench'in sahte WhatsApp sayfası
+(_FAKE_WA_HTML) onun içinde çalışır. node yoksa test atlanır.
+"""
+
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import wab
+
+NODE = shutil.which("node")
+HARNESS = Path(__file__).with_name("test_send_in_page_dom.js")
+
+
+def _page_script() -> str:
+    cfg = {"app_ms": 0, "chat_ms": 5, "btn_ms": 5, "ack_ms": 10,
+           "invalid_prefix": wab.FAKE_WA_INVALID_PREFIX}
+    html = wab._FAKE_WA_HTML.replace("__CONFIG__", json.dumps(cfg))
+    return re.search(r"<script>(.*)</script>", html, re.S).group(1)
+
+
+@pytest.fixture(scope="module")
+def run():
+    if NODE is None:
+        pytest.skip("node yok")
+    data = json.dumps({"lib": wab._JS_LIB, "send": wab._JS_SEND_IN_PAGE,
+                       "page": _page_script()})
+    proc = subprocess.run([NODE, str(HARNESS)], input=data, capture_output=True,
+                          text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+# Sahte sayfada balon saat simgesiyle eklenir → doğrulama "pending" olur
+def test_sends_and_confirms(run):
+    assert run["first"] == {"status": "pending", "reason": "", "clicked": True}
+    assert run["second"] == {"status": "pending", "reason": "", "clicked": True}
+    assert run["draftAfterSend"] == ""
+    assert run["leaked"] == 0                    # gizli bağlantı sayfadan çıkarmadı
+
+
+def test_click_waits_for_not_before(run):
+    assert run["heldClick"] >= 140               # sohbet hazır, tıklama bekletildi
+    assert run["heldTimings"] == ["confirm", "gap", "open", "send", "type"]
+
+
+def test_invalid_number_is_not_clicked(run):
+    assert run["invalid"]["status"] == "invalid" and not run["invalid"]["clicked"]
+    assert "invalid" in run["invalid"]["reason"]
+    assert run["afterInvalid"] == {"status": "pending", "reason": "", "clicked": True}
+    assert run["posted"] == ["905550000001", "905550000002",
+                             "905550000003", "905550000005"]
+
+
+def test_notifications_banner_is_not_throttling(run):
+    assert run["throttled"] == 0                 # kalıcı bant yavaşlatmaz
+    assert run["signal"] == "rate_limit"
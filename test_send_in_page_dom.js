@@ -0,0 +1,230 @@
+// Sayfa içi gönderim betiğinin (_JS_SEND_IN_PAGE) tarayıcısız testi: küçük bir sahte DOM kurar, --bench'in sahte WhatsApp sayfasını içinde
+// çalıştırır ve betikleri execute_async_script gibi çağırır.
+// Girdi (stdin, JSON): {lib, send, page}; çıktı (stdout): JSON sonuçlar.
+// test_send_in_page.py tarafından çalıştırılır:  python -m pytest -q test_send_in_page.py
+'use strict';
+
+// ---- seçiciler: etiket, #id, .sınıf, [a='v'] / [a^='v'] / [a*='v'], boşlukla torun
+function parseSel(sel) {
+  return sel.split(',').map(s => s.trim().split(/\s+/).map(part => {
+    const c = {tag: null, id: null, cls: [], attrs: []};
+    const re = /^[a-z]+|#[\w-]+|\.[\w-]+|\[([\w-]+)(?:([\^*]?=)'([^']*)')?\]/gi;
+    let m;
+    while ((m = re.exec(part))) {
+      const t = m[0];
+      if (t[0] === '#') c.id = t.slice(1);
+      else if (t[0] === '.') c.cls.push(t.slice(1));
+      else if (t[0] === '[') c.attrs.push([m[1], m[2], m[3]]);
+      else c.tag = t.toLowerCase();
+    }
+    return c;
+  }));
+}
+
+function matchOne(el, c) {
+  if (!(el instanceof El)) return false;
+  if (c.tag && el.tagName !== c.tag) return false;
+  if (c.id && el.id !== c.id) return false;
+  for (const k of c.cls) if (!el.className.split(/\s+/).includes(k)) return false;
+  for (const [a, op, v] of c.attrs) {
+    const have = el.getAttribute(a);
+    if (have === null) return false;
+    if (op === '=' && have !== v) return false;
+    if (op === '^=' && !have.startsWith(v)) return false;
+    if (op === '*=' && !have.includes(v)) return false;
+  }
+  return true;
+}
+
+function matchChain(el, chain) {
+  if (!matchOne(el, chain[chain.length - 1])) return false;
+  let i = chain.length - 2;
+  for (let p = el.parent; p && i >= 0; p = p.parent) if (matchOne(p, chain[i])) i--;
+  return i < 0;
+}
+
+const matches = (el, sel) => parseSel(sel).some(ch => matchChain(el, ch));
+
+// ---- düğümler
+let observers = new Set(), flushing = false;
+function mutated() {
+  if (flushing) return;
+  flushing = true;
+  queueMicrotask(() => {
+    flushing = false;
+    for (const o of [...observers]) o.cb([]);
+  });
+}
+
+class El {
+  constructor(tag) {
+    this.tagName = tag.toLowerCase();
+    this.attrs = {};
+    this.children = [];
+    this.parent = null;
+    this.text = '';
+    this.listeners = {};
+    this.onclick = null;
+    this.style = {};
+  }
+  get id() { return this.attrs.id || ''; }
+  set id(v) { this.setAttribute('id', v); }
+  get className() { return this.attrs.class || ''; }
+  set className(v) { this.setAttribute('class', v); }
+  get href() { return this.attrs.href || ''; }
+  set href(v) { this.setAttribute('href', v); }
+  getAttribute(k) { return k in this.attrs ? this.attrs[k] : null; }
+  setAttribute(k, v) { this.attrs[k] = String(v); mutated(); }
+  get textContent() { return this.text + this.children.map(c => c.textContent).join(''); }
+  set textContent(v) {
+    for (const c of this.children) c.parent = null;
+    this.children = [];
+    this.text = String(v);
+    mutated();
+  }
+  appendChild(c) {
+    if (c.parent) c.remove();
+    c.parent = this;
+    this.children.push(c);
+    mutated();
+    return c;
+  }
+  append(...cs) { cs.forEach(c => this.appendChild(c)); }
+  remove() {
+    if (!this.parent) return;
+    this.parent.children = this.parent.children.filter(c => c !== this);
+    this.parent = null;
+    mutated();
+  }
+  replaceWith(n) {
+    const p = this.parent;
+    if (n.parent) n.remove();
+    p.children[p.children.indexOf(this)] = n;
+    n.parent = p;
+    this.parent = null;
+    mutated();
+  }
+  *walk() { for (const c of this.children) { yield c; yield* c.walk(); } }
+  querySelectorAll(sel) { return [...this.walk()].filter(e => matches(e, sel)); }
+  querySelector(sel) { return this.querySelectorAll(sel)[0] || null; }
+  closest(sel) {
+    for (let e = this; e instanceof El; e = e.parent) if (matches(e, sel)) return e;
+    return null;
+  }
+  addEventListener(type, fn, opts) {
+    (this.listeners[type] = this.listeners[type] || []).push({fn, once: !!(opts && opts.once)});
+  }
+  dispatchEvent(ev) {
+    ev.target = ev.target || this;
+    const path = [];
+    for (let e = this; e; e = e.parent) path.push(e);
+    path.push(document, window);
+    for (const node of path) {
+      fire(node, ev);
+      if (!ev.bubbles) break;
+    }
+    return !ev.defaultPrevented;
+  }
+  click() {
+    if (this.onclick) this.onclick();
+    const ev = new Event('click', {bubbles: true});
+    this.dispatchEvent(ev);
+    clicks.push({tag: this.tagName, href: this.href, prevented: ev.defaultPrevented});
+  }
+  focus() { document.activeElement = this; }
+}
+
+function fire(node, ev) {
+  const ls = node.listeners[ev.type] || [];
+  node.listeners[ev.type] = ls.filter(l => !l.once);
+  for (const l of ls) l.fn(ev);
+}
+
+class Event {
+  constructor(type, init = {}) {
+    this.type = type;
+    this.bubbles = !!init.bubbles;
+    this.defaultPrevented = false;
+    this.clipboardData = init.clipboardData;
+  }
+  preventDefault() { this.defaultPrevented = true; }
+}
+
+const clicks = [], posted = [];
+const body = new El('body');
+const document = {
+  body, listeners: {}, activeElement: null,
+  createElement: t => new El(t),
+  getElementById: id => body.id === id ? body : body.querySelector('#' + id),
+  querySelector: s => body.querySelector(s),
+  querySelectorAll: s => body.querySelectorAll(s),
+  addEventListener: El.prototype.addEventListener,
+  execCommand(cmd, _, value) {
+    const el = document.activeElement;
+    if (!el) return false;
+    if (cmd === 'delete') el.textContent = '';
+    else if (cmd === 'insertText') el.textContent += value;
+    else return cmd === 'selectAll';
+    fire(el, new Event('input'));
+    return true;
+  },
+};
+const window = {listeners: {}, addEventListener: El.prototype.addEventListener};
+Object.assign(globalThis, {
+  document, window, Event,
+  navigator: {onLine: true},
+  location: {search: '', pathname: '/'},
+  fetch: (url, opts) => { posted.push(opts.body); return Promise.resolve(); },
+  MutationObserver: class {
+    constructor(cb) { this.cb = cb; }
+    observe() { observers.add(this); }
+    disconnect() { observers.delete(this); }
+  },
+  DataTransfer: class {
+    constructor() { this.d = {}; }
+    setData(k, v) { this.d[k] = v; }
+    getData(k) { return this.d[k] || ''; }
+  },
+  ClipboardEvent: Event,
+});
+
+// ---- sahte sayfa + execute_async_script benzeri çağrı
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const appDiv = body.appendChild(new El('div'));
+appDiv.id = 'app';
+new Function(input.page)();
+
+const run = (script, ...args) => new Promise(done => new Function(input.lib + script)(...args, done));
+const results = [];
+const send = (phone, text, notBefore) =>
+  run(input.send, phone, text, 2000, notBefore || 0).then(r => (results.push(r), r));
+const sleep = ms => new Promise(r => setTimeout(r, ms));
+const draft = () => {
+  const box = document.querySelector("#main footer div[role='textbox']");
+  return box ? box.textContent : null;
+};
+const brief = r => ({status: r.status, reason: r.reason || '', clicked: r.clickedAt > 0});
+
+(async () => {
+  const out = {};
+  await sleep(20);                                          // uygulama açılsın
+  // --disable-notifications altında hep görünen "bildirimleri aç" bandı
+  body.appendChild(new El('div')).setAttribute('data-testid', 'alert-notification');
+  out.first = brief(await send('905550000001', 'bir'));
+  out.draftAfterSend = draft();                             // gönderilen metin kutuda kalmaz
+  out.second = brief(await send('905550000002', 'iki'));
+  // notBefore: sohbet hemen açılıp yazılır, tıklama o ana kadar bekletilir
+  const t0 = Date.now(), r = await send('905550000003', 'üç', t0 + 150);
+  out.heldClick = r.clickedAt - t0;
+  out.heldTimings = Object.keys(r.timings).sort();
+  out.invalid = brief(await send('999000000004', 'dört'));
+  out.afterInvalid = brief(await send('905550000005', 'beş'));
+  out.posted = posted;
+  out.throttled = results.filter(r => r.throttled).length;
+  const toast = body.appendChild(new El('div'));
+  toast.setAttribute('role', 'alert');
+  toast.textContent = 'Too many requests. Try again later.';
+  out.signal = await run('arguments[arguments.length - 1](__wab.throttled());');
+  out.leaked = clicks.filter(c => c.tag === 'a' && !c.prevented).length;
+  process.stdout.write(JSON.stringify(out));
+})().catch(e => { console.error(e); process.exit(1); });
@@ -0,0 +1,852 @@
+"""Betiğin tarayıcı gerektirmeyen mantığı için testler.
+
+    python -m pytest -q
+"""
+
+import http.client
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+
+import pytest
+
+import wab
+
+
+# ------------------------------------------------------------
+# Scheduler
+# ------------------------------------------------------------
+def test_scheduler_runs_in_time_order():
+    s, ran = wab.Scheduler(), []
+    now = time.time()
+    late = s.schedule(now + 0.2, ran.append, "late")
+    early = s.schedule(now + 0.05, ran.append, "early")
+    past = s.schedule(now - 10, ran.append, "past")
+    for job in (past, early, late):
+        job.future.result(timeout=5)
+    assert ran == ["past", "early", "late"]
+    assert s.wait(timeout=5)
+
+
+def test_scheduler_cancel_and_errors():
+    s, ran = wab.Scheduler(), []
+    job = s.schedule(time.time() + 0.2, ran.append, "cancelled")
+    assert s.cancel(job.id)
+    assert not s.cancel(job.id)
+    assert job.future.cancelled()
+
+    def boom():
+        raise ValueError("x")
+
+    bad = s.schedule(time.time(), boom, name="boom")
+    with pytest.raises(ValueError):
+        bad.future.result(timeout=5)
+    ok = s.schedule(time.time(), lambda: 42)
+    assert ok.future.result(timeout=5) == 42
+    assert ran == [] and s.list_pending() == []
+
+
+def test_warm_up_runs_off_the_dispatcher(monkeypatch):
+    monkeypatch.setattr(wab, "_SCHEDULER", wab.Scheduler())
+    release = threading.Event()
+    monkeypatch.setattr(wab, "warm_up", lambda timeout, alert: release.wait(5))
+    try:
+        wab.schedule_warm_up(time.time(), lead=0)
+        send = wab.get_scheduler().schedule(time.time(), lambda: 42)
+        assert send.future.result(timeout=2) == 42   # ısıtma sürerken iş çalıştı
+    finally:
+        release.set()
+
+
+def test_warm_up_probes_under_send_lock(monkeypatch):
+    owned = []
+    monkeypatch.setattr(wab, "get_driver", object)
+    monkeypatch.setattr(wab, "probe_session",
+                        lambda drv: owned.append(wab._SEND_LOCK._is_owned()) or "ready")
+    assert wab.warm_up(timeout=5) == "ready" and owned == [True]
+
+    held, done = threading.Event(), threading.Event()
+
+    def sender():
+        with wab._SEND_LOCK:
+            held.set()
+            done.wait(5)
+
+    threading.Thread(target=sender, daemon=True).start()
+    held.wait(5)
+    try:
+        assert wab.warm_up(timeout=5) == "busy"      # gönderim sürerken tarayıcıya dokunmaz
+    finally:
+        done.set()
+    assert owned == [True]
+
+
+# ------------------------------------------------------------
+# Journal / devam ettirme
+# ------------------------------------------------------------
+def test_journal_completed(tmp_path):
+    j = wab.Journal(tmp_path / "j.sqlite3")
+    h = wab._msg_hash("a", "b")
+    j.record("c1", "905551112233", h, "sent", time.time())
+    j.record("c1", "905551112234", h, "failed", time.time())
+    j.record("c2", "905551112235", h, "sent", time.time())
+    assert j.completed("c1", h) == {"905551112233"}
+    assert j.completed("c1", wab._msg_hash("a")) == set()
+    # yeniden açılınca kayıtlar yerinde
+    assert wab.Journal(tmp_path / "j.sqlite3").completed("c2", h) == {"905551112235"}
+
+
+def test_journal_sent_messages_per_index(tmp_path):
+    j = wab.Journal(tmp_path / "j.sqlite3")
+    ha, hb = wab._msg_hash("a"), wab._msg_hash("b")
+    j.record("c1", "905551112234", ha, "sent", time.time(), index=1)
+    j.record("c1", "905551112234", hb, "failed", time.time(), index=2)
+    assert j.sent_messages("c1", "905551112234", [ha, hb]) == {1}
+    # 1. mesajın metni değiştiyse o sıra gönderilmiş sayılmaz
+    assert j.sent_messages("c1", "905551112234", [hb, hb]) == set()
+    # mesaj bazlı satırlar alıcı düzeyindeki sonuca karışmaz
+    assert j.completed("c1", ha) == set()
+
+
+def test_journal_migrates_old_schema(tmp_path):
+    path = tmp_path / "j.sqlite3"
+    con = sqlite3.connect(str(path))
+    con.execute("CREATE TABLE sends (id INTEGER PRIMARY KEY, campaign TEXT NOT NULL,"
+                " recipient TEXT NOT NULL, msg_hash TEXT NOT NULL, status TEXT NOT NULL,"
+                " started REAL NOT NULL, finished REAL NOT NULL)")
+    con.execute("INSERT INTO sends (campaign, recipient, msg_hash, status, started, finished)"
+                " VALUES ('c', '905551112233', 'h', 'sent', 0, 0)")
+    con.commit()
+    con.close()
+    assert wab.Journal(path).completed("c", "h") == {"905551112233"}
+
+
+def test_resume_skips_delivered_messages(profile, monkeypatch):
+    calls = []
+
+    def fake_multi(number, messages, *args, skip=(), on_message=None, **kw):
+        calls.append(set(skip))
+        ok = True
+        for i in range(1, len(messages) + 1):
+            if i not in skip:
+                sent = len(calls) > 1 or i == 1          # ilk turda 2. mesaj başarısız
+                on_message(i, sent, time.time())
+                ok = ok and sent
+        return ok
+
+    monkeypatch.setattr(wab, "send_multi", fake_multi)
+    assert not wab._journaled_multi("camp", True)("905551112233", ["bir", "iki"])
+    assert wab._journaled_multi("camp", True)("905551112233", ["bir", "iki"])
+    assert calls == [set(), {1}]
+
+
+def test_campaign_id_is_stable():
+    a = wab.campaign_id(["1", "2"], ["m"])
+    assert a == wab.campaign_id(["1", "2"], ["m"])
+    assert a != wab.campaign_id(["2", "1"], ["m"])
+    assert a != wab.campaign_id(["1", "2"], ["m", ""])
+
+
+def test_run_bulk_resume_skips_sent(profile):
+    nums = [f"9055511122{i:02d}" for i in range(5)]
+    first = wab._run_bulk(nums, lambda n: n != nums[2], 1, "camp", "h", resume=True)
+    assert sum(first.values()) == 4 and first[nums[2]] is False
+
+    again = wab._run_bulk(nums, lambda n: True, 1, "camp", "h", resume=True)
+    assert again == {nums[2]: True}
+    # resume=False → hepsi yeniden
+    assert len(wab._run_bulk(nums, lambda n: True, 1, "camp", "h", resume=False)) == 5
+
+
+# ------------------------------------------------------------
+# ContactStore
+# ------------------------------------------------------------
+def test_contact_store_crud_and_tags(tmp_path):
+    store = wab.ContactStore(tmp_path / "c.sqlite3", legacy_json=tmp_path / "none.json")
+    assert store.add("905551112233", "Ali", tags=("vip",))
+    assert not store.add("905551112233", "Başka")
+    assert store.add("905551112234", "Ayşe")
+    store.tag("905551112234", "ekip", "vip")
+    assert "905551112234" in store and len(store) == 2
+    assert store.numbers("vip") == ["905551112233", "905551112234"]
+    assert store.tags() == ["ekip", "vip"]
+    store.untag("905551112234", "vip")
+    assert store.numbers("vip") == ["905551112233"]
+    assert store.remove("905551112233") and not store.remove("905551112233")
+    assert store.numbers() == ["905551112234"] and store.numbers("vip") == []
+
+
+def test_contact_store_migrates_legacy_json(tmp_path):
+    legacy = tmp_path / "contacts.json"
+    legacy.write_text(json.dumps(["905551112233", "905551112234"]), encoding="utf-8")
+    store = wab.ContactStore(tmp_path / "c.sqlite3", legacy_json=legacy)
+    assert store.numbers() == ["905551112233", "905551112234"]
+    assert not legacy.exists() and (tmp_path / "contacts.json.bak").exists()
+
+
+def test_save_contacts_writes_only_differences(tmp_path, monkeypatch):
+    store = wab.ContactStore(tmp_path / "c.sqlite3", legacy_json=tmp_path / "none.json")
+    monkeypatch.setattr(wab, "_CONTACTS", store)
+    store.add("905551112233", "Ali")
+    wab.save_contacts(["905551112233", "905551112234"])
+    wab.save_contacts(["905551112234", "905551112233"])
+    assert wab.load_contacts() == ["905551112233", "905551112234"]
+    assert store.add("905551112233") is False       # isim korunarak yerinde kaldı
+    wab.save_contacts(["905551112234"])
+    assert wab.load_contacts() == ["905551112234"]
+
+
+# ------------------------------------------------------------
+# CSV / VCF içe ve dışa aktarma
+# ------------------------------------------------------------
+@pytest.fixture
+def store(tmp_path):
+    return wab.ContactStore(tmp_path / "c.sqlite3", legacy_json=tmp_path / "none.json")
+
+
+def test_import_csv_with_header_and_semicolons(tmp_path, store):
+    src = tmp_path / "rehber.csv"
+    src.write_text("Ad;Telefon\nAli;+90 555 111 22 33\nAyşe;905551112234\n"
+                   "Tekrar;905551112233\nBozuk;12\n", encoding="utf-8-sig")
+    stats = wab.import_contacts(src, store, tags=("ekip",), chunk=2)
+    assert stats == {"read": 4, "added": 2, "duplicate": 1, "invalid": 1}
+    assert list(store.iter_rows()) == [("905551112233", "Ali"), ("905551112234", "Ayşe")]
+    assert store.numbers("ekip") == ["905551112233", "905551112234"]
+
+
+def test_import_headerless_csv(tmp_path, store):
+    src = tmp_path / "liste.csv"
+    src.write_text("905551112233,Ali\n905551112234,Ayşe\n", encoding="utf-8")
+    assert wab.import_contacts(src, store)["added"] == 2
+    assert list(store.iter_rows()) == [("905551112233", "Ali"), ("905551112234", "Ayşe")]
+
+
+def test_export_and_reimport_round_trip(tmp_path, store):
+    store.add_many([("905551112233", "Ali"), ("905551112234", "")], tags=("vip",))
+    for name in ("out.csv", "out.vcf"):
+        out = tmp_path / name
+        assert wab.export_contacts(out, store, tag="vip") == 2
+        other = wab.ContactStore(tmp_path / (name + ".sqlite3"),
+                                 legacy_json=tmp_path / "none.json")
+        assert wab.import_contacts(out, other)["added"] == 2
+        rows = dict(other.iter_rows())
+        assert rows["905551112233"] == "Ali"
+        # isimsiz kişi vCard'da numarasıyla yazılır
+        assert rows["905551112234"] in ("", "+905551112234")
+
+
+def test_import_excel_cp1254_csv(tmp_path, store, monkeypatch):
+    import locale
+    monkeypatch.setattr(locale, "getpreferredencoding", lambda *a: "UTF-8")
+    src = tmp_path / "excel.csv"
+    src.write_bytes("Ad;Telefon\nŞükrü Çığ;905551112233\n".encode("cp1254"))
+    assert wab.import_contacts(src, store)["added"] == 1
+    assert list(store.iter_rows()) == [("905551112233", "Şükrü Çığ")]
+
+
+def test_vcard_name_escape_round_trip(tmp_path, store):
+    tricky = "Yılmaz, Ali; \\ofis\nŞube"
+    store.add("905551112233", tricky)
+    out = tmp_path / "out.vcf"
+    wab.export_contacts(out, store)
+    assert "FN:Yılmaz\\, Ali\\; \\\\ofis\\nŞube" in out.read_text(encoding="utf-8")
+    other = wab.ContactStore(tmp_path / "o.sqlite3", legacy_json=tmp_path / "none.json")
+    wab.import_contacts(out, other)
+    assert dict(other.iter_rows())["905551112233"] == tricky
+
+
+# ------------------------------------------------------------
+# NegativeCache
+# ------------------------------------------------------------
+def test_negative_cache_ttl_expiry(tmp_path, monkeypatch):
+    neg = wab.NegativeCache(tmp_path / "n.sqlite3", ttl_days=1)
+    neg.add("905551112233", "invalid")
+    assert "905551112233" in neg and "905551112234" not in neg
+    now = time.time()
+    monkeypatch.setattr(wab.time, "time", lambda: now + 86400 - 60)
+    assert "905551112233" in neg
+    monkeypatch.setattr(wab.time, "time", lambda: now + 86400 + 60)
+    assert "905551112233" not in neg                 # süre doldu → yeniden denenir
+
+
+def test_run_bulk_skips_cached_invalid(profile):
+    wab.get_negative_cache().add("905551112201", "invalid")
+    sent = []
+    res = wab._run_bulk(["905551112200", "905551112201"],
+                        lambda n: sent.append(n) or True, 1, "neg", "h", False)
+    assert sent == ["905551112200"] and "905551112201" not in res
+
+
+# ------------------------------------------------------------
+# RateLimiter (AIMD)
+# ------------------------------------------------------------
+def test_rate_limiter_doubles_on_trouble_and_caps():
+    lim = wab.RateLimiter(1.5, max_interval=10)
+    lim.feedback(False)
+    assert lim.interval == 3.0
+    lim.feedback(True, throttled=True)
+    assert lim.interval == 6.0
+    lim.feedback(True, confirm_ms=wab.SLOW_CONFIRM_MS + 1)
+    assert lim.interval == 10                         # tavan
+    # taban 0 olsa bile ilk artış en az 1 sn
+    zero = wab.RateLimiter(0)
+    zero.feedback(False)
+    assert zero.interval == 1.0
+
+
+def test_rate_limiter_decays_to_floor():
+    lim = wab.RateLimiter(1.0, max_interval=10)
+    for _ in range(3):
+        lim.feedback(False)
+    assert lim.interval == 8.0
+    steps = 0
+    while lim.interval > lim.min_interval:
+        lim.feedback(True, confirm_ms=100)
+        steps += 1
+    assert lim.interval == 1.0
+    assert steps == round((8.0 - 1.0) / wab.AIMD_STEP_SEC)
+    lim.feedback(True)
+    assert lim.interval == 1.0                        # tabanın altına inmez
+
+
+def test_rate_limiter_next_at_follows_last_click():
+    lim = wab.RateLimiter(2.0)
+    lim.sent(1000.0)
+    assert lim.next_at() == 1002.0
+    lim.feedback(False)
+    assert lim.next_at() == 1004.0
+
+
+# ------------------------------------------------------------
+# Gönderim servisi (HTTP API)
+# ------------------------------------------------------------
+@pytest.fixture
+def daemon(monkeypatch, profile):
+    """Tarayıcısız servis: send_bulk_multi her alıcıyı başarılı sayar."""
+    calls = []
+
+    def fake_bulk(numbers, messages, wait_sec, gap_sec, workers=1, resume=False,
+                  cancel=None, progress=None):
+        calls.append((list(numbers), list(messages)))
+        for n in numbers:
+            progress(n, True)
+
+    monkeypatch.setattr(wab, "send_bulk_multi", fake_bulk)
+    monkeypatch.setattr(wab, "warm_up", lambda *a, **k: "ready")   # "at" işleri Chrome açmasın
+    d = wab.SenderDaemon()
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((wab.DAEMON_HOST, 0),
+                                 wab._daemon_handler(d, wab._new_daemon_token()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], calls
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_status(port, job_id, want, timeout=5):
+    end = time.time() + timeout
+    while time.time() < end:
+        job = wab.daemon_request("GET", f"/jobs/{job_id}", port=port)
+        if job["status"] == want:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"iş {job_id}: {job['status']} (beklenen {want})")
+
+
+def test_daemon_runs_and_lists_jobs(daemon):
+    port, calls = daemon
+    assert wab.daemon_request("GET", "/health", port=port)["ok"]
+    job = wab.daemon_request("POST", "/jobs", {"numbers": ["905551112233", "905551112234"],
+                                               "messages": ["merhaba"]}, port=port)
+    assert job["total"] == 2
+    done = _wait_status(port, job["id"], "done")
+    assert done["sent"] == 2 and done["failed"] == 0
+    assert calls == [(["905551112233", "905551112234"], ["merhaba"])]
+    assert [j["id"] for j in wab.daemon_request("GET", "/jobs", port=port)] == [job["id"]]
+
+
+def test_daemon_cancels_queued_job(daemon):
+    port, calls = daemon
+    job = wab.daemon_request("POST", "/jobs", {"numbers": ["905551112233"], "messages": ["x"],
+                                               "at": time.time() + 60}, port=port)
+    assert wab.daemon_request("DELETE", f"/jobs/{job['id']}", port=port)["status"] == "cancelled"
+    assert calls == []
+
+
+def test_daemon_rejects_bad_requests(daemon):
+    port, _ = daemon
+    for method, path, body, code in (("POST", "/jobs", {"numbers": []}, 400),
+                                     ("POST", "/jobs", {"numbers": ["1"], "messages": ["x"],
+                                                        "bogus": 1}, 400),
+                                     ("POST", "/jobs", [], 400),
+                                     ("POST", "/jobs", "x", 400),
+                                     ("POST", "/jobs", 1, 400),
+                                     ("POST", "/other", {}, 404),
+                                     ("GET", "/jobs/99", None, 404),
+                                     ("DELETE", "/jobs/99", None, 404)):
+        with pytest.raises(urllib.error.HTTPError) as e:
+            wab.daemon_request(method, path, body, port=port)
+        assert e.value.code == code, (method, path)
+
+
+def _raw(port, method, path, body=b"", headers=None):
+    """Başlıkları elle verilen istek → HTTP durum kodu."""
+    conn = http.client.HTTPConnection(wab.DAEMON_HOST, port, timeout=5)
+    headers = headers or {}
+    conn.putrequest(method, path, skip_host="Host" in headers, skip_accept_encoding=True)
+    for k, v in headers.items():
+        conn.putheader(k, v)
+    conn.putheader("Content-Length", str(len(body)))
+    conn.endheaders(body)
+    status = conn.getresponse().status
+    conn.close()
+    return status
+
+
+def test_daemon_requires_token_and_local_origin(daemon, profile):
+    port, calls = daemon
+    token = (profile / "daemon.token").read_text()
+    auth = {"Authorization": f"Bearer {token}"}
+    job = json.dumps({"numbers": ["905551112233"], "messages": ["x"]}).encode()
+    assert _raw(port, "GET", "/health", headers=auth) == 200
+    assert _raw(port, "GET", "/health") == 401
+    assert _raw(port, "GET", "/health", headers={"Authorization": "Bearer yanlis"}) == 401
+    assert _raw(port, "GET", "/health", headers={**auth, "Host": "evil.example:80"}) == 403
+    assert _raw(port, "GET", "/health",
+                headers={**auth, "Origin": f"http://127.0.0.1:{port}"}) == 403
+    # tarayıcının ön denetimsiz gönderebildiği gövde türleri
+    assert _raw(port, "POST", "/jobs", job, {**auth, "Content-Type": "text/plain"}) == 415
+    assert _raw(port, "POST", "/jobs", job, {**auth, "Origin": "null",
+                                             "Content-Type": "application/json"}) == 403
+    assert _raw(port, "POST", "/jobs", b"{bozuk", {**auth, "Content-Type": "application/json"}) == 400
+    assert _raw(port, "DELETE", "/jobs/1") == 401
+    assert calls == []
+
+
+# ------------------------------------------------------------
+# send_single: URL yedeği yalnızca mesaj kesin gitmediyse
+# ------------------------------------------------------------
+@pytest.mark.parametrize("status, clicked_at, fallback", [
+    ("no_app", 0, True), ("driver_lost", 0, True), ("open_failed", 0, True),
+    ("type_failed", 0, True), ("no_button", 0, True),
+    ("error", 0, False),                        # betik hatası: tıklanmış olabilir
+    ("no_button", 1e9, False),                  # tıklama kaydı var
+])
+def test_send_single_falls_back_only_before_click(monkeypatch, status, clicked_at, fallback):
+    monkeypatch.setattr(wab, "NAV_MODE", "inpage")
+    monkeypatch.setattr(wab, "ENGINE", "selenium")
+    monkeypatch.setattr(wab._TLS, "inpage_fails", 0, raising=False)
+    monkeypatch.setattr(wab, "send_in_page", lambda num, *a, **k: wab.SendResult(
+        num, status, clicked_at=clicked_at))
+    opened = []
+    monkeypatch.setattr(wab, "_open_chat", lambda num, *a, **k: opened.append(num))
+    monkeypatch.setattr(wab, "_wait_and_send", lambda *a: True)
+    assert wab.send_single("905551112233", "x", 1, 0) is fallback
+    assert opened == (["905551112233"] if fallback else [])
+
+
+# ------------------------------------------------------------
+# Metrics
+# ------------------------------------------------------------
+def test_metrics_prometheus_text_format():
+    m = wab.Metrics(buckets=(10, 100))
+    for ms in (5, 10, 50, 500):
+        m.observe("open", ms)
+    m.observe("open", float("nan"))                  # yok sayılır
+    m.observe("open", True)
+    m.inc("sent", 3)
+    assert m.prometheus().splitlines() == [
+        "# TYPE wab_stage_latency_ms histogram",
+        'wab_stage_latency_ms_bucket{stage="open",le="10"} 2',
+        'wab_stage_latency_ms_bucket{stage="open",le="100"} 3',
+        'wab_stage_latency_ms_bucket{stage="open",le="+Inf"} 4',
+        'wab_stage_latency_ms_sum{stage="open"} 565.0',
+        'wab_stage_latency_ms_count{stage="open"} 4',
+        "# TYPE wab_sent_total counter",
+        "wab_sent_total 3",
+    ]
+
+
+def test_metrics_summary_percentiles_and_children():
+    parent, camp = wab.Metrics(), wab.Metrics(keep_samples=True)
+    parent.attach(camp)
+    for ms in range(1, 101):                         # 1..100 ms
+        parent.observe("message", ms)
+    parent.inc("sent")
+    parent.detach(camp)
+    parent.observe("message", 1000)                  # ayrıldıktan sonra alt toplayıcıya gitmez
+
+    st = camp.summary()
+    assert st["counters"] == {"sent": 1}
+    assert st["stages"]["message"] == {"count": 100, "mean_ms": 50.5,
+                                       "p50_ms": 51, "p95_ms": 96, "p99_ms": 100}
+    # ham ölçüm tutmayan toplayıcıda yüzdelik yok
+    assert parent.summary()["stages"]["message"] == {"count": 101, "mean_ms": 59.9}
+
+
+def test_metrics_write_prometheus(tmp_path):
+    m = wab.Metrics()
+    m.inc("driver_launch")
+    m.write_prometheus(tmp_path / "metrics.prom")
+    assert "wab_driver_launch_total 1" in (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+    assert not (tmp_path / "metrics.tmp").exists()
+
+
+# ------------------------------------------------------------
+# Başlangıç: içe aktarma ağır bağımlılıkları yüklemez
+# ------------------------------------------------------------
+def test_import_is_lean():
+    code = ("import importlib.util, sys\n"
+            f"spec = importlib.util.spec_from_file_location('wab', {str(wab.__file__)!r})\n"
+            "mod = sys.modules['wab'] = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(mod)\n"
+            "print(sorted({'selenium', 'undetected_chromedriver', 'tkinter', 'sqlite3', 'csv',"
+            " 'hashlib', 'logging', 'inspect'} & set(sys.modules)))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "[]"
+
+
+def test_missing_selenium_raises_instead_of_exiting(monkeypatch):
+    monkeypatch.setattr(wab, "uc", None)
+    monkeypatch.setitem(sys.modules, "undetected_chromedriver", None)   # ImportError
+    with pytest.raises(RuntimeError, match="pip install undetected-chromedriver"):
+        wab._load_selenium()
+
+
+def test_launcher_help():
+    launcher = os.path.join(os.path.dirname(wab.__file__), wab.LAUNCHER)
+    out = subprocess.run([sys.executable, launcher, "--help"], capture_output=True,
+                         text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.startswith(f"Kullanım: python {wab.LAUNCHER}")
+
+
+# ------------------------------------------------------------
+# ProgressStats
+# ------------------------------------------------------------
+def test_progress_stats_rate_eta_and_text(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(wab.time, "time", lambda: now[0])
+    st = wab.ProgressStats(total=10, window=10)
+    assert st.rate() == 0.0 and st.eta() is None
+    assert st.text().endswith("kalan ≈ --:--:--")
+
+    for i in range(4):                               # 2 sn'de 4 alıcı, biri hatalı
+        now[0] += 0.5
+        st.add(ok=i != 2)
+    assert (st.done, st.failed) == (4, 1)
+    assert st.rate() == 2.0 and st.eta() == 3.0
+    assert st.text() == "4/10  ·  1 hata  ·  120.0 alıcı/dk  ·  kalan ≈ 00:00:03"
+
+    now[0] += 20                                     # pencere dışına düşenler unutulur
+    assert st.rate() == 0.0 and st.eta() is None
+
+
+def test_progress_stats_update_with_absolute_counts(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(wab.time, "time", lambda: now[0])
+    st = wab.ProgressStats(total=5, window=10)
+    now[0] = 5.0
+    st.update(3, 0)
+    st.update(3, 1)                                  # aynı sayı → yeni ölçüm yok
+    assert (st.done, st.failed) == (3, 1)
+    assert st.rate() == 0.6
+
+
+# ------------------------------------------------------------
+# SortedIndex / RecipientList
+# ------------------------------------------------------------
+def test_sorted_index_add_prefix_and_remove():
+    idx = wab.SortedIndex(["905551", "905330", "905559"])
+    assert idx.add("905552") == 2
+    assert idx.add("905552") is None                 # tekrar
+    assert idx.prefix("90555") == ["905551", "905552", "905559"]
+    assert idx.prefix("") == idx.items and len(idx) == 4
+    assert idx.prefix("91") == []
+    assert idx.remove_many(["905551"]) == 1          # tek kayıt: bisect yolu
+    assert idx.remove_many(["905330", "905559", "000"]) == 2
+    assert idx.items == ["905552"]
+
+
+def test_recipient_list_keeps_order_and_dedupes():
+    rl = wab.RecipientList()
+    assert rl.add_many(["3", "1", "3", "", "2"]) == 3
+    assert rl.numbers() == ["3", "1", "2"] and rl[1:] == ["1", "2"]
+    assert "1" in rl and "4" not in rl
+    assert rl.remove_many(["1", "4"]) == 1
+    assert rl.numbers() == ["3", "2"] and "1" not in rl
+    assert rl.add_many(["1"]) == 1 and rl.numbers() == ["3", "2", "1"]
+    rl.clear()
+    assert len(rl) == 0 and rl.add_many(["3"]) == 1
+
+
+def test_contact_store_remove_many(store):
+    store.add("905551112233")
+    store.add("905551112244")
+    assert store.remove_many(["905551112233", "905551112244", "905550000000"]) == 2
+    assert len(store) == 0
+
+
+# ------------------------------------------------------------
+# MessageTemplate / kayıt akışları
+# ------------------------------------------------------------
+def test_template_render_fields_and_escapes():
+    t = wab.MessageTemplate("Merhaba {Name}, {{kod}} {code}!")
+    assert t.fields == ("name", "code")
+    assert t.render({"name": "Ayşe", "code": 7}) == "Merhaba Ayşe, {kod} 7!"
+    assert t.render({"name": "Ayşe"}) == "Merhaba Ayşe, {kod} !"
+    assert t.missing(["NAME", "phone"]) == ["code"]
+
+
+def test_template_quoted_matches_render():
+    t = wab.MessageTemplate("Sayın {name} & {{ekip}}: %100 {x}")
+    row = {"name": "Çağrı Ö/ç", "x": "a+b #1"}
+    assert t.quoted(row) == urllib.parse.quote(t.render(row))
+    plain = wab.MessageTemplate("düz metin")
+    assert plain.render({}) == "düz metin"
+    assert plain.quoted({}) == urllib.parse.quote("düz metin")
+
+
+def test_with_contact_names_fills_from_store(store):
+    store.add("905551112244", "Ayşe")
+    recs = [("905551112233", {"name": "Ali"}), ("905551112244", {}), ("905551112255", {})]
+    assert list(wab.with_contact_names(recs, store, batch=2)) == [
+        ("905551112233", {"name": "Ali"}), ("905551112244", {"name": "Ayşe"}),
+        ("905551112255", {"name": ""})]
+
+
+def test_send_bulk_template_renders_and_checks_fields(profile, monkeypatch):
+    sent = []
+    monkeypatch.setattr(wab, "send_single", lambda num, text, *a: sent.append((num, text)) or True)
+    recs = [("905551112233", {"name": "Ali", "kod": "A1"}),
+            ("905551112244", {"name": "Ayşe", "kod": "B2"})]
+    stats = wab.send_bulk_template("{name}: {kod}", recs, 0, 0, campaign="tpl")
+    assert stats == {"sent": 2, "failed": 0, "skipped": 0}
+    assert sent == [("905551112233", "Ali: A1"), ("905551112244", "Ayşe: B2")]
+
+    # yazım hatalı alan: hiçbir şey gönderilmeden hata
+    sent.clear()
+    with pytest.raises(ValueError, match=r"\{nmae\}"):
+        wab.send_bulk_template("Selam {nmae}", recs, 0, 0, campaign="tpl2")
+    assert sent == []
+
+
+def test_check_template_fields():
+    tpls = [wab.MessageTemplate("{name}"), wab.MessageTemplate("{code} {Plan}")]
+    wab.check_template_fields(tpls, ["name", "code", "plan"])
+    with pytest.raises(ValueError, match=r"\{code\}, \{plan\}"):
+        wab.check_template_fields(tpls, ["name"])
+
+
+def test_read_recipient_rows_fields_and_names():
+    cols, rows = wab.read_recipient_rows(["0555 111 22 33 Ali Veli\n", "05551112244;Ayşe\n"])
+    assert cols == ["name"]
+    assert list(rows) == [("0555 111 22 33", {"name": "Ali Veli"}),
+                          ("05551112244", {"name": "Ayşe"})]
+    cols, rows = wab.read_recipient_rows(["Telefon,Ad,Kod\n", "05551112233,Ali,A1\n"])
+    assert set(cols) == {"telefon", "ad", "kod", "name"}
+    assert next(rows)[1]["kod"] == "A1"
+    cols, _ = wab.read_recipient_rows(['{"number": "05551112233"}\n'])
+    assert cols is None
+
+
+# ------------------------------------------------------------
+# _run_stream: devam ettirme, önbellek, iptal
+# ------------------------------------------------------------
+def _items(n):
+    return [(f"9055511122{i:02d}", i) for i in range(n)]
+
+
+def test_run_stream_resume_skips_sent(profile):
+    sent = []
+
+    def fn(num, payload):
+        sent.append(num)
+        return payload != 2                 # 3. alıcı başarısız
+
+    first = wab._run_stream(_items(5), fn, 1, "camp", "h", resume=True)
+    assert first == {"sent": 4, "failed": 1, "skipped": 0}
+
+    sent.clear()
+    again = wab._run_stream(_items(5), lambda n, p: sent.append(n) or True, 1,
+                            "camp", "h", resume=True)
+    assert sent == ["905551112202"]
+    assert again == {"sent": 1, "failed": 0, "skipped": 4}
+
+
+def test_run_stream_skips_negative_cache_lazily(profile):
+    wab.get_negative_cache().add("905551112201", "invalid")
+    pulled = []
+
+    def source():                           # girdi işlendikçe çekilir
+        for item in _items(3):
+            pulled.append(item[1])
+            yield item
+
+    def fn(num, payload):
+        assert pulled[-1] == payload
+        return True
+
+    stats = wab._run_stream(source(), fn, 1, "neg", "h", False)
+    assert stats == {"sent": 2, "failed": 0, "skipped": 1}
+
+
+def test_run_stream_cancel_stops_before_next(profile):
+    cancel, sent = threading.Event(), []
+
+    def fn(num, payload):
+        sent.append(num)
+        if payload == 1:
+            cancel.set()
+        return True
+
+    stats = wab._run_stream(_items(5), fn, 1, "cancel", "h", False, cancel=cancel)
+    assert stats["sent"] == 2 and len(sent) == 2
+    # iptalden sonra devam: gönderilmiş iki alıcı atlanır
+    rest = []
+    wab._run_stream(_items(5), lambda n, p: rest.append(p) or True, 1, "cancel", "h", True)
+    assert rest == [2, 3, 4]
+
+
+# ------------------------------------------------------------
+# normalize_numbers
+# ------------------------------------------------------------
+def test_normalize_formats_and_dedupe():
+    r = wab.normalize_numbers(["0555 111 22 33", "555-111-2233", "+90 (555) 111 22 33",
+                               "0090 555 111 22 33", "", "+44 20 7946 0958"])
+    assert r.numbers == ["905551112233", "442079460958"]
+    assert r.duplicates == 3
+    assert r.rejected == []
+
+
+def test_normalize_rejects_with_row_numbers():
+    r = wab.normalize_numbers(["05551112233", "abc", "", "12"])
+    assert r.numbers == ["905551112233"]
+    assert [(i, raw) for i, raw, _ in r.rejected] == [(1, "abc"), (3, "12")]
+    assert r.report().splitlines() == [
+        "1 geçerli, 0 tekrar, 2 reddedildi.",
+        "  satır 2: 'abc' → rakam yok",
+        "  satır 4: '12' → uzunluk 2 (E.164: 8-15)"]
+
+
+def test_normalize_sort_and_keep_duplicates():
+    raws = ["+44 20 7946 0958", "0555 111 22 33", "05551112233"]
+    assert wab.normalize_numbers(raws, sort=True).numbers == [
+        "442079460958", "905551112233"]
+    assert wab.normalize_numbers(raws, dedupe=False).numbers == [
+        "442079460958", "905551112233", "905551112233"]
+
+
+def test_normalize_batch_boundaries_do_not_change_result():
+    raws = [f"0555 111 {i:04d}" for i in range(50)] * 2 + ["x"]
+    whole = wab.normalize_numbers(raws)
+    small = wab.normalize_numbers(raws, batch=7)
+    assert small.numbers == whole.numbers
+    assert small.duplicates == whole.duplicates == 50
+    assert small.rejected == whole.rejected == [(100, "x", "rakam yok")]
+
+
+def test_run_stream_does_not_read_ahead(profile):
+    pulled, log = [], []
+
+    def source():
+        for num, i in _items(3):
+            pulled.append(i)
+            yield num, i
+
+    def fn(num, payload):
+        log.append((payload, list(pulled)))
+        return True
+
+    wab._run_stream(source(), fn, 1, "stdin", "h", False)
+    # her alıcı gönderilirken yalnızca kendisine kadar olan satırlar okunmuş
+    assert log == [(0, [0]), (1, [0, 1]), (2, [0, 1, 2])]
+
+
+# ------------------------------------------------------------
+# --batch: JSONL sonuçları ve çıkış kodları
+# ------------------------------------------------------------
+def _fake_send(num, *args, **kwargs):
+    """…33 → gönderildi, …44 → geçersiz numara, diğerleri → hata."""
+    if num.endswith("44"):
+        wab.get_negative_cache().add(num, "invalid")
+    return num.endswith("33")
+
+
+def test_run_batch_emits_one_status_per_row(profile, monkeypatch):
+    sent = []
+    monkeypatch.setattr(wab, "send_single",
+                        lambda num, text, *a: sent.append(text) or _fake_send(num))
+    spec = {**wab.BATCH_DEFAULTS, "messages": ["Selam {name}"], "campaign": "b"}
+    lines = ['{"number": "0555 111 22 33", "name": "Ali"}\n',
+             '{"number": "+90 555 111 22 33"}\n',         # tekrar
+             '{"number": "12"}\n',                        # reddedildi
+             'bozuk\n',
+             '{"number": "05551112244"}\n',
+             '{"number": "05551112255"}\n']
+    out = io.StringIO()
+    stats = wab.run_batch(spec, lines, out)
+    rows = [json.loads(ln) for ln in out.getvalue().splitlines()]
+    assert [(r["row"], r["status"]) for r in rows] == [
+        (1, "sent"), (2, "duplicate"), (3, "rejected"), (4, "rejected"),
+        (5, "invalid"), (6, "failed")]
+    assert rows[3]["reason"] == "bozuk JSON" and rows[2]["input"] == "12"
+    assert sent[0] == "Selam Ali"
+    assert stats == {"sent": 1, "failed": 2, "skipped": 0, "duplicate": 1, "rejected": 2}
+
+    # devam: gönderilen atlanır, geçersiz olan önbellekten atlanır
+    out = io.StringIO()
+    wab.run_batch({**spec, "resume": True}, lines[:1] + lines[4:], out)
+    assert [(r["status"], r.get("reason")) for r in map(json.loads, out.getvalue().splitlines())] == [
+        ("skipped", "done"), ("skipped", "invalid"), ("failed", None)]
+
+
+def test_batch_dedupe_spills_to_sqlite():
+    seen = wab._SeenNumbers(limit=2)
+    assert all(seen.add(n) for n in (905551112201, 905551112202))
+    assert not seen.add(905551112201) and seen._db is None
+    assert seen.add(905551112203) and seen._db is not None and not seen._mem
+    assert not seen.add(905551112202) and not seen.add(905551112203)
+    assert seen.add(905551112204)
+    seen.close()
+
+
+def _batch_process(tmp_path, spec, recipients):
+    """batch_cli()'yi ayrı süreçte, sahte send_single ile çalıştırır."""
+    (tmp_path / "spec.json").write_text(json.dumps(spec), encoding="utf-8")
+    (tmp_path / "to.txt").write_text(recipients, encoding="utf-8")
+    code = ("import importlib.util, sys\n"
+            f"spec = importlib.util.spec_from_file_location('wab', {str(wab.__file__)!r})\n"
+            "wab = sys.modules['wab'] = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(wab)\n"
+            "wab.send_single = lambda num, *a, **k: num.endswith('33')\n"
+            "sys.argv = ['wab', '--batch', 'spec.json', '--recipients', 'to.txt']\n"
+            "wab.batch_cli()\n")
+    env = {**os.environ, "HOME": str(tmp_path), "USERPROFILE": str(tmp_path)}
+    env.pop("APPDATA", None)
+    return subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+
+def test_batch_cli_exit_codes(tmp_path):
+    spec = {"message": "Selam", "wait_sec": 0, "gap_sec": 0}
+    ok = _batch_process(tmp_path, spec, "05551112233\n0555 111 22 33\n")
+    assert ok.returncode == 0, ok.stderr
+    assert [json.loads(ln)["status"] for ln in ok.stdout.splitlines()] == ["sent", "duplicate"]
+
+    bad = _batch_process(tmp_path, {**spec, "campaign": "x"}, "05551112299\nabc\n")
+    assert bad.returncode == 1
+    assert [json.loads(ln)["status"] for ln in bad.stdout.splitlines()] == ["failed", "rejected"]
+
+    broken = _batch_process(tmp_path, {"wait_sec": 0}, "05551112233\n")
+    assert broken.returncode == 2 and broken.stdout == ""
+    typo = _batch_process(tmp_path, {**spec, "message": "Selam {nmae}"}, "05551112233 Ali\n")
+    assert typo.returncode == 2 and typo.stdout == ""
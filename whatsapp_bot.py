@@ -0,0 +1,4748 @@
+from __future__ import annotations
+
+"""
+Selenium (undetected‑chromedriver) tabanlı hızlı ve stabil toplu WhatsApp mesaj gönderici.
+
+🔧 *Yeni Özellikler (v3.2 – "Restart Butonu" güncellemesi)*
+
+Bu sürümde isteğin üzerine **tam sıfırlama** yapacak bir **Restart / Sıfırla** düğmesi
+
+* **GUI tarafı**
+  * Restart / Sıfırla adlı turuncu bir buton eklendi. Tıklandığında:
+    * Tüm metin kutuları ve numara listesi temizlenir.
+    * Saat/dakika Spinboxları ile aralık ve timeout alanları varsayılanlarına döner.
+    * Mod seçimi tekrar *Anında* konuma alınır.
+    * Aktif bir WebDriver (varsa) kapatılır; global _DRIVER sıfırlanır.
+    * Gönderim butonu yeniden etkinleştirilir.
+
+Diğer tüm işlevler **hiçbir değişiklik yapılmadan** korunmuştur.
+"""
+
+import sys
+import threading
+import time
+import datetime
+import urllib.parse
+import os
+import json
+import queue
+import heapq
+import itertools
+import bisect
+import re
+import contextlib
+import collections
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# sqlite3, csv, hashlib ve concurrent.futures (logging'i de çeker) kullanıldıkları
+# fonksiyonda içe aktarılır; --help / servis istemcisi açılışı bu bedeli ödemez.
+if TYPE_CHECKING:
+    import sqlite3
+
+# ------------------------------------------------------------
+# 1) Opsiyonel GUI (Tkinter)
+# ------------------------------------------------------------
+
+# Tkinter yalnızca GUI gerçekten açılırken yüklenir (bkz. gui_main)
+INSTALL_MSG = (
+    "Tkinter (python3-tk) bulunamadı:\n"
+    " • Windows: Python resmi kurulumunda yeniden kurulum yaparken ‘tcl/tk and IDLE’ kutusunu işaretleyin.\n"
+    " • Debian/Ubuntu:  sudo apt-get install python3-tk\n"
+    " • Fedora:         sudo dnf install python3-tkinter\n"
+    "Veya GUI olmadan çalıştırmak için:  python bulk_whatsapp_sender_uc_v3.py --cli"
+)
+
+
+def _gui_available() -> bool:
+    """Tkinter kurulu mu?"""
+    try:
+        import tkinter  # noqa: F401
+        return True
+    except ModuleNotFoundError:
+        return False
+
+
+# ------------------------------------------------------------
+# 2) Selenium + undetected-chromedriver
+# ------------------------------------------------------------
+# Selenium + uc yalnızca ilk tarayıcı başlatılırken yüklenir (bkz. _load_selenium);
+# rehber, servis istemcisi, --help gibi gönderim yapmayan komutlar bu bedeli ödemez.
+uc = By = Keys = WebDriverWait = EC = None
+SELENIUM_MISSING = "undetected-chromedriver yüklü değil.  →  pip install undetected-chromedriver"
+
+
+def _load_selenium():
+    """Tarayıcı yığınını ilk kullanımda içe aktarır (sonraki çağrılar bedava)."""
+    global uc, By, Keys, WebDriverWait, EC
+    if uc is not None:
+        return
+    try:
+        import undetected_chromedriver as uc
+    except ImportError:
+        # İşçi iş parçacığında sys.exit sessizce yutulur → normal istisna
+        raise RuntimeError(SELENIUM_MISSING) from None
+
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys          # Enter yedeği
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+
+def _selenium_installed() -> bool:
+    """uc + selenium kurulu mu? (içe aktarmadan; main() iş parçacıkları başlamadan sorar)"""
+    import importlib.util
+    return all(importlib.util.find_spec(m) is not None
+               for m in ("undetected_chromedriver", "selenium"))
+
+
+# ------------------------------------------------------------
+# WebDriver (singleton)
+# ------------------------------------------------------------
+_DRIVER: Optional["uc.Chrome"] = None
+_PROFILE: Optional[str] = None
+
+# Havuz işçileri kendi sürücülerini iş parçacığına özel tutar (bkz. DriverPool)
+_TLS = threading.local()
+_LAUNCH_LOCK = threading.Lock()   # uc.Chrome sürücü ikilisini yamalar → sırayla başlat
+# WhatsApp Web adresi; kıyaslamada yerel sahte sayfaya yönlendirilir (bkz. 3-e)
+WA_URL = os.getenv("WA_URL", "https://web.whatsapp.com").rstrip("/")
+_SEND_LOCK = threading.RLock()    # aynı anda tek toplu gönderim aynı tarayıcıyı sürer
+
+
+def _profile_dir(slot: int = 0) -> Path:
+    """Chrome profil klasörü; slot > 0 havuzdaki ek tarayıcılar içindir."""
+    global _PROFILE
+    if slot:
+        p = _profile_dir().parent / f"whatsapp_profile_{slot}"
+        p.mkdir(parents=True, exist_ok=True)
+        return p
+    if _PROFILE:
+        return Path(_PROFILE)
+    p = (Path(os.getenv("APPDATA") or Path.home()) / "whatsapp_profile").resolve()
+    p.mkdir(parents=True, exist_ok=True)
+    _PROFILE = str(p)
+    return p
+
+
+def _driver_alive(drv) -> bool:
+    """Tarayıcı hâlâ açık mı?"""
+    if not drv:
+        return False
+    try:
+        _ = drv.current_url
+        return True
+    except Exception:
+        return False
+
+
+# Yerel chromedriver / Chrome ikilileri. Boşsa uc ilk açılışta Chrome sürümüne
+# uyan chromedriver'ı internetten indirir; çevrimdışı makinede (CI) verin.
+CHROMEDRIVER_PATH = os.getenv("WA_CHROMEDRIVER") or None
+CHROME_BINARY = os.getenv("WA_CHROME_BINARY") or None
+
+# "Yalın" tarayıcı: gözetimsiz toplu gönderim için başsız (headless) Chrome,
+# küçük pencere, medya/görsel isteklerinin CDP ile engellenmesi. Oturum
+# profilde kayıtlı olmalı – başsız modda QR okutulamaz.
+LEAN_MODE = "--lean" in sys.argv
+LEAN_HEADLESS = True
+LEAN_WINDOW = (1024, 768)
+LEAN_RENDERER_LIMIT: Optional[int] = 2     # None → Chrome varsayılanı
+LEAN_BLOCKED_URLS = [
+    "*mmg.whatsapp.net*",       # medya CDN: resim, video, çıkartma, belge
+    "*pps.whatsapp.net*",       # profil fotoğrafları
+    "*media*.whatsapp.net*",
+    "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.mp4*", "*.webm*",
+]
+
+
+def _chrome_options(profile: Optional[Path] = None,
+                    lean: Optional[bool] = None) -> uc.ChromeOptions:
+    """Tek bir yerde Chrome seçenekleri oluşturur."""
+    opts = uc.ChromeOptions()
+    opts.add_argument(f"--user-data-dir={profile or _profile_dir()}")
+
+    if LEAN_MODE if lean is None else lean:
+        opts.add_argument("--window-size={},{}".format(*LEAN_WINDOW))
+        opts.add_argument("--mute-audio")
+        opts.add_argument("--disable-notifications")
+        if LEAN_RENDERER_LIMIT:
+            opts.add_argument(f"--renderer-process-limit={LEAN_RENDERER_LIMIT}")
+
+    # kaynak dostu ayarlar
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--remote-allow-origins=*")
+
+    # oturum kurtarma / arka-plan modunu kapat
+    opts.add_argument("--no-first-run")
+    opts.add_argument("--no-default-browser-check")
+    opts.add_argument("--disable-background-mode")
+    opts.add_argument("--disable-features=SessionRestore,AutomaticTabDiscarding,BackgroundMode")
+    return opts
+
+
+def _new_driver(profile: Optional[Path] = None) -> uc.Chrome:
+    """Verilen profille yeni bir Chrome başlatır ve WhatsApp Web'i açar."""
+    _load_selenium()
+    _METRICS.inc("driver_launch")
+    lean = LEAN_MODE
+    with _LAUNCH_LOCK:
+        drv = uc.Chrome(options=_chrome_options(profile, lean),
+                        headless=lean and LEAN_HEADLESS,
+                        driver_executable_path=CHROMEDRIVER_PATH,
+                        browser_executable_path=CHROME_BINARY)
+    if lean:
+        try:                                # medya / görsel CDN isteklerini engelle
+            drv.execute_cdp_cmd("Network.enable", {})
+            drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        except Exception as e:
+            print(f"CDP engelleme kuralları uygulanamadı: {e}")
+    else:
+        drv.maximize_window()
+    drv.set_script_timeout(300)         # enjekte edilen async betikler (+ hız sınırı beklemesi)
+    drv.get(WA_URL)                     # ilk sefer QR gerekir
+    return drv
+
+
+def get_driver() -> uc.Chrome:
+    """Chrome örneği oluşturur; kapanmışsa yeniden başlatır.
+
+    Havuz işçisi iş parçacıklarında (DriverPool) o işçinin kendi tarayıcısı,
+    diğer her yerde tekil _DRIVER döner.
+    """
+    global _DRIVER
+
+    with _METRICS.timer("get_driver"):
+        profile = getattr(_TLS, "profile", None)
+        if profile is not None:
+            if not _driver_alive(_TLS.driver):
+                _TLS.driver = _new_driver(profile)
+            return _TLS.driver
+
+        if not _driver_alive(_DRIVER):
+            _DRIVER = None
+
+        if _DRIVER is None:
+            _DRIVER = _new_driver()
+
+        return _DRIVER
+
+
+def _quit_driver(drv):
+    """Tarayıcıyı ve chromedriver servis sürecini kapatır."""
+    if _driver_alive(drv):
+        try:
+            drv.quit()
+            # ek güvenlik: servis sürecini öldür
+            if hasattr(drv, "service") and drv.service.process:
+                drv.service.process.kill()
+        except Exception:
+            pass
+
+
+def _close_driver():
+    global _DRIVER, _POOL
+    _quit_driver(_DRIVER)
+    _DRIVER = None
+    if _POOL is not None:
+        _POOL.close()
+        _POOL = None
+
+
+# ------------------------------------------------------------
+# 2-a) Oturum sağlık yoklaması ve önceden ısıtma
+# ------------------------------------------------------------
+WARMUP_LEAD_SEC = 120         # zamanlanmış gönderimden bu kadar önce tarayıcıyı hazırla
+WARMUP_TIMEOUT = 90           # ısıtma en fazla bu kadar sürer (sonra uyarı verilir)
+
+# ready → sohbet listesi yüklü; qr → oturum düşmüş, QR okutulmalı; loading → bekle
+_JS_HEALTH = r"""
+if (document.querySelector('#side')) return 'ready';
+if (document.querySelector(
+      "div[data-ref] canvas, canvas[aria-label*='QR'], canvas[aria-label*='Scan']"))
+  return 'qr';
+return 'loading';
+"""
+
+
+def probe_session(drv) -> str:
+    """Tarayıcı + WhatsApp Web durumu: ready / qr / loading / dead.
+
+    _driver_alive() yalnızca tarayıcının açık olduğunu söyler; bu yoklama
+    oturumun gerçekten açık ve uygulamanın gönderime hazır olduğunu da denetler.
+    """
+    if not _driver_alive(drv):
+        return "dead"
+    try:
+        if not drv.current_url.startswith(WA_URL):
+            drv.get(WA_URL)
+            return "loading"
+        return drv.execute_script(_JS_HEALTH) or "loading"
+    except Exception:
+        return "dead"
+
+
+def warm_up(timeout: float = WARMUP_TIMEOUT,
+            alert: Callable[[str], None] = print) -> str:
+    """Tarayıcıyı başlatır ve uygulama hazır olana dek bekler.
+
+    QR gerekiyorsa ya da süre dolduğunda hâlâ hazır değilse alert() hemen
+    çağrılır – gönderim saatinden önce müdahale edilebilsin diye. Tarayıcı
+    yalnızca _SEND_LOCK altında yoklanır; kilit bir gönderimdeyse tarayıcı
+    zaten kullanımdadır ve "busy" döner.
+    """
+    deadline = time.time() + timeout
+    warned = False
+    state = "dead"
+    while time.time() < deadline:
+        if not _SEND_LOCK.acquire(timeout=1):
+            return "busy"               # bir gönderim tarayıcıyı sürüyor → zaten sıcak
+        try:
+            state = probe_session(get_driver())
+        except Exception as e:          # Chrome başlatılamadı
+            state = "dead"
+            print(f"Tarayıcı başlatılamadı: {e}")
+        finally:
+            _SEND_LOCK.release()
+        if state == "ready":
+            return state
+        if state == "qr" and not warned:
+            alert("WhatsApp oturumu kapanmış: zamanlanmış gönderimden önce QR kodu okutun!")
+            warned = True
+        time.sleep(1)
+    alert(f"Tarayıcı hazır değil ({state}); zamanlanmış gönderim gecikebilir.")
+    return state
+
+
+# ------------------------------------------------------------
+# 2-a-1) Bellek bekçisi: şişen tarayıcıyı kampanya ortasında yenile
+# ------------------------------------------------------------
+WATCHDOG_INTERVAL_SEC = 60    # örnekleme aralığı
+WATCHDOG_MAX_RSS_MB = 1500    # tarayıcı + renderer süreçlerinin toplam RSS sınırı (psutil)
+WATCHDOG_MAX_HEAP_MB = 600    # sayfanın kullanılan JS heap sınırı (CDP)
+
+
+def _current_driver():
+    """Bu iş parçacığının sürücüsü – yoksa başlatmaz."""
+    if getattr(_TLS, "profile", None) is not None:
+        return _TLS.driver
+    return _DRIVER
+
+
+def _drop_driver():
+    """Geçerli sürücüyü kapatıp unutur; sonraki get_driver() yenisini başlatır."""
+    global _DRIVER
+    if getattr(_TLS, "profile", None) is not None:
+        drv, _TLS.driver = _TLS.driver, None
+    else:
+        drv, _DRIVER = _DRIVER, None
+    _quit_driver(drv)
+
+
+# WebDriver hata metninde tarayıcının / oturumun gittiğini gösteren parçalar
+_DRIVER_LOST_HINTS = ("invalid session id", "no such window", "not reachable",
+                      "disconnected", "target window already closed", "session deleted")
+
+
+def _driver_lost(exc: BaseException) -> bool:
+    """execute_*_script istisnası tarayıcının kapandığını mı gösteriyor?"""
+    if isinstance(exc, OSError) or type(exc).__name__ in (
+            "InvalidSessionIdException", "NoSuchWindowException",
+            "MaxRetryError", "ProtocolError"):
+        return True
+    msg = str(exc).lower()
+    return any(h in msg for h in _DRIVER_LOST_HINTS)
+
+
+def _recycle_driver():
+    """Geçerli sürücüyü kapatıp aynı kalıcı profille yeniden açar (QR gerekmez)."""
+    _drop_driver()
+    warm_up()
+
+
+class MemoryWatchdog:
+    """Tarayıcının bellek kullanımını örnekler, eşik aşılınca sürücüyü yeniler.
+
+    JS heap CDP Performance.getMetrics ile, süreç RSS'i (kurulu ise) psutil ile
+    ölçülür. check() yalnızca mesaj sınırlarında çağrılır; kuyruk yenilemeden
+    sonra kaldığı yerden devam eder.
+    """
+
+    def __init__(self, interval: float = WATCHDOG_INTERVAL_SEC,
+                 max_rss_mb: float = WATCHDOG_MAX_RSS_MB,
+                 max_heap_mb: float = WATCHDOG_MAX_HEAP_MB):
+        self.interval = interval
+        self.max_rss_mb = max_rss_mb
+        self.max_heap_mb = max_heap_mb
+        self.recycles = 0
+        self._next = time.monotonic() + interval
+
+    @staticmethod
+    def sample(drv) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        try:
+            drv.execute_cdp_cmd("Performance.enable", {})
+            m = drv.execute_cdp_cmd("Performance.getMetrics", {})
+            metrics = {x["name"]: x["value"] for x in m.get("metrics", [])}
+            out["heap_mb"] = metrics.get("JSHeapUsedSize", 0) / 2**20
+        except Exception:
+            pass
+        try:                                # opsiyonel bağımlılık
+            import psutil
+        except ImportError:
+            psutil = None
+        pid = getattr(drv, "browser_pid", None)
+        if psutil is not None and pid:
+            try:
+                root_proc = psutil.Process(pid)
+                rss = 0
+                for p in [root_proc] + root_proc.children(recursive=True):
+                    try:
+                        rss += p.memory_info().rss
+                    except psutil.Error:
+                        pass
+                out["rss_mb"] = rss / 2**20
+            except psutil.Error:
+                pass
+        return out
+
+    def check(self) -> bool:
+        """Örnekleme zamanı geldiyse ölç; eşik aşıldıysa yenile → True."""
+        now = time.monotonic()
+        if now < self._next:
+            return False
+        self._next = now + self.interval
+        drv = _current_driver()
+        if not _driver_alive(drv):
+            return False
+        m = self.sample(drv)
+        over = [f"{k}={v:.0f}" for k, v, lim in (
+            ("rss_mb", m.get("rss_mb", 0), self.max_rss_mb),
+            ("heap_mb", m.get("heap_mb", 0), self.max_heap_mb),
+        ) if lim and v > lim]
+        if not over:
+            return False
+        self.recycles += 1
+        print(f"[{time.strftime('%H:%M:%S')}] Bellek eşiği aşıldı "
+              f"({', '.join(over)}); tarayıcı yeniden başlatılıyor "
+              f"(#{self.recycles})…")
+        _recycle_driver()
+        return True
+
+
+def _watchdog() -> MemoryWatchdog:
+    wd = getattr(_TLS, "watchdog", None)
+    if wd is None:
+        wd = _TLS.watchdog = MemoryWatchdog()
+    return wd
+
+
+# ------------------------------------------------------------
+# 2-b) Kalıcı Rehber Yardımcıları
+# ------------------------------------------------------------
+def _db_connect(path: Path) -> sqlite3.Connection:
+    """WAL kipinde, iş parçacıkları arasında paylaşılabilen SQLite bağlantısı."""
+    import sqlite3
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(str(path), check_same_thread=False)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")   # WAL'da süreç çökmesine karşı güvenli
+    return con
+
+
+class ContactStore:
+    """SQLite rehber: numara birincil anahtar (B-ağacı) → O(log n) ekle/sil/ara.
+
+    Etiketler (gruplar) ayrı tabloda tutulur. İlk açılışta eski
+    contacts.json içeriği aktarılır ve dosya contacts.json.bak olarak saklanır.
+    """
+
+    def __init__(self, path: Optional[Path] = None, legacy_json: Optional[Path] = None):
+        self.path = path or _profile_dir() / "contacts.sqlite3"
+        self._lock = threading.Lock()
+        self._con = _db_connect(self.path)
+        self._con.executescript("""
+            PRAGMA foreign_keys = ON;
+            CREATE TABLE IF NOT EXISTS contacts (
+                number TEXT PRIMARY KEY,
+                name   TEXT NOT NULL DEFAULT '',
+                added  REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS contact_tags (
+                tag    TEXT NOT NULL,
+                number TEXT NOT NULL REFERENCES contacts (number) ON DELETE CASCADE,
+                PRIMARY KEY (tag, number)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS contact_tags_number ON contact_tags (number);
+        """)
+        self._migrate(legacy_json or _profile_dir() / "contacts.json")  # eski biçim
+
+    def _migrate(self, json_file: Path):
+        if not json_file.exists():
+            return
+        with open(json_file, "r", encoding="utf-8") as f:
+            numbers = json.load(f)
+        now = time.time()
+        with self._lock, self._con:
+            self._con.executemany(
+                "INSERT OR IGNORE INTO contacts (number, added) VALUES (?, ?)",
+                ((str(n), now) for n in numbers),
+            )
+        json_file.replace(json_file.with_name(json_file.name + ".bak"))
+
+    def add(self, number: str, name: str = "", tags=()) -> bool:
+        """Yeni numarayı ekler; zaten kayıtlıysa False."""
+        with self._lock, self._con:
+            cur = self._con.execute(
+                "INSERT OR IGNORE INTO contacts (number, name, added) VALUES (?, ?, ?)",
+                (number, name, time.time()),
+            )
+            self._con.executemany(
+                "INSERT OR IGNORE INTO contact_tags (tag, number) VALUES (?, ?)",
+                ((t, number) for t in tags),
+            )
+            return cur.rowcount == 1
+
+    def add_many(self, rows, tags=()) -> int:
+        """[(numara, isim), ...] tek transaction'da eklenir → yeni eklenen sayısı."""
+        rows = list(rows)
+        now = time.time()
+        with self._lock, self._con:
+            before = self._con.total_changes
+            self._con.executemany(
+                "INSERT OR IGNORE INTO contacts (number, name, added) VALUES (?, ?, ?)",
+                ((n, name, now) for n, name in rows),
+            )
+            added = self._con.total_changes - before
+            for t in tags:
+                self._con.executemany(
+                    "INSERT OR IGNORE INTO contact_tags (tag, number) VALUES (?, ?)",
+                    ((t, n) for n, _ in rows),
+                )
+            return added
+
+    def iter_rows(self, tag: Optional[str] = None, batch: int = 5000):
+        """(numara, isim) çiftlerini sıralı, parça parça üretir.
+
+        Kilit yalnızca her parça okunurken tutulur; dışa aktarım sürerken
+        diğer işlemler bloklanmaz.
+        """
+        last = ""
+        while True:
+            with self._lock:
+                if tag is None:
+                    rows = self._con.execute(
+                        "SELECT number, name FROM contacts WHERE number > ?"
+                        " ORDER BY number LIMIT ?", (last, batch)).fetchall()
+                else:
+                    rows = self._con.execute(
+                        "SELECT c.number, c.name FROM contact_tags t"
+                        " JOIN contacts c ON c.number = t.number"
+                        " WHERE t.tag = ? AND t.number > ?"
+                        " ORDER BY t.number LIMIT ?", (tag, last, batch)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    def remove(self, number: str) -> bool:
+        with self._lock, self._con:
+            cur = self._con.execute("DELETE FROM contacts WHERE number = ?", (number,))
+            return cur.rowcount == 1
+
+    def remove_many(self, numbers) -> int:
+        """Numaraları tek transaction'da siler → silinen sayısı."""
+        with self._lock, self._con:
+            before = self._con.total_changes
+            self._con.executemany("DELETE FROM contacts WHERE number = ?",
+                                  ((n,) for n in numbers))
+            return self._con.total_changes - before
+
+    def __contains__(self, number: str) -> bool:
+        with self._lock:
+            return self._con.execute(
+                "SELECT 1 FROM contacts WHERE number = ?", (number,)).fetchone() is not None
+
+    def names(self, numbers: List[str]) -> Dict[str, str]:
+        """Verilen numaraların kayıtlı isimleri (isimsizler dahil edilmez)."""
+        out: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(numbers), 500):         # SQLite değişken sınırı
+                chunk = numbers[i:i + 500]
+                out.update(self._con.execute(
+                    "SELECT number, name FROM contacts WHERE name != '' AND number IN ("
+                    + ",".join("?" * len(chunk)) + ")", chunk))
+        return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def numbers(self, tag: Optional[str] = None) -> List[str]:
+        """Sıralı numaralar; tag verilirse yalnızca o gruptakiler."""
+        with self._lock:
+            if tag is None:
+                rows = self._con.execute("SELECT number FROM contacts ORDER BY number")
+            else:
+                rows = self._con.execute(
+                    "SELECT number FROM contact_tags WHERE tag = ? ORDER BY number", (tag,))
+            return [r[0] for r in rows]
+
+    def tag(self, number: str, *tags: str):
+        with self._lock, self._con:
+            self._con.executemany(
+                "INSERT OR IGNORE INTO contact_tags (tag, number) VALUES (?, ?)",
+                ((t, number) for t in tags),
+            )
+
+    def untag(self, number: str, tag: str):
+        with self._lock, self._con:
+            self._con.execute(
+                "DELETE FROM contact_tags WHERE tag = ? AND number = ?", (tag, number))
+
+    def tags(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._con.execute(
+                "SELECT DISTINCT tag FROM contact_tags ORDER BY tag")]
+
+
+_CONTACTS: Optional[ContactStore] = None
+
+
+def get_contacts() -> ContactStore:
+    global _CONTACTS
+    if _CONTACTS is None:
+        _CONTACTS = ContactStore()
+    return _CONTACTS
+
+
+# ------------------------------------------------------------
+# 2-b-1) Toplu içe / dışa aktarma (CSV, Excel CSV, VCF) – akış halinde
+# ------------------------------------------------------------
+IMPORT_CHUNK = 5000           # her transaction'da yazılacak satır sayısı
+
+_PHONE_COLS = ("phone", "telefon", "tel", "number", "numara", "mobile", "gsm", "cep")
+_NAME_COLS = ("name", "isim", "ad", "ad soyad", "full name", "fn")
+
+# --- Numara normalleştirme hattı (toplu, derlenmiş regex ile) ---------------
+# Parti "\n" ile tek metne birleştirilir: sık biçim karakterleri str.translate
+# ile, sınıflandırma + doğrulama tek bir findall ile yapılır (satır başına
+# yalnızca bir tuple). Hızlı yolda reddedilen az sayıdaki satır, kalan tüm
+# rakam dışı karakterler atılarak bir kez daha denenir.
+DEFAULT_CC = os.getenv("WA_DEFAULT_CC", "90")   # ülke kodu yazılmamışsa
+NATIONAL_LEN = {"90": 10, "1": 10}   # ülke kodu → ulusal (trunk'sız) hane sayısı
+E164_MIN, E164_MAX = 8, 15
+NORMALIZE_BATCH = 100_000     # tek seferde birleştirilecek satır sayısı
+
+_NORM_JUNK = str.maketrans("", "", " -()./\t\r\u00a0")   # hızlı yol
+_NORM_SLOW = re.compile(r"[^\d+]+")                         # yavaş yol: kalan her şey
+_NORM_RX: Dict[str, re.Pattern] = {}
+
+
+def _norm_rx(cc: str) -> re.Pattern:
+    """Ülke koduna göre satır deseni (önbellekli).
+
+    Gruplar: (1) uluslararası ('+' / '00' önekli ya da ulusal biçime
+    uymayan öneksiz), (2) ulusal (trunk '0' atılmış); uymayan satır → ('', '').
+    """
+    if cc not in _NORM_RX:
+        known = [(c, k) for c, k in NATIONAL_LEN.items() if k]
+        e164 = rf"[1-9]\d{{{E164_MIN - 1},{E164_MAX - 1}}}"
+        if known:        # bilinen ülke kodlarında tam uzunluk, diğerlerinde E.164 aralığı
+            e164 = "|".join([rf"{c}\d{{{k}}}" for c, k in known]
+                            + [rf"(?!{'|'.join(c for c, _ in known)}){e164}"])
+        n = NATIONAL_LEN.get(cc)
+        if n:            # '0555…' ya da çıplak '555…' (ulusal uzunlukta)
+            trunk, body = "0?", rf"[1-9]\d{{{n - 1}}}"
+        else:            # uzunluk bilinmiyorsa yalnızca trunk '0' ile yazılanlar
+            trunk, body = "0", rf"[1-9]\d{{{E164_MIN - 1 - len(cc)},{E164_MAX - 1 - len(cc)}}}"
+        _NORM_RX[cc] = re.compile(
+            rf"^(?:(?:\++|00|(?!{trunk}{body}$))({e164})|{trunk}({body})|[^\n]*)$", re.M)
+    return _NORM_RX[cc]
+
+
+def _normalize_batch(raws: List[str], cc: str = DEFAULT_CC) -> List[str]:
+    """Ham numara listesi → aynı sırada temiz numaralar; geçersizler ''."""
+    if not raws:
+        return []
+    buf = "\n".join(raws)
+    if buf.count("\n") != len(raws) - 1:          # hücre içinde satır sonu
+        raws = [r.replace("\n", " ") for r in raws]
+        buf = "\n".join(raws)
+    rx = _norm_rx(cc)
+    out = [a or b and cc + b for a, b in rx.findall(buf.translate(_NORM_JUNK))]
+    if "" in out:
+        redo = [i for i, num in enumerate(out) if not num and raws[i]]
+        if redo:
+            fixed = rx.findall("\n".join(_slow_clean(raws[i]) for i in redo))
+            for i, (a, b) in zip(redo, fixed):
+                out[i] = a or b and cc + b
+    return out
+
+
+def _slow_clean(raw: str) -> str:
+    """Rakam ve baştaki '+' dışında her şeyi atar."""
+    num = _NORM_SLOW.sub("", raw)
+    return num[:1] + num[1:].replace("+", "")
+
+
+def _loose_number(raw: str, cc: str = DEFAULT_CC) -> str:
+    """Doğrulamasız biçim: rakamlar, '+'/'00' atılmış, trunk '0' → ülke kodu.
+
+    Rehber araması ('0555…' → '90555…') ve red nedenleri için.
+    """
+    num = _slow_clean(raw)
+    if num.startswith("+"):
+        return num.lstrip("+")
+    if num.startswith("00"):
+        return num[2:]
+    if num.startswith("0"):
+        return cc + num[1:]
+    return num
+
+
+def _reject_reason(raw: str, cc: str = DEFAULT_CC) -> str:
+    num = _loose_number(raw, cc)
+    if not num:
+        return "rakam yok"
+    if not E164_MIN <= len(num) <= E164_MAX:
+        return f"uzunluk {len(num)} (E.164: {E164_MIN}-{E164_MAX})"
+    for c, k in NATIONAL_LEN.items():
+        if k and num.startswith(c) and len(num) != len(c) + k:
+            return f"+{c} için {len(c) + k} hane olmalı ({len(num)})"
+    return "geçersiz biçim"
+
+
+class NormalizeResult:
+    """normalize_numbers() sonucu."""
+    __slots__ = ("numbers", "rejected", "duplicates")
+
+    def __init__(self):
+        self.numbers: List[str] = []
+        self.rejected: List[Tuple[int, str, str]] = []   # (satır, ham, neden)
+        self.duplicates = 0
+
+    def report(self, limit: int = 10) -> str:
+        """Tek satırlık özet + ilk `limit` reddedilen satır."""
+        lines = [f"{len(self.numbers)} geçerli, {self.duplicates} tekrar, "
+                 f"{len(self.rejected)} reddedildi."]
+        lines += [f"  satır {i + 1}: {raw!r} → {why}" for i, raw, why in self.rejected[:limit]]
+        if len(self.rejected) > limit:
+            lines.append(f"  … {len(self.rejected) - limit} satır daha")
+        return "\n".join(lines)
+
+
+def normalize_numbers(raws: Iterable[str], cc: str = DEFAULT_CC,
+                      dedupe: bool = True, sort: bool = False,
+                      batch: int = NORMALIZE_BATCH) -> NormalizeResult:
+    """Ham numaraları E.164 (başında '+' olmadan) biçimine getirir.
+
+    '0555 111 22 33', '555-111-2233', '+90 (555) 111 22 33', '0090…' →
+    '905551112233'. Boş satırlar sessizce atlanır; geçersizler satır numarası
+    ve nedeniyle `rejected` içinde döner. Sıra korunur (sort=True → sıralı).
+    """
+    res = NormalizeResult()
+    raws = iter(raws)
+    base = 0
+    while True:
+        chunk = list(itertools.islice(raws, batch))
+        if not chunk:
+            break
+        out = _normalize_batch(chunk, cc)
+        if "" in out:
+            for i, num in enumerate(out):
+                if not num and chunk[i].strip():
+                    res.rejected.append((base + i, chunk[i], _reject_reason(chunk[i], cc)))
+            out = [n for n in out if n]
+        res.numbers += out
+        base += len(chunk)
+    valid = len(res.numbers)
+    if dedupe and sort:
+        res.numbers = sorted(set(res.numbers))
+    elif dedupe:                                # ilk görülme sırası korunur
+        res.numbers = list(dict.fromkeys(res.numbers))
+    elif sort:
+        res.numbers.sort()
+    res.duplicates = valid - len(res.numbers)
+    return res
+
+
+def _clean_number(raw: str) -> Optional[str]:
+    """'+90 (555) 111-22-33' → '905551112233'; geçersizse None (tek satırlık yol)."""
+    return _normalize_batch([raw])[0] or None
+
+
+def normalize_pairs(pairs: Iterable[Tuple[str, object]], cc: str = DEFAULT_CC,
+                    batch: int = IMPORT_CHUNK) -> Iterator[Tuple[Optional[str], object]]:
+    """(ham numara, ek veri) akışı → (temiz numara ya da None, ek veri) akışı.
+
+    Akış `batch` satırlık parçalar halinde toplu normalleştirilir; bellekte en
+    fazla bir parça tutulur.
+    """
+    pairs = iter(pairs)
+    while True:
+        chunk = list(itertools.islice(pairs, batch))
+        if not chunk:
+            return
+        out = _normalize_batch([raw for raw, _ in chunk], cc)
+        for num, (_, extra) in zip(out, chunk):
+            yield num or None, extra
+
+
+# Excel CSV'yi çoğu zaman yerel kod sayfasıyla kaydeder (Türkçe Windows → cp1254)
+CSV_FALLBACK_ENCODING = os.getenv("WA_CSV_ENCODING", "")
+
+
+def _text_encoding(path: Path, probe: int = 1 << 16) -> str:
+    """Dosyanın başı UTF-8 olarak çözülüyorsa "utf-8-sig", değilse yerel kod sayfası.
+
+    Yerel kodlama da UTF-8 ise (Linux / macOS) Excel'in Türkçe varsayılanı cp1254.
+    """
+    import codecs
+    with open(path, "rb") as f:
+        head = f.read(probe)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=len(head) < probe)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        pass
+    if CSV_FALLBACK_ENCODING:
+        return CSV_FALLBACK_ENCODING
+    import locale
+    enc = locale.getpreferredencoding(False)
+    return "cp1254" if codecs.lookup(enc).name == "utf-8" else enc
+
+
+def _csv_reader(lines: Iterable[str], sample: str):
+    """Örnekten ayırıcıyı sezip csv.reader döndürür (, ; sekme |)."""
+    import csv
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    return csv.reader(lines, dialect)
+
+
+class CSVHeader:
+    """_read_header() sonucu: küçük harfli başlık ve tanınan sütunların yeri.
+
+    columns boşsa dosyada başlık yoktur: 0. sütun numara, 1. sütun isimdir.
+    """
+    __slots__ = ("columns", "phone", "name")
+
+    def __init__(self, columns: List[str], phone: int, name: Optional[int]):
+        self.columns, self.phone, self.name = columns, phone, name
+
+    def record(self, row: List[str]) -> Dict[str, str]:
+        """Satır → {sütun: değer}; isim sütunu ayrıca "name" olarak da verilir."""
+        rec = dict(zip(self.columns, row))
+        if self.name is not None and "name" not in rec:
+            rec["name"] = row[self.name] if len(row) > self.name else ""
+        return rec
+
+
+def _read_header(rows: Iterator[List[str]], required: bool = False
+                 ) -> Tuple[Optional[CSVHeader], Iterator[List[str]]]:
+    """csv.reader'ın ilk satırını başlık olarak yorumlar → (başlık, kalan satırlar).
+
+    Telefon sütunu tanınmazsa: required → ValueError; değilse ilk satır da
+    veridir. Boş girdi → (None, boş akış).
+    """
+    first = next(rows, None)
+    if first is None:
+        return None, rows
+    cols = [c.strip().lower() for c in first]
+    phone_i = next((i for i, c in enumerate(cols) if c in _PHONE_COLS), None)
+    name_i = next((i for i, c in enumerate(cols) if c in _NAME_COLS), None)
+    if phone_i is not None:
+        return CSVHeader(cols, phone_i, name_i), rows
+    if required:
+        raise ValueError(f"telefon sütunu bulunamadı ({', '.join(_PHONE_COLS)})")
+    return CSVHeader([], 0, 1 if len(first) > 1 else None), itertools.chain([first], rows)
+
+
+def _iter_csv(path: Path):
+    """CSV / Excel'den dışa aktarılmış CSV → (ham numara, isim) akışı."""
+    with open(path, "r", encoding=_text_encoding(path), errors="replace", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        head, rows = _read_header(_csv_reader(f, sample))
+        if head is None:
+            return
+        phone_i, name_i = head.phone, head.name
+        for row in rows:
+            if len(row) > phone_i:
+                name = row[name_i].strip() if name_i is not None and len(row) > name_i else ""
+                yield row[phone_i], name
+
+
+def _vcf_escape(text: str) -> str:
+    """vCard metin değeri: \\ , ; ve satır sonları kaçışlanır (RFC 6350 3.4)."""
+    return (text.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;")
+            .replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n"))
+
+
+def _vcf_unescape(text: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
+
+
+def _iter_vcf(path: Path):
+    """vCard dosyası → (ham numara, isim) akışı; kart kart okunur."""
+    name, tels = "", []
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            key, _, val = line.partition(":")
+            key = key.upper()
+            if key == "BEGIN":
+                name, tels = "", []
+            elif key == "FN":
+                name = _vcf_unescape(val.strip())
+            elif key.split(";")[0] == "TEL" or key.endswith(".TEL"):
+                tels.append(val)
+            elif key == "END":
+                for t in tels:
+                    yield t, name
+                name, tels = "", []
+
+
+def _iter_contacts_file(path: Path):
+    return _iter_vcf(path) if path.suffix.lower() in (".vcf", ".vcard") else _iter_csv(path)
+
+
+def import_contacts(path, store: Optional[ContactStore] = None, tags=(),
+                    chunk: int = IMPORT_CHUNK, progress=None) -> Dict[str, int]:
+    """Dosyayı akış halinde okuyup rehbere parça parça yazar.
+
+    Bellekte en fazla bir parça (chunk) tutulur. progress(sayaçlar) her parça
+    sonrası çağrılır. Dönüş: {'read', 'added', 'duplicate', 'invalid'}.
+    """
+    if store is None:
+        store = get_contacts()
+    stats = {"read": 0, "added": 0, "duplicate": 0, "invalid": 0}
+    batch: Dict[str, str] = {}
+
+    def _flush():
+        added = store.add_many(batch.items(), tags)
+        stats["added"] += added
+        stats["duplicate"] += len(batch) - added
+        batch.clear()
+        if progress:
+            progress(dict(stats))
+
+    for num, name in normalize_pairs(_iter_contacts_file(Path(path)), batch=chunk):
+        stats["read"] += 1
+        if num is None:
+            stats["invalid"] += 1
+        elif num in batch:
+            stats["duplicate"] += 1
+        else:
+            batch[num] = name
+            if len(batch) >= chunk:
+                _flush()
+    _flush()
+    return stats
+
+
+def export_contacts(path, store: Optional[ContactStore] = None,
+                    tag: Optional[str] = None) -> int:
+    """Rehberi .csv ya da .vcf olarak akış halinde yazar → yazılan kayıt sayısı."""
+    if store is None:
+        store = get_contacts()
+    path = Path(path)
+    n = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() in (".vcf", ".vcard"):
+            for num, name in store.iter_rows(tag):
+                f.write("BEGIN:VCARD\r\nVERSION:3.0\r\n"
+                        f"FN:{_vcf_escape(name) or '+' + num}\r\n"
+                        f"TEL;TYPE=CELL:+{num}\r\nEND:VCARD\r\n")
+                n += 1
+        else:
+            import csv
+            w = csv.writer(f)
+            w.writerow(("number", "name"))
+            for row in store.iter_rows(tag):
+                w.writerow(row)
+                n += 1
+    return n
+
+
+def load_contacts() -> list[str]:
+    """Rehber → ['905551112233', ...] (sıralı)"""
+    return get_contacts().numbers()
+
+
+def save_contacts(lst: list[str]):
+    """Rehberi verilen listeyle eşitle (yalnızca farklar yazılır)."""
+    store, want = get_contacts(), set(lst)
+    have = set(store.numbers())
+    for num in want - have:
+        store.add(num)
+    for num in have - want:
+        store.remove(num)
+
+
+# ------------------------------------------------------------
+# 2-c) Kalıcı gönderim günlüğü (devam ettirilebilir kampanyalar)
+# ------------------------------------------------------------
+def _msg_hash(*messages: str) -> str:
+    import hashlib
+    return hashlib.sha1("\x00".join(messages).encode("utf-8")).hexdigest()[:16]
+
+
+def campaign_id(numbers: List[str], messages: List[str]) -> str:
+    """Aynı numara + mesaj listesi her zaman aynı kampanya kimliğini üretir."""
+    import hashlib
+    h = hashlib.sha1()
+    for m in messages:
+        h.update(m.encode("utf-8") + b"\x00")
+    for n in numbers:
+        h.update(n.encode("utf-8") + b"\n")
+    return h.hexdigest()[:12]
+
+
+class Journal:
+    """Yalnızca-ekleme gönderim günlüğü (SQLite, WAL).
+
+    Her deneme bir satırdır: kampanya, alıcı, mesaj özeti, durum, zamanlar.
+    msg_index 0 alıcı düzeyindeki sonuçtur; çok mesajlı gönderimde her mesaj
+    ayrıca kendi sırası (1, 2, …) ve özetiyle yazılır (bkz. _journaled_multi).
+    Satırlar anında commit edilir; Chrome ölse ya da süreç os._exit() ile
+    bitse bile o ana kadar gönderilenler kayıtlıdır.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or _profile_dir() / "journal.sqlite3"
+        self._lock = threading.Lock()
+        self._con = _db_connect(self.path)
+        self._con.executescript("""
+            CREATE TABLE IF NOT EXISTS sends (
+                id        INTEGER PRIMARY KEY,
+                campaign  TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                msg_hash  TEXT NOT NULL,
+                status    TEXT NOT NULL,
+                started   REAL NOT NULL,
+                finished  REAL NOT NULL,
+                msg_index INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS sends_campaign
+                ON sends (campaign, status, msg_hash);
+        """)
+        cols = {r[1] for r in self._con.execute("PRAGMA table_info(sends)")}
+        if "msg_index" not in cols:             # eski günlük dosyası
+            self._con.execute(
+                "ALTER TABLE sends ADD COLUMN msg_index INTEGER NOT NULL DEFAULT 0")
+        self._con.execute(
+            "CREATE INDEX IF NOT EXISTS sends_recipient ON sends (campaign, recipient)")
+        self._con.commit()
+
+    def record(self, campaign: str, recipient: str, msg_hash: str,
+               status: str, started: float, index: int = 0):
+        with self._lock:
+            self._con.execute(
+                "INSERT INTO sends (campaign, recipient, msg_hash, status, started,"
+                " finished, msg_index) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (campaign, recipient, msg_hash, status, started, time.time(), index),
+            )
+            self._con.commit()
+
+    def completed(self, campaign: str, msg_hash: str) -> set:
+        """Bu kampanyada mesajı (mesajların hepsini) başarıyla almış alıcılar."""
+        with self._lock:
+            rows = self._con.execute(
+                "SELECT recipient FROM sends WHERE campaign = ? AND status = 'sent'"
+                " AND msg_hash = ? AND msg_index = 0",
+                (campaign, msg_hash),
+            )
+            return {r[0] for r in rows}
+
+    def sent_messages(self, campaign: str, recipient: str, hashes: List[str]) -> set:
+        """Alıcıya bu kampanyada gönderilmiş mesaj sıraları (1'den başlar).
+
+        Sıra ancak o sıradaki mesajın özeti de tutuyorsa sayılır.
+        """
+        with self._lock:
+            rows = self._con.execute(
+                "SELECT msg_index, msg_hash FROM sends WHERE campaign = ?"
+                " AND recipient = ? AND status = 'sent' AND msg_index > 0",
+                (campaign, recipient),
+            )
+            return {i for i, h in rows if i <= len(hashes) and hashes[i - 1] == h}
+
+
+_JOURNAL: Optional[Journal] = None
+
+
+def get_journal() -> Journal:
+    global _JOURNAL
+    if _JOURNAL is None:
+        _JOURNAL = Journal()
+    return _JOURNAL
+
+
+# ------------------------------------------------------------
+# 2-d) Geçersiz numara önbelleği (negatif önbellek, TTL'li)
+# ------------------------------------------------------------
+NEG_CACHE_TTL_DAYS = 30       # bu süre sonra numara yeniden denenir
+
+
+class NegativeCache:
+    """WhatsApp'ta olmayan / geçersiz numaraların kalıcı listesi.
+
+    Kayıtlar NEG_CACHE_TTL_DAYS gün geçerlidir; sonraki kampanyalar bu
+    numaraları tarayıcıya hiç gitmeden atlar.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl_days: float = NEG_CACHE_TTL_DAYS):
+        self.path = path or _profile_dir() / "negative_cache.sqlite3"
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._con = _db_connect(self.path)
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS invalid_numbers (
+                number  TEXT PRIMARY KEY,
+                reason  TEXT NOT NULL,
+                checked REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def add(self, number: str, reason: str):
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO invalid_numbers (number, reason, checked)"
+                " VALUES (?, ?, ?)", (number, reason, time.time()))
+
+    def __contains__(self, number: str) -> bool:
+        with self._lock:
+            return self._con.execute(
+                "SELECT 1 FROM invalid_numbers WHERE number = ? AND checked > ?",
+                (number, time.time() - self.ttl)).fetchone() is not None
+
+
+_NEG_CACHE: Optional[NegativeCache] = None
+
+
+def get_negative_cache() -> NegativeCache:
+    global _NEG_CACHE
+    if _NEG_CACHE is None:
+        _NEG_CACHE = NegativeCache()
+    return _NEG_CACHE
+
+
+# ------------------------------------------------------------
+# 2-e) Ölçümler: aşama gecikmeleri ve sayaçlar
+# ------------------------------------------------------------
+# Her aşama (sürücü, sohbet açma, gönderme, bekleme…) milisaniye cinsinden
+# histograma yazılır. Süreç boyunca biriken değerler Prometheus metin
+# biçiminde metrics.prom dosyasına (servis açıksa GET /metrics'e), kampanya
+# başına p50/p95/p99 özeti ise metrics/<kampanya>.json dosyasına yazılır.
+METRICS_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Metrics:
+    """Gecikme histogramları ve sayaçlar; iş parçacığı güvenli.
+
+    keep_samples=True ise ham ölçümler de saklanır (yüzdelikler için);
+    attach() ile bağlanan alt toplayıcılar (kampanya özeti) her ölçümü alır.
+    """
+
+    def __init__(self, buckets=METRICS_BUCKETS_MS, keep_samples: bool = False):
+        self.buckets = tuple(buckets)
+        self.keep_samples = keep_samples
+        self.counters: Dict[str, int] = {}
+        self._hist: Dict[str, List[int]] = {}
+        self._sum: Dict[str, float] = {}
+        self._samples: Dict[str, List[float]] = {}
+        self._children: List["Metrics"] = []
+        self._lock = threading.Lock()
+
+    def attach(self, child: "Metrics"):
+        with self._lock:
+            self._children.append(child)
+
+    def detach(self, child: "Metrics"):
+        with self._lock:
+            if child in self._children:
+                self._children.remove(child)
+
+    def inc(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            children = list(self._children)
+        for c in children:
+            c.inc(name, n)
+
+    def observe(self, stage: str, ms):
+        """Bir gecikme ekler; sayı olmayan (ya da NaN) değerler yok sayılır."""
+        if isinstance(ms, bool) or not isinstance(ms, (int, float)) or ms != ms:
+            return
+        with self._lock:
+            counts = self._hist.get(stage)
+            if counts is None:
+                counts = self._hist[stage] = [0] * (len(self.buckets) + 1)
+            counts[bisect.bisect_left(self.buckets, ms)] += 1
+            self._sum[stage] = self._sum.get(stage, 0.0) + ms
+            if self.keep_samples:
+                self._samples.setdefault(stage, []).append(ms)
+            children = list(self._children)
+        for c in children:
+            c.observe(stage, ms)
+
+    @contextlib.contextmanager
+    def timer(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, (time.perf_counter() - t0) * 1000)
+
+    def prometheus(self) -> str:
+        """Prometheus metin biçimi (text exposition format 0.0.4)."""
+        lines = ["# TYPE wab_stage_latency_ms histogram"]
+        with self._lock:
+            for stage in sorted(self._hist):
+                cum = 0
+                for le, n in zip(self.buckets + ("+Inf",), self._hist[stage]):
+                    cum += n
+                    lines.append(f'wab_stage_latency_ms_bucket{{stage="{stage}",le="{le}"}} {cum}')
+                lines.append(f'wab_stage_latency_ms_sum{{stage="{stage}"}} {self._sum[stage]:.1f}')
+                lines.append(f'wab_stage_latency_ms_count{{stage="{stage}"}} {cum}')
+            for name in sorted(self.counters):
+                lines.append(f"# TYPE wab_{name}_total counter")
+                lines.append(f"wab_{name}_total {self.counters[name]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[Path] = None):
+        path = path or _profile_dir() / "metrics.prom"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(self.prometheus(), encoding="utf-8")
+        os.replace(tmp, path)                 # okuyucu yarım dosya görmesin
+
+    def summary(self) -> dict:
+        """Aşama başına adet, ortalama ve (ham ölçüm varsa) p50/p95/p99."""
+        with self._lock:
+            stages = {}
+            for stage, counts in self._hist.items():
+                n = sum(counts)
+                st = {"count": n, "mean_ms": round(self._sum[stage] / n, 1)}
+                xs = sorted(self._samples.get(stage, ()))
+                if xs:
+                    for q in (50, 95, 99):
+                        st[f"p{q}_ms"] = round(xs[min(len(xs) - 1, len(xs) * q // 100)], 1)
+                stages[stage] = st
+            return {"stages": stages, "counters": dict(self.counters)}
+
+
+_METRICS = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return _METRICS
+
+
+def _write_campaign_summary(campaign: str, camp: Metrics, elapsed: float):
+    """Kampanya özetini JSON'a yazar, metrics.prom'u tazeler, kısa özet basar."""
+    data = {"campaign": campaign, "elapsed_sec": round(elapsed, 1), **camp.summary()}
+    out = _profile_dir() / "metrics"
+    try:
+        out.mkdir(exist_ok=True)
+        (out / f"{campaign}.json").write_text(
+            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        _METRICS.write_prometheus()
+    except OSError as e:
+        print(f"Ölçümler yazılamadı: {e}")
+    msg = data["stages"].get("message")
+    if msg:
+        print(f"Kampanya {campaign}: {msg['count']} alıcı / {elapsed:.0f} sn – "
+              f"p50 {msg['p50_ms']:.0f} ms, p95 {msg['p95_ms']:.0f} ms, "
+              f"p99 {msg['p99_ms']:.0f} ms")
+
+
+# ------------------------------------------
+# 3) Gönderim yardımcıları
+# ------------------------------------------------------------
+# (By.CSS_SELECTOR == "css selector"; Selenium içe aktarılmadan tanımlanabilsin)
+MSG_BOX = ("css selector", "div[role='textbox'][contenteditable='true']")
+
+SEND_ICON = (
+    "css selector",
+    "span[data-icon='send'], span[data-testid='send'], "
+    "div[data-testid='send'], button[aria-label='Send']",
+)
+
+
+# Sohbet açma yöntemi:
+#   "inpage" → yüklü uygulamanın içinden (SPA yeniden başlamaz, ≈ birkaç yüz ms)
+#   "url"    → her numara için drv.get() ile tam sayfa yükleme (eski yöntem)
+NAV_MODE = "inpage"
+INPAGE_TIMEOUT = 3.0          # sn – bu sürede sohbet açılmazsa URL yöntemine düş
+INPAGE_MAX_FAILS = 3          # art arda bu kadar başarısızlıkta URL yöntemine geç
+INPAGE_RETRY_SEC = 300        # URL'ye geçildikten bu kadar sonra inpage bir kez daha denenir
+# Başarısızlık sayacı sürücü başınadır (_TLS: havuz işçisi ya da ana iş
+# parçacığı); her kampanya başında (_run_stream) sıfırlanır.
+_INPAGE_EPOCH = itertools.count(1)
+_INPAGE_CAMPAIGN = 0
+
+
+def _inpage_fails() -> int:
+    if getattr(_TLS, "inpage_epoch", None) != _INPAGE_CAMPAIGN:   # yeni kampanya
+        _TLS.inpage_epoch, _TLS.inpage_fails, _TLS.inpage_off = _INPAGE_CAMPAIGN, 0, 0.0
+    return _TLS.inpage_fails
+
+
+def _inpage_enabled(nav: Optional[str] = None) -> bool:
+    """Bu sürücüde uygulama içi yol denensin mi? Süre dolunca bir hak daha verir."""
+    if (nav or NAV_MODE) != "inpage":
+        return False
+    if _inpage_fails() < INPAGE_MAX_FAILS:
+        return True
+    if time.time() - _TLS.inpage_off >= INPAGE_RETRY_SEC:
+        _TLS.inpage_fails = INPAGE_MAX_FAILS - 1
+        return True
+    return False
+
+
+def _inpage_outcome(ok: bool):
+    """inpage denemesinin sonucunu bu sürücünün sayacına işler."""
+    if ok:
+        _TLS.inpage_fails = 0
+        return
+    _TLS.inpage_fails = _inpage_fails() + 1
+    if _TLS.inpage_fails == INPAGE_MAX_FAILS:
+        _TLS.inpage_off = time.time()
+        print(f"Uygulama içi açma {INPAGE_MAX_FAILS} kez başarısız → "
+              f"{INPAGE_RETRY_SEC} sn URL yöntemi")
+
+
+# Tüm enjekte edilen betiklerin ortak yardımcıları (execute_async_script ile çalışır)
+_JS_LIB = r"""
+const __wab = {
+  box: () => document.querySelector(
+      "#main footer div[role='textbox'][contenteditable='true'], " +
+      "#main div[role='textbox'][contenteditable='true']"),
+  sendBtn: () => document.querySelector(
+      "span[data-icon='send'], span[data-testid='send'], " +
+      "div[data-testid='send'], button[aria-label='Send']"),
+  // sohbetteki son giden mesaj balonu (liste sanallaştırıldığı için sayı değil öğe)
+  lastOut: () => {
+    const l = document.querySelectorAll('#main .message-out');
+    return l.length ? l[l.length - 1] : null;
+  },
+  // fn() doğru bir değer döndürene dek DOM değişikliklerini izle; süre dolarsa null
+  waitFor: (fn, ms) => new Promise(res => {
+    const check = () => { try { return fn(); } catch (e) { return null; } };
+    const first = check();
+    if (first) return res(first);
+    const obs = new MutationObserver(() => {
+      const v = check();
+      if (v) { obs.disconnect(); clearTimeout(t); res(v); }
+    });
+    obs.observe(document.body, {childList: true, subtree: true, attributes: true});
+    const t = setTimeout(() => { obs.disconnect(); res(check()); }, ms);
+  }),
+  // Gizli api.whatsapp.com/send bağlantısını tıkla; WhatsApp Web bunu kendi
+  // yönlendiricisiyle yakalar. Tarayıcının varsayılan gezinmesi window
+  // seviyesinde engellenir, böylece sayfa asla terk edilmez.
+  route: (side, phone) => {
+    const a = document.createElement('a');
+    a.href = 'https://api.whatsapp.com/send?phone=' + phone;
+    a.style.display = 'none';
+    window.addEventListener('click', e => e.preventDefault(), {once: true});
+    side.appendChild(a);
+    a.click();
+    a.remove();
+  },
+  // route() sonrası yeni #main ve içindeki mesaj kutusu
+  chatOpened: prev => {
+    const m = document.querySelector('#main');
+    return m && m !== prev && __wab.box();
+  },
+  // Gerçek yavaşlama sinyali → türünü döndürür: çevrimdışı, telefon / bilgisayar
+  // bağlantı bandı ya da "çok fazla istek" bildirimi. "Masaüstü bildirimlerini
+  // aç" bandı (alert-notification) kalıcıdır ve hız ile ilgisi yoktur → sayılmaz.
+  throttled: () => {
+    if (!navigator.onLine) return 'offline';
+    const a = document.querySelector(
+        "[data-testid='alert-phone'], [data-testid='alert-computer'], " +
+        "#side span[data-icon='alert-phone'], #side span[data-icon='alert-computer']");
+    if (a) return a.getAttribute('data-testid') || a.getAttribute('data-icon');
+    for (const n of document.querySelectorAll("[data-testid='toast-container'], [role='alert']"))
+      if (/too many|rate limit|try again later|çok fazla|daha sonra tekrar/i.test(n.textContent))
+        return 'rate_limit';
+    return null;
+  },
+  // "Phone number shared via url is invalid" ve benzeri açılır pencereler;
+  // bulunursa pencere kapatılır ve metni döner
+  invalid: () => {
+    const p = document.querySelector(
+        "div[data-animate-modal-popup='true'], [data-testid='popup-contents']");
+    if (!p) return null;
+    const txt = p.textContent.trim();
+    if (!/invalid|geçersiz|not on whatsapp|whatsapp'ta değil|kullanmıyor/i.test(txt))
+      return null;
+    const ok = p.querySelector('button');
+    if (ok) ok.click();
+    return txt.slice(0, 120) || 'invalid';
+  },
+  // Metni yapıştırma olayıyla kutuya bırak (satır sonları korunur)
+  insert: (box, text) => {
+    box.focus();
+    const dt = new DataTransfer();
+    dt.setData('text/plain', text);
+    box.dispatchEvent(new ClipboardEvent(
+        'paste', {clipboardData: dt, bubbles: true, cancelable: true}));
+    if (!box.textContent.trim()) document.execCommand('insertText', false, text);
+    return box.textContent.trim().length > 0;
+  },
+};
+"""
+
+# Uygulama içi yönlendirme (SPA yeniden yüklenmez)
+_JS_OPEN_INPAGE = r"""
+const [phone, ms, done] = arguments;
+(async () => {
+  const side = await __wab.waitFor(() => document.querySelector('#side'), ms);
+  if (!side) return done('no_app');
+  const prev = document.querySelector('#main');
+  __wab.route(side, phone);
+  let bad = null;
+  const box = await __wab.waitFor(
+      () => (bad = __wab.invalid()) || __wab.chatOpened(prev), ms);
+  done(bad ? 'invalid' : box ? 'ok' : 'timeout');
+})();
+"""
+
+_JS_TYPE = r"""
+const [text, done] = arguments;
+const box = __wab.box();
+done(box ? __wab.insert(box, text) : false);
+"""
+
+
+def _type_message(drv, message: str) -> bool:
+    """Açık sohbetin mesaj kutusuna metni yazar (tek round-trip)."""
+    try:
+        return bool(drv.execute_async_script(_JS_LIB + _JS_TYPE, message))
+    except Exception:
+        return False
+
+
+class InvalidNumberError(Exception):
+    """Numara geçersiz ya da WhatsApp kullanmıyor (açılır pencere görüldü)."""
+
+    def __init__(self, number: str, reason: str = "invalid"):
+        super().__init__(f"{number}: {reason}")
+        self.number = number
+        self.reason = reason
+
+
+# URL ile açılışta: kutu hazır mı, geçersiz numara penceresi mi çıktı?
+_JS_CHAT_STATE = r"""
+const bad = __wab.invalid();
+if (bad) return 'invalid:' + bad;
+return document.querySelector("div[role='textbox'][contenteditable='true']") ? 'ready' : null;
+"""
+
+
+def _open_chat_inpage(drv, number: str, message: str) -> bool:
+    """Sohbeti sayfayı yenilemeden aç ve mesajı yaz; olmazsa False."""
+    try:
+        with _METRICS.timer("open_inpage"):
+            state = drv.execute_async_script(
+                _JS_LIB + _JS_OPEN_INPAGE,
+                number.lstrip("+"), int(INPAGE_TIMEOUT * 1000),
+            )
+    except Exception:
+        state = "error"
+
+    if state == "invalid":
+        raise InvalidNumberError(number)
+    if state == "ok":
+        with _METRICS.timer("type"):
+            typed = _type_message(drv, message)
+        if typed:
+            _inpage_outcome(True)
+            return True
+
+    if state != "no_app":          # uygulama henüz yüklenmediyse yöntemi suçlama
+        _inpage_outcome(False)
+    return False
+
+
+def _chat_url(number: str, message: str, quoted: Optional[str] = None) -> str:
+    """Sohbeti mesajla açan /send adresi (quoted → önceden kodlanmış metin)."""
+    return (
+        WA_URL + "/send?phone="
+        + number.lstrip("+") +
+        "&text=" + (urllib.parse.quote(message) if quoted is None else quoted) +
+        "&type=phone_number&app_absent=0" +
+        f"&cb={int(time.time()*1000)}"          # cache-buster → her çağrı benzersiz
+    )
+
+
+def _open_chat_url(drv, number: str, message: str, quoted: Optional[str] = None):
+    """Numarayı & mesajı URL ile aç; kutu DOM’a düşene dek bekle.
+
+    quoted verilirse mesajın önceden URL kodlanmış hali kullanılır.
+    """
+    if not drv.current_url.startswith(WA_URL):
+        drv.get(WA_URL)
+
+    url = _chat_url(number, message, quoted)
+    with _METRICS.timer("open_nav"):
+        drv.get(url)
+
+    # kutu ya da "geçersiz numara" penceresi – hangisi önce gelirse
+    with _METRICS.timer("open_box_wait"):
+        state = WebDriverWait(drv, 4).until(
+            lambda d: d.execute_script(_JS_LIB + _JS_CHAT_STATE))
+    if state.startswith("invalid"):
+        raise InvalidNumberError(number, state.partition(":")[2] or "invalid")
+
+
+def _open_chat(number: str, message: str, nav: Optional[str] = None,
+               quoted: Optional[str] = None):
+    """Sohbeti aç ve mesajı kutuya yerleştir.
+
+    Önce uygulama içi yönlendirme denenir; başarısız olursa (veya
+    nav="url" ise) eski tam sayfa yükleme yöntemine düşülür.
+    Numara geçersizse InvalidNumberError fırlatır.
+    """
+    drv = get_driver()
+
+    if _inpage_enabled(nav):
+        if _open_chat_inpage(drv, number, message):
+            return
+        _METRICS.inc("fallback_url")
+
+    _open_chat_url(drv, number, message, quoted)
+
+
+# Olay güdümlü gönderim: MutationObserver gönder ikonunu DOM'a düştüğü anda
+# tıklar, ardından giden balon sohbete eklenene dek bekler – tek round-trip.
+_JS_SEND_OBSERVE = r"""
+const [ms, done] = arguments;
+(async () => {
+  const t0 = performance.now();
+  const prev = __wab.lastOut();
+  let bad = null;
+  const btn = await __wab.waitFor(() => (bad = __wab.invalid()) || __wab.sendBtn(), ms);
+  if (bad) return done('invalid');
+  if (!btn) return done('no_button');
+  btn.click();
+  const left = Math.max(ms - (performance.now() - t0), 1000);
+  const bubble = await __wab.waitFor(() => {
+    const b = __wab.lastOut();
+    return b && b !== prev;
+  }, left);
+  done(bubble ? 'sent' : 'clicked');
+})();
+"""
+
+
+def _wait_and_send(timeout: int = 8) -> bool:
+    """Gönder ikonu veya Enter tuşu ile mesajı iletir."""
+    drv = get_driver()
+    deadline = time.time() + timeout
+
+    # 0) Olay güdümlü yol: ikon belirdiği an tıkla, balonu doğrula
+    try:
+        with _METRICS.timer("send_click"):
+            state = drv.execute_async_script(
+                _JS_LIB + _JS_SEND_OBSERVE, int(timeout * 1000))
+    except Exception:
+        state = None                # async betik çalışmadı → yoklama döngüsü
+    if state in ("sent", "clicked"):
+        return True
+    if state == "invalid":
+        return False                # körlemesine Enter basma
+    if state == "no_button":
+        deadline = 0                # süre zaten doldu → doğrudan Enter yedeği
+
+    # 1) JavaScript ile ikon göründüğü anda tıkla (≈ 0,3 s)
+    js_click = """
+        const b = document.querySelector(
+          "span[data-icon='send'],span[data-testid='send'],\
+           div[data-testid='send'],button[aria-label='Send']"
+        );
+        if (b){ b.click(); return true; }
+        return false;
+    """
+    t0 = time.perf_counter()
+    while time.time() < deadline:
+        try:
+            if drv.execute_script(js_click):
+                _METRICS.observe("send_poll", (time.perf_counter() - t0) * 1000)
+                return True
+        except Exception:
+            pass
+        time.sleep(0.05)          # 50 ms döngü
+
+    # 2) Yedek plan: aktif elemana Enter
+    _METRICS.inc("fallback_enter")
+    try:
+        with _METRICS.timer("send_enter"):
+            drv.switch_to.active_element.send_keys(Keys.ENTER)
+        return True
+    except Exception:
+        return False
+
+
+# Tek betikte aç → bekle → yaz → gönder → tik doğrula. Sonuç: durum + aşama
+# süreleri (ms). Durumlar için bkz. SendResult.
+_JS_SEND_IN_PAGE = r"""
+const [phone, text, ms, notBefore, done] = arguments;
+(async () => {
+  const T = {};
+  let t = performance.now(), clickedAt = 0;
+  const lap = k => { const n = performance.now(); T[k] = Math.round(n - t); t = n; };
+  // gönderimden önce zaten görünen band kalıcı durumdur; yalnızca yeni sinyal sayılır
+  const calm = __wab.throttled();
+  const fin = (st, why) => {
+    const sig = __wab.throttled();
+    done({status: st, timings: T, reason: why || '', clickedAt,
+          throttled: !!sig && sig !== calm});
+  };
+
+  const side = await __wab.waitFor(() => document.querySelector('#side'), ms);
+  if (!side) return fin('no_app');
+  const prev = document.querySelector('#main');
+  __wab.route(side, phone);
+  let bad = null;
+  const box = await __wab.waitFor(
+      () => (bad = __wab.invalid()) || __wab.chatOpened(prev), ms);
+  lap('open');
+  if (bad) return fin('invalid', bad);
+  if (!box) return fin('open_failed');
+
+  if (!__wab.insert(box, text)) return fin('type_failed');
+  lap('type');
+
+  // hız sınırı: sohbet hazır, gönderim anını bekle
+  const idle = notBefore - Date.now();
+  if (idle > 0) await new Promise(r => setTimeout(r, idle));
+  lap('gap');
+
+  const prevOut = __wab.lastOut();
+  const btn = await __wab.waitFor(__wab.sendBtn, ms);
+  if (!btn) return fin('no_button');
+  btn.click();
+  clickedAt = Date.now();
+  lap('send');
+
+  const tick = await __wab.waitFor(() => {
+    const b = __wab.lastOut();
+    if (!b || b === prevOut) return null;
+    if (b.querySelector("span[data-icon^='msg-check'], span[data-icon^='msg-dblcheck']"))
+      return 'sent';
+    return b.querySelector("span[data-icon='msg-time']") ? 'pending' : null;
+  }, ms);
+  lap('confirm');
+  fin(tick || 'unconfirmed');
+})();
+"""
+
+
+# Gönder düğmesine basılmadan biten durumlar (bkz. SendResult.retryable)
+_PRESEND_STATUSES = ("no_app", "driver_lost", "open_failed", "type_failed", "no_button")
+
+
+class SendResult:
+    """send_in_page() sonucu.
+
+    status:
+      * sent / pending  → balon tik veya saat simgesiyle göründü
+      * unconfirmed     → gönder tıklandı ama balon doğrulanamadı
+      * invalid         → numara geçersiz / WhatsApp'ta yok (bkz. reason)
+      * no_app, open_failed, type_failed, no_button
+                        → mesaj gönderilmedi; başka yöntemle denenebilir
+      * driver_lost     → tarayıcı kapanmış; sürücü bırakıldı, yedek yol
+                          yenisini başlatır
+      * error           → betik hata verdi / zaman aşımı; tıklanıp
+                          tıklanmadığı bilinmez, yeniden gönderilmez
+    timings: aşama → milisaniye (open, type, gap, send, confirm, total)
+    """
+    __slots__ = ("number", "status", "timings", "reason", "clicked_at", "throttled")
+
+    def __init__(self, number: str, status: str, timings: Optional[dict] = None,
+                 reason: str = "", clicked_at: float = 0.0, throttled: bool = False):
+        self.number, self.status = number, status
+        self.timings = {} if timings is None else timings
+        self.reason = reason
+        self.clicked_at = clicked_at   # gönder tıklamasının epoch zamanı (0 → tıklanmadı)
+        self.throttled = throttled     # gönderim sırasında yeni bağlantı / hız sınırı sinyali
+
+    def __repr__(self) -> str:
+        return f"SendResult({self.number!r}, {self.status!r}, reason={self.reason!r})"
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("sent", "pending", "unconfirmed")
+
+    @property
+    def retryable(self) -> bool:
+        """Mesajın gitmediği kesin mi? (yalnızca o zaman URL yedeği denenir)
+
+        Tıklama olmuş olabilecekken yeniden göndermek çift mesaj demektir.
+        """
+        return not self.clicked_at and self.status in _PRESEND_STATUSES
+
+
+def send_in_page(number: str, message: str, timeout: float = 10,
+                 not_before: float = 0) -> SendResult:
+    """Bir alıcıyı tek WebDriver çağrısıyla gönderir (aç, yaz, gönder, doğrula).
+
+    not_before (epoch sn) verilirse sohbet hemen açılıp mesaj yazılır, gönder
+    tıklaması ise bu ana kadar bekletilir; böylece bekleme süresi bir sonraki
+    sohbetin hazırlanmasıyla örtüşür. Canlılık ayrıca yoklanmaz (current_url ek bir round trip olurdu); ölü
+    tarayıcı betik çağrısının istisnasından anlaşılır.
+    """
+    drv = _current_driver() or get_driver()
+    t0 = time.perf_counter()
+    try:
+        res = drv.execute_async_script(
+            _JS_LIB + _JS_SEND_IN_PAGE,
+            number.lstrip("+"), message, int(timeout * 1000), not_before * 1000,
+        ) or {}
+    except Exception as e:
+        res = {"status": "error"}
+        if _driver_lost(e):
+            _drop_driver()
+            res["status"] = "driver_lost"
+    return _send_result(number, res, t0)
+
+
+def _send_result(number: str, res: dict, t0: float) -> SendResult:
+    """_JS_SEND_IN_PAGE çıktısı → SendResult (+ aşama ölçümleri)."""
+    result = SendResult(number, res.get("status", "error"),
+                        dict(res.get("timings") or {}), res.get("reason") or "",
+                        (res.get("clickedAt") or 0) / 1000, bool(res.get("throttled")))
+    result.timings["total"] = round((time.perf_counter() - t0) * 1000)
+    for stage, ms in result.timings.items():
+        _METRICS.observe(f"inpage_{stage}", ms)
+    return result
+
+
+def _mark_invalid(number: str, reason: str) -> bool:
+    """Geçersiz numarayı negatif önbelleğe yazar; her zaman False döner."""
+    _METRICS.inc("invalid")
+    get_negative_cache().add(number, reason)
+    print(f"GEÇERSİZ → {number} ({reason})")
+    return False
+
+
+# ------------------------------------------------------------
+# 3-a) Uyarlamalı hız sınırlayıcı (AIMD)
+# ------------------------------------------------------------
+SLOW_CONFIRM_MS = 3000        # bundan yavaş onay → kısıtlama işareti
+AIMD_STEP_SEC = 0.25          # her sorunsuz gönderimde aralıktan düşülen
+MAX_SEND_INTERVAL = 60.0      # aralık en fazla bu kadar büyür
+
+
+class RateLimiter:
+    """Gönderimden gönderime (tıklamadan tıklamaya) en az `interval` sn.
+
+    Eski yöntemdeki gibi her gönderimden sonra körlemesine uyumaz; yalnızca
+    bir sonraki gönderim anını (next_at) belirler. Sohbet açma ve mesaj
+    yazma bu bekleme içinde yapılır. Aralık AIMD ile uyarlanır: kısıtlama
+    belirtisinde (yavaş onay, hata bandı, başarısızlık) ikiye katlanır,
+    her sorunsuz gönderimde AIMD_STEP_SEC azalarak tabana (min_interval) iner.
+    """
+
+    def __init__(self, interval: float, max_interval: float = MAX_SEND_INTERVAL):
+        self.min_interval = self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self._last = 0.0
+
+    def next_at(self) -> float:
+        return self._last + self.interval
+
+    def wait(self):
+        delay = self.next_at() - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        _METRICS.observe("gap_wait", max(delay, 0) * 1000)
+        self._last = time.time()
+
+    def sent(self, at: Optional[float] = None):
+        self._last = at or time.time()
+
+    def feedback(self, ok: bool, confirm_ms: float = 0, throttled: bool = False):
+        if throttled or not ok or confirm_ms > SLOW_CONFIRM_MS:
+            self.interval = min(max(self.interval * 2, 1.0), self.max_interval)
+        else:
+            self.interval = max(self.min_interval, self.interval - AIMD_STEP_SEC)
+
+
+def _limiter(gap_sec: float) -> RateLimiter:
+    """İş parçacığının sınırlayıcısı; taban = max(gap_sec, havuz hesap sınırı)."""
+    floor = max(gap_sec, getattr(_TLS, "min_interval", 0))
+    lim = getattr(_TLS, "limiter", None)
+    if lim is None or lim.min_interval != floor:
+        lim = _TLS.limiter = RateLimiter(floor)
+    return lim
+
+
+def send_single(number: str, message: str, wait_sec: int, gap_sec: float,
+                quoted: Optional[str] = None):
+    if _use_cdp():                              # aynı anlam, asyncio motoru üzerinden
+        return cdp_run(get_engine().send(0, number, message, wait_sec, gap_sec, quoted))
+    lim = _limiter(gap_sec)
+    ok = False
+    if _inpage_enabled():
+        res = send_in_page(number, message, wait_sec, not_before=lim.next_at())
+        if res.clicked_at:
+            lim.sent(res.clicked_at)
+        if res.status == "invalid":
+            return _mark_invalid(number, res.reason or "invalid")
+        ok = res.ok
+        if res.status not in ("no_app", "driver_lost"):
+            _inpage_outcome(ok)
+        if ok:
+            lim.feedback(res.status != "unconfirmed",
+                         res.timings.get("confirm", 0), res.throttled)
+        elif not res.retryable:                 # gitmiş olabilir → ikinci kez gönderme
+            lim.feedback(False)
+            print(f"HATA → {number}  ({res.status}: gönderim belirsiz, tekrar denenmedi)")
+            return False
+        else:
+            _METRICS.inc("fallback_url")
+
+    if not ok:                                  # gönderilmedi → çok adımlı yedek yol
+        try:
+            _open_chat(number, message, nav="url", quoted=quoted)
+        except InvalidNumberError as e:
+            return _mark_invalid(number, e.reason)
+        lim.wait()                              # sohbet hazır; gönderim anını bekle
+        ok = _wait_and_send(wait_sec)
+        lim.feedback(ok)
+    print(("Gönderildi" if ok else "HATA") + f" → {number}")
+    return ok
+
+
+def _run_stream(items: Iterable[Tuple[str, object]],
+                fn: Callable[[str, object], bool], workers: int,
+                campaign: str, msg_hash: str, resume: bool,
+                cancel: Optional[threading.Event] = None,
+                progress: Optional[Callable[[str, bool], None]] = None,
+                skipped: Optional[Callable[[str, object, str], None]] = None,
+                afn: Optional[Callable] = None) -> Dict[str, int]:
+    """Ortak toplu gönderim döngüsü: (numara, yük) akışını sabit bellekle işler.
+
+    Negatif önbellek ve devam ettirme (resume) filtreleri öğe öğe uygulanır;
+    havuzda sınırlı kuyruk, girdiyi işçilerin hızında çeker. Her gönderim
+    Journal'a yazılır; cancel set edilirse sıradaki alıcıya geçilmez;
+    progress(numara, başarılı) her alıcıdan sonra, skipped(numara, yük, neden)
+    ("done" / "invalid") atlanan her alıcı için çağrılır.
+    afn(motor, şerit, numara, yük) verilirse ve ENGINE "cdp" ise gönderimler
+    iş parçacıkları yerine CDPEngine olay döngüsünde yürür (workers = şerit).
+    → {"sent", "failed", "skipped"} sayaçları
+    """
+    global _INPAGE_CAMPAIGN
+    journal = get_journal()
+    neg = get_negative_cache()
+    done = journal.completed(campaign, msg_hash) if resume else set()
+    stats = {"sent": 0, "failed": 0, "skipped_invalid": 0, "skipped_done": 0}
+    lock = threading.Lock()
+
+    def _todo():
+        for num, payload in items:
+            if num in done:
+                stats["skipped_done"] += 1
+                if skipped:
+                    skipped(num, payload, "done")
+            elif num in neg:
+                stats["skipped_invalid"] += 1
+                if skipped:
+                    skipped(num, payload, "invalid")
+            else:
+                yield num, payload
+
+    def _record(num: str, ok: bool, started: float):
+        _METRICS.inc("sent" if ok else "failed")
+        journal.record(campaign, num, msg_hash, "sent" if ok else "failed", started)
+        with lock:
+            stats["sent" if ok else "failed"] += 1
+        if progress:
+            progress(num, ok)
+
+    def _one(item) -> bool:
+        num, payload = item
+        _watchdog().check()                 # mesaj sınırı: gerekirse tarayıcıyı yenile
+        started, ok = time.time(), False
+        try:
+            with _METRICS.timer("message"):
+                ok = fn(num, payload)
+        finally:
+            _record(num, ok, started)
+        return ok
+
+    with _SEND_LOCK:
+        _INPAGE_CAMPAIGN = next(_INPAGE_EPOCH)  # inpage sayaçları her sürücüde sıfırlanır
+        camp = Metrics(keep_samples=True)
+        _METRICS.attach(camp)
+        t0 = time.time()
+        try:
+            if afn is not None and _use_cdp():
+                lanes = max(workers, 1)
+                cdp_run(get_engine(lanes).run_stream(_todo(), afn, cancel, _record, lanes))
+            elif workers > 1:
+                get_pool(workers).run_stream(_todo(), _one, cancel)
+            else:
+                for item in _todo():
+                    if cancel is not None and cancel.is_set():
+                        break
+                    _one(item)
+        finally:
+            _METRICS.detach(camp)
+            if stats["sent"] or stats["failed"]:
+                _write_campaign_summary(campaign, camp, time.time() - t0)
+    if stats["skipped_invalid"]:
+        print(f"{stats['skipped_invalid']} numara geçersiz olarak önbellekte, atlandı.")
+    if stats["skipped_done"]:
+        print(f"Kampanya {campaign}: {stats['skipped_done']} alıcı zaten gönderilmiş, atlandı.")
+    return {"sent": stats["sent"], "failed": stats["failed"],
+            "skipped": stats["skipped_invalid"] + stats["skipped_done"]}
+
+
+def _run_bulk(numbers: List[str], fn: Callable[[str], bool], workers: int,
+              campaign: str, msg_hash: str, resume: bool,
+              cancel: Optional[threading.Event] = None,
+              progress: Optional[Callable[[str, bool], None]] = None,
+              afn: Optional[Callable] = None) -> Dict[str, bool]:
+    """_run_stream()'in liste sürümü → {numara: başarılı mı} (yalnızca işlenenler)."""
+    results: Dict[str, bool] = {}
+
+    def _progress(num: str, ok: bool):
+        results[num] = ok
+        if progress:
+            progress(num, ok)
+
+    _run_stream(((n, None) for n in numbers), lambda n, _: fn(n), workers,
+                campaign, msg_hash, resume, cancel, _progress, afn=afn)
+    return results
+
+
+def send_bulk(numbers: List[str], message: str, wait_sec: int, gap_sec: float,
+              workers: int = 1, campaign: Optional[str] = None,
+              resume: bool = False, cancel: Optional[threading.Event] = None,
+              progress: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+    """Tüm numaralara aynı mesajı gönderir → {numara: başarılı mı}.
+
+    workers > 1 ise liste DriverPool işçileri arasında paylaştırılır.
+    Her gönderim Journal'a yazılır; resume=True ise bu kampanyada zaten
+    gönderilmiş alıcılar atlanır.
+    """
+    quoted = urllib.parse.quote(message)     # kampanya başına bir kez
+
+    def _one(num: str) -> bool:
+        return send_single(num, message, wait_sec, gap_sec, quoted)
+
+    def _aone(eng, lane: int, num: str, _):
+        return eng.send(lane, num, message, wait_sec, gap_sec, quoted)
+
+    campaign = campaign or campaign_id(numbers, [message])
+    return _run_bulk(numbers, _one, workers, campaign, _msg_hash(message), resume,
+                     cancel, progress, afn=_aone)
+
+
+MSG_GAP_SEC = 0.5             # aynı sohbette art arda iki mesaj arası (sn)
+
+
+def send_multi(number: str, messages: List[str], wait_sec: int,
+               gap_sec: float, msg_gap_sec: float = MSG_GAP_SEC,
+               quoted: Optional[str] = None, skip: Iterable[int] = (),
+               on_message: Optional[Callable[[int, bool, float], None]] = None):
+    """Sohbeti bir kez aç, sıradaki tüm mesajları aynı sohbette gönder.
+
+    quoted: ilk mesajın önceden URL kodlanmış hali (kampanya başına bir kez).
+    skip: gönderilmeyecek mesaj sıraları (1'den başlar; devam ettirmede
+    zaten gönderilmiş olanlar). on_message(sıra, başarılı, başlangıç) her
+    mesajdan sonra çağrılır.
+    """
+    skip = set(skip)
+    pending = [(i, m) for i, m in enumerate(messages, 1) if i not in skip]
+    if not pending:
+        return True
+    all_ok = True
+    lim = _limiter(gap_sec)
+    try:
+        first_i, first = pending[0]
+        _open_chat(number, first, quoted=quoted if first_i == 1 else None)
+    except InvalidNumberError as e:
+        return _mark_invalid(number, e.reason)
+    for k, (i, msg) in enumerate(pending):
+        started = time.time()
+        if k:
+            time.sleep(msg_gap_sec)
+            ok = _type_message(get_driver(), msg) and _wait_and_send(wait_sec)
+        else:
+            lim.wait()                          # sohbet hazır; gönderim anını bekle
+            ok = _wait_and_send(wait_sec)
+            lim.feedback(ok)
+        if on_message:
+            on_message(i, ok, started)
+        print(("Gönderildi" if ok else "HATA") + f" ({i}/{len(messages)}) → {number}")
+        all_ok = all_ok and ok
+    return all_ok
+
+
+def _journaled_multi(campaign: str, resume: bool) -> Callable[..., bool]:
+    """Mesaj düzeyinde günlük tutan send_multi.
+
+    Her mesaj sırası ve özetiyle Journal'a yazılır; resume=True ise alıcının
+    bu kampanyada zaten gönderilmiş mesajları tekrar gönderilmez.
+    """
+    journal = get_journal()
+
+    def _send(number: str, messages: List[str], *args, **kw) -> bool:
+        hashes = [_msg_hash(m) for m in messages]
+        skip = journal.sent_messages(campaign, number, hashes) if resume else ()
+
+        def _mark(i: int, ok: bool, started: float):
+            journal.record(campaign, number, hashes[i - 1],
+                           "sent" if ok else "failed", started, index=i)
+
+        return send_multi(number, messages, *args, skip=skip, on_message=_mark, **kw)
+
+    return _send
+
+
+def send_bulk_multi(numbers: List[str], messages: List[str], wait_sec: int,
+                    gap_sec: float, msg_gap_sec: float = MSG_GAP_SEC,
+                    workers: int = 1, campaign: Optional[str] = None,
+                    resume: bool = False, cancel: Optional[threading.Event] = None,
+                    progress: Optional[Callable[[str, bool], None]] = None
+                    ) -> Dict[str, bool]:
+    """Alıcı öncelikli toplu gönderim.
+
+    Her numaranın sohbeti yalnızca bir kez açılır; boş olmayan tüm mesajlar
+    sırayla gönderildikten sonra bir sonraki numaraya geçilir.
+    """
+    msgs = [m for m in messages if m.strip()]
+    if not msgs:
+        return {}
+
+    quoted = urllib.parse.quote(msgs[0])
+    campaign = campaign or campaign_id(numbers, msgs)
+    multi = _journaled_multi(campaign, resume)
+
+    def _one(num: str) -> bool:
+        return multi(num, msgs, wait_sec, gap_sec, msg_gap_sec, quoted)
+
+    return _run_bulk(numbers, _one, workers, campaign, _msg_hash(*msgs), resume,
+                     cancel, progress)
+
+
+# ------------------------------------------------------------
+# 3-a-1) Kişiye özel mesaj şablonları ({name}, {order_id} …)
+# ------------------------------------------------------------
+# Şablon kampanya başına bir kez sabit parçalar + alan adları olarak derlenir;
+# sabit parçaların URL kodlaması da bir kez yapılır. Değerler CSV'den ya da
+# rehberden akış halinde okunur ve her alıcı için tembel (generator) üretilir.
+_TEMPLATE_FIELD = re.compile(r"\{\{|\}\}|\{(\w+)\}")
+
+
+class MessageTemplate:
+    """{alan} yer tutuculu mesaj. {{ ve }} düz parantez yazar.
+
+    Alan adları büyük/küçük harf duyarsızdır (CSV başlıkları küçültülür);
+    satırda olmayan alan boş metin olarak yazılır.
+    """
+
+    def __init__(self, text: str):
+        static, fields, buf, pos = [], [], [], 0
+        for m in _TEMPLATE_FIELD.finditer(text):
+            buf.append(text[pos:m.start()])
+            if m.group(1) is None:               # {{ → {   }} → }
+                buf.append(m.group(0)[0])
+            else:
+                static.append("".join(buf))
+                fields.append(m.group(1).lower())
+                buf = []
+            pos = m.end()
+        buf.append(text[pos:])
+        static.append("".join(buf))
+        self.text = text
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.hash = _msg_hash(text)
+        self._static = tuple(static)
+        self._quoted = tuple(urllib.parse.quote(p) for p in static)
+
+    def _join(self, parts: Tuple[str, ...], row: Dict[str, str], enc) -> str:
+        out = [parts[0]]
+        for f, part in zip(self.fields, parts[1:]):
+            out.append(enc(str(row.get(f) or "")))
+            out.append(part)
+        return "".join(out)
+
+    def render(self, row: Dict[str, str]) -> str:
+        return self._join(self._static, row, str) if self.fields else self._static[0]
+
+    def quoted(self, row: Dict[str, str]) -> str:
+        """render() çıktısının URL kodlanmış hali; yalnızca değerler kodlanır."""
+        if not self.fields:
+            return self._quoted[0]
+        return self._join(self._quoted, row, urllib.parse.quote)
+
+    def missing(self, columns) -> List[str]:
+        cols = {c.lower() for c in columns}
+        return [f for f in self.fields if f not in cols]
+
+
+def check_template_fields(templates: List[MessageTemplate], columns: Iterable[str]):
+    """Şablonlardaki her alan sütunlarda var mı? Yoksa ValueError."""
+    cols = set(columns)
+    missing = sorted({f for t in templates for f in t.missing(cols)})
+    if missing:
+        raise ValueError("şablonda girdide olmayan alan(lar): " + ", ".join(
+            "{" + f + "}" for f in missing))
+
+
+def with_contact_names(records: Iterable[Tuple[str, Dict[str, str]]],
+                       store: Optional[ContactStore] = None,
+                       batch: int = 500) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Boş "name" alanlarını rehberdeki isimle doldurur (parça parça sorgu).
+
+    Rehberde de yoksa alan boş metin olur; böylece her kayıtta "name" vardır.
+    """
+    if store is None:
+        store = get_contacts()
+    it = iter(records)
+    for chunk in iter(lambda: list(itertools.islice(it, batch)), []):
+        names = store.names([n for n, rec in chunk if not rec.get("name")])
+        for num, rec in chunk:
+            if not rec.get("name"):
+                rec["name"] = names.get(num, "")
+            yield num, rec
+
+
+def send_bulk_template(templates, records: Iterable[Tuple[str, Dict[str, str]]],
+                       wait_sec: int, gap_sec: float, workers: int = 1,
+                       campaign: Optional[str] = None, resume: bool = False,
+                       cancel: Optional[threading.Event] = None,
+                       progress: Optional[Callable[[str, bool], None]] = None,
+                       columns: Optional[Iterable[str]] = None,
+                       on_record: Optional[Callable[[str, Dict[str, str], bool], None]] = None,
+                       skipped: Optional[Callable[[str, Dict[str, str], str], None]] = None
+                       ) -> Dict[str, int]:
+    """Kişiye özel toplu gönderim; kayıtlar akış halinde, sabit bellekle işlenir.
+
+    templates: metin / MessageTemplate ya da bunların listesi (alıcı başına
+    sırayla gönderilen mesajlar). Şablon alanları columns'ta (verilmezse ilk
+    kaydın alanlarında) yoksa hiçbir şey gönderilmeden ValueError verilir.
+    Kampanya kimliği verilmezse şablonlardan türetilir. on_record(numara,
+    kayıt, başarılı) her gönderimden, skipped(numara, kayıt, neden) atlanan
+    her alıcıdan sonra çağrılır.
+    → {"sent", "failed", "skipped"}
+    """
+    if isinstance(templates, (str, MessageTemplate)):
+        templates = [templates]
+    tpls = [t if isinstance(t, MessageTemplate) else MessageTemplate(t) for t in templates]
+    mh = _msg_hash(*(t.text for t in tpls))
+    campaign = campaign or f"tpl-{mh}"
+
+    it = iter(records)
+    first = next(it, None)
+    if first is None:
+        return {"sent": 0, "failed": 0, "skipped": 0}
+    check_template_fields(tpls, first[1] if columns is None else columns)
+
+    multi = _journaled_multi(campaign, resume)
+
+    def _one(num: str, rec: Dict[str, str]) -> bool:
+        ok = False
+        try:
+            if len(tpls) == 1:
+                ok = send_single(num, tpls[0].render(rec), wait_sec, gap_sec,
+                                 tpls[0].quoted(rec))
+            else:
+                ok = multi(num, [t.render(rec) for t in tpls], wait_sec, gap_sec,
+                           quoted=tpls[0].quoted(rec))
+        finally:
+            if on_record:
+                on_record(num, rec, ok)
+        return ok
+
+    async def _aone(eng, lane: int, num: str, rec: Dict[str, str]) -> bool:
+        ok = False
+        try:
+            ok = await eng.send(lane, num, tpls[0].render(rec), wait_sec, gap_sec,
+                                tpls[0].quoted(rec))
+        finally:
+            if on_record:
+                on_record(num, rec, ok)
+        return ok
+
+    return _run_stream(itertools.chain([first], it), _one, workers, campaign, mh,
+                       resume, cancel, progress, skipped,
+                       afn=_aone if len(tpls) == 1 else None)
+
+
+# ------------------------------------------------------------
+# 3-c) Paralel gönderim: sürücü havuzu
+# ------------------------------------------------------------
+POOL_RATE_PER_MIN = 20        # işçi (hesap) başına dakikada en fazla gönderim
+
+
+class DriverPool:
+    """Her işçinin kendi uc.Chrome'u ve profil klasörü olan sürücü havuzu.
+
+    İşçi 0 ana profili (tekil _DRIVER) kullanır; işçi N ise
+    ``whatsapp_profile_N`` klasörünü, yani ayrı bir bağlı hesabı kullanabilir.
+    Numaralar ortak bir kuyruktan dağıtılır, sonuçlar tek sözlükte birleşir.
+    """
+
+    def __init__(self, size: int, rate_per_min: float = POOL_RATE_PER_MIN):
+        self.size = size
+        self.rate_per_min = rate_per_min
+        self._drivers: Dict[int, "uc.Chrome"] = {}
+
+    def _worker(self, slot: int, jobs: "queue.Queue", fn, on_result,
+                cancel: Optional[threading.Event]):
+        if slot:
+            _TLS.profile = _profile_dir(slot)
+            _TLS.driver = self._drivers.get(slot)
+        # hesap başına hız sınırı: bu işçinin RateLimiter tabanı (bkz. _limiter)
+        _TLS.min_interval = 60 / self.rate_per_min if self.rate_per_min else 0
+        try:
+            while cancel is None or not cancel.is_set():
+                item = jobs.get()
+                if item is None:              # üretici bitti
+                    return
+                try:
+                    ok = fn(item)
+                except Exception as e:
+                    print(f"HATA → {item[0] if isinstance(item, tuple) else item}: {e}")
+                    ok = False
+                if on_result:
+                    on_result(item, ok)
+        finally:
+            if slot:                  # tarayıcı sonraki çalıştırmalar için açık kalır
+                self._drivers[slot] = _TLS.driver
+
+    def _put(self, jobs: "queue.Queue", item, threads, cancel) -> bool:
+        """Kuyruk doluysa bekler; iptal edildiyse ya da işçi kalmadıysa False."""
+        while cancel is None or not cancel.is_set() or item is None:
+            try:
+                jobs.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                if not any(t.is_alive() for t in threads):
+                    return False
+        return False
+
+    def run_stream(self, items: Iterable, fn, cancel: Optional[threading.Event] = None,
+                   on_result: Optional[Callable] = None):
+        """fn(öğe) → bool çağrılarını işçilere dağıtır; girdi akış halinde çekilir.
+
+        Kuyruk işçi sayısının birkaç katıyla sınırlıdır: girdi ne kadar büyük
+        olursa olsun bellekte yalnızca birkaç öğe bekler.
+        """
+        jobs: "queue.Queue" = queue.Queue(maxsize=self.size * 4)
+        threads = [
+            threading.Thread(target=self._worker, args=(i, jobs, fn, on_result, cancel),
+                             daemon=True, name=f"wa-worker-{i}")
+            for i in range(self.size)
+        ]
+        for t in threads:
+            t.start()
+        try:
+            for item in items:
+                if not self._put(jobs, item, threads, cancel):
+                    break
+        finally:
+            for _ in threads:
+                if not self._put(jobs, None, threads, cancel):
+                    break
+            for t in threads:
+                t.join()
+
+    def close(self):
+        for drv in self._drivers.values():
+            _quit_driver(drv)
+        self._drivers.clear()
+
+
+_POOL: Optional[DriverPool] = None
+
+
+def get_pool(size: int) -> DriverPool:
+    """Aynı boyutta bir havuz varsa tarayıcılarıyla birlikte yeniden kullanır."""
+    global _POOL
+    if _POOL is None or _POOL.size != size:
+        if _POOL is not None:
+            _POOL.close()
+        _POOL = DriverPool(size)
+    return _POOL
+
+
+# ------------------------------------------------------------
+# 3-c-1) asyncio + CDP gönderim motoru (tek olay döngüsü, çok oturum)
+# ------------------------------------------------------------
+# get_driver() / havuzun başlattığı uc.Chrome'ların DevTools websocket'ine
+# doğrudan bağlanır; gönderimler Runtime.evaluate(awaitPromise) ile Selenium
+# yolundaki betiklerin aynısıyla yapılır. Bütün oturumlar tek bir arka plan
+# olay döngüsünde (tek iş parçacığı) yürür: tarayıcı başına iş parçacığı yok.
+# send_single / send_bulk aynı imza ve anlamla bu motora yönlenir (--cdp).
+# Bağımlılık: pip install websockets (yoksa Selenium yoluyla devam edilir).
+ENGINE = "cdp" if "--cdp" in sys.argv else "selenium"
+CDP_TIMEOUT = 30.0            # tek bir CDP çağrısı için üst sınır (sn)
+CDP_MAX_INFLIGHT = 32         # aynı anda yürüyen gönderim sayısı (tüm şeritler)
+
+
+class CDPError(Exception):
+    """DevTools çağrısı hata döndürdü ya da bağlantı koptu."""
+
+
+def _use_cdp() -> bool:
+    """ENGINE "cdp" ve websockets kurulu → True; kurulu değilse bir kez uyarır."""
+    global ENGINE
+    if ENGINE != "cdp":
+        return False
+    import importlib.util
+    if importlib.util.find_spec("websockets") is None:
+        print("websockets yüklü değil → Selenium motoruyla devam  (pip install websockets)")
+        ENGINE = "selenium"
+        return False
+    return True
+
+
+def _cdp_expr(script: str, args: tuple, is_async: bool = True) -> str:
+    """execute_(async_)script biçimli betik → Runtime.evaluate ifadesi.
+
+    Betik _JS_LIB ile birlikte fonksiyon gövdesi olarak sarılır, argümanlar
+    JSON olarak verilir; async betiklerde son argüman (done) Promise'in resolve'u.
+    """
+    body = "(function () {\n" + _JS_LIB + script + "\n})"
+    args_js = json.dumps(list(args))
+    if is_async:
+        return f"new Promise(done => {body}.apply(null, {args_js}.concat([done])))"
+    return f"{body}.apply(null, {args_js})"
+
+
+def _cdp_ws_url(drv) -> str:
+    """Sürücünün WhatsApp sekmesinin DevTools websocket adresi."""
+    import urllib.request
+    caps = getattr(drv, "capabilities", None) or {}
+    addr = ((caps.get("goog:chromeOptions") or {}).get("debuggerAddress")
+            or getattr(getattr(drv, "options", None), "debugger_address", None))
+    if not addr:
+        raise CDPError("debuggerAddress bulunamadı")
+    with urllib.request.urlopen(f"http://{addr}/json/list", timeout=5) as r:
+        pages = [t for t in json.load(r) if t.get("type") == "page"]
+    page = next((t for t in pages if t.get("url", "").startswith(WA_URL)),
+                pages[0] if pages else None)
+    if page is None:
+        raise CDPError(f"{addr}: açık sekme yok")
+    return page["webSocketDebuggerUrl"]
+
+
+def _lane_drivers(lanes: int) -> list:
+    """Şerit başına bir tarayıcı: 0 → ana oturum, N → havuzun N. profili."""
+    drivers = [get_driver()]
+    if lanes > 1:
+        pool = get_pool(lanes)
+        for slot in range(1, lanes):
+            if not _driver_alive(pool._drivers.get(slot)):
+                pool._drivers[slot] = _new_driver(_profile_dir(slot))
+            drivers.append(pool._drivers[slot])
+    return drivers
+
+
+class CDPSession:
+    """Tek sekmenin DevTools bağlantısı: istek/yanıt eşleme ve zaman aşımı.
+
+    Şerit durumu (hız sınırlayıcı, art arda inpage hataları) da burada tutulur.
+    """
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self.limiter: Optional[RateLimiter] = None
+        self.inpage_fails = 0
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, object] = {}     # istek no → asyncio.Future
+        self._reader = None                          # yanıt okuyan asyncio.Task
+
+    @property
+    def closed(self) -> bool:
+        return self._reader is None or self._reader.done()
+
+    async def connect(self) -> "CDPSession":
+        import asyncio
+        import websockets
+        self._ws = await websockets.connect(self.ws_url, max_size=None)
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+        return self
+
+    async def _read(self):
+        try:
+            async for raw in self._ws:
+                msg = json.loads(raw)
+                fut = self._pending.pop(msg.get("id"), None)
+                if fut is None or fut.done():     # olay bildirimi / vazgeçilmiş istek
+                    continue
+                if "error" in msg:
+                    fut.set_exception(CDPError(msg["error"].get("message", "CDP hatası")))
+                else:
+                    fut.set_result(msg.get("result") or {})
+        except Exception:
+            pass                                  # bağlantı koptu → bekleyenlere bildir
+        finally:
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(CDPError("DevTools bağlantısı kapandı"))
+            self._pending.clear()
+
+    async def call(self, method: str, params: Optional[dict] = None,
+                   timeout: float = CDP_TIMEOUT) -> dict:
+        import asyncio
+        if self.closed:
+            raise CDPError("DevTools bağlantısı kapalı")
+        i = next(self._ids)
+        fut = self._pending[i] = asyncio.get_running_loop().create_future()
+        try:
+            await self._ws.send(json.dumps({"id": i, "method": method, "params": params or {}}))
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            self._pending.pop(i, None)
+
+    async def evaluate(self, script: str, *args, timeout: float = CDP_TIMEOUT,
+                       is_async: bool = True):
+        """Betiği sayfada çalıştırır, (Promise ise) sonucunu bekler → değer."""
+        res = await self.call("Runtime.evaluate", {
+            "expression": _cdp_expr(script, args, is_async),
+            "awaitPromise": True, "returnByValue": True,
+        }, timeout)
+        if "exceptionDetails" in res:
+            raise CDPError(res["exceptionDetails"].get("text", "betik hatası"))
+        return (res.get("result") or {}).get("value")
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await self._reader
+
+
+class CDPEngine:
+    """Tek olay döngüsünden birçok WhatsApp oturumunu (şeridi) süren gönderici.
+
+    Şerit = bir tarayıcı profilinin WhatsApp sekmesi (oturum başına tek etkin
+    sekme). Gönderim ilkelleri awaitable'dır; her CDP çağrısı zaman aşımlıdır,
+    eşzamanlı gönderim sayısı semaforla sınırlanır, görev iptali yürüyen
+    çağrıyı keser. Bellek bekçisi bu yolda çalışmaz.
+    """
+
+    def __init__(self, sessions: List[CDPSession], inflight: int = CDP_MAX_INFLIGHT,
+                 min_interval: float = 0.0):
+        import asyncio
+        self.sessions = sessions
+        self.min_interval = min_interval         # şerit (hesap) başına taban aralık
+        self._sem = asyncio.Semaphore(inflight)
+
+    @classmethod
+    async def attach(cls, lanes: int = 1, inflight: int = CDP_MAX_INFLIGHT) -> "CDPEngine":
+        """Şerit sayısı kadar tarayıcıyı (gerekirse) başlatıp DevTools'a bağlanır."""
+        import asyncio
+        drivers = await asyncio.to_thread(_lane_drivers, lanes)
+        urls = await asyncio.gather(*(asyncio.to_thread(_cdp_ws_url, d) for d in drivers))
+        sessions = await asyncio.gather(*(CDPSession(u).connect() for u in urls))
+        rate = POOL_RATE_PER_MIN if lanes > 1 else 0
+        return cls(list(sessions), inflight, 60 / rate if rate else 0.0)
+
+    @property
+    def size(self) -> int:
+        return len(self.sessions)
+
+    @property
+    def closed(self) -> bool:
+        return any(s.closed for s in self.sessions)
+
+    def _limiter(self, sess: CDPSession, gap_sec: float) -> RateLimiter:
+        floor = max(gap_sec, self.min_interval)
+        if sess.limiter is None or sess.limiter.min_interval != floor:
+            sess.limiter = RateLimiter(floor)
+        return sess.limiter
+
+    async def send_in_page(self, sess: CDPSession, number: str, message: str,
+                           timeout: float = 10, not_before: float = 0) -> SendResult:
+        """send_in_page() karşılığı: aç, yaz, gönder, doğrula – tek evaluate."""
+        import asyncio
+        limit = timeout * 3 + max(0.0, not_before - time.time()) + 5
+        t0 = time.perf_counter()
+        try:
+            res = await sess.evaluate(
+                _JS_SEND_IN_PAGE,
+                number.lstrip("+"), message, int(timeout * 1000), not_before * 1000,
+                timeout=limit) or {}
+        except (CDPError, asyncio.TimeoutError):
+            res = {"status": "error"}
+        return _send_result(number, res, t0)
+
+    async def _open_url(self, sess: CDPSession, number: str, message: str,
+                        quoted: Optional[str] = None, timeout: float = 4):
+        """_open_chat_url() karşılığı: Page.navigate + kutu / geçersiz yoklaması."""
+        import asyncio
+        with _METRICS.timer("open_nav"):
+            await sess.call("Page.navigate", {"url": _chat_url(number, message, quoted)})
+        state, deadline = None, time.time() + timeout
+        with _METRICS.timer("open_box_wait"):
+            while not state and time.time() < deadline:
+                try:
+                    state = await sess.evaluate(_JS_CHAT_STATE, is_async=False, timeout=2)
+                except (CDPError, asyncio.TimeoutError):
+                    state = None                  # sayfa bağlamı yenileniyor
+                if not state:
+                    await asyncio.sleep(0.1)
+        if not state:
+            raise CDPError(f"{number}: sohbet {timeout:g} sn'de açılmadı")
+        if state.startswith("invalid"):
+            raise InvalidNumberError(number, state.partition(":")[2] or "invalid")
+
+    async def _send_observe(self, sess: CDPSession, timeout: float) -> bool:
+        """_wait_and_send() karşılığı: ikonu tıkla, olmazsa Enter gönder."""
+        import asyncio
+        try:
+            with _METRICS.timer("send_click"):
+                state = await sess.evaluate(_JS_SEND_OBSERVE, int(timeout * 1000),
+                                            timeout=timeout * 2 + 5)
+        except (CDPError, asyncio.TimeoutError):
+            state = None
+        if state in ("sent", "clicked"):
+            return True
+        if state == "invalid":
+            return False
+        _METRICS.inc("fallback_enter")
+        try:
+            with _METRICS.timer("send_enter"):
+                key = {"key": "Enter", "code": "Enter", "windowsVirtualKeyCode": 13}
+                await sess.call("Input.dispatchKeyEvent", {"type": "keyDown", "text": "\r", **key})
+                await sess.call("Input.dispatchKeyEvent", {"type": "keyUp", **key})
+            return True
+        except (CDPError, asyncio.TimeoutError):
+            return False
+
+    async def send(self, lane: int, number: str, message: str, wait_sec: int,
+                   gap_sec: float, quoted: Optional[str] = None) -> bool:
+        """send_single()'ın eşyordam karşılığı: aynı yedek yollar ve sınırlayıcı."""
+        import asyncio
+        sess = self.sessions[lane]
+        lim = self._limiter(sess, gap_sec)
+        ok = False
+        async with self._sem:
+            if NAV_MODE == "inpage" and sess.inpage_fails < INPAGE_MAX_FAILS:
+                res = await self.send_in_page(sess, number, message, wait_sec,
+                                              lim.next_at())
+                if res.clicked_at:
+                    lim.sent(res.clicked_at)
+                if res.status == "invalid":
+                    return _mark_invalid(number, res.reason or "invalid")
+                ok = res.ok
+                if res.status != "no_app":
+                    sess.inpage_fails = 0 if ok else sess.inpage_fails + 1
+                if ok:
+                    lim.feedback(res.status != "unconfirmed",
+                                 res.timings.get("confirm", 0), res.throttled)
+                elif not res.retryable:
+                    lim.feedback(False)
+                    print(f"HATA → {number}  ({res.status}: gönderim belirsiz, tekrar denenmedi)")
+                    return False
+                else:
+                    _METRICS.inc("fallback_url")
+
+            if not ok:                              # gönderilmedi → çok adımlı yedek yol
+                try:
+                    await self._open_url(sess, number, message, quoted)
+                except InvalidNumberError as e:
+                    return _mark_invalid(number, e.reason)
+                delay = lim.next_at() - time.time()  # sohbet hazır; gönderim anını bekle
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                _METRICS.observe("gap_wait", max(delay, 0) * 1000)
+                lim.sent()
+                ok = await self._send_observe(sess, wait_sec)
+                lim.feedback(ok)
+        print(("Gönderildi" if ok else "HATA") + f" → {number}")
+        return ok
+
+    async def run_stream(self, items: Iterable[Tuple[str, object]], afn,
+                         cancel: Optional[threading.Event] = None,
+                         on_result: Optional[Callable[[str, bool, float], None]] = None,
+                         lanes: Optional[int] = None):
+        """afn(motor, şerit, numara, yük) eşyordamlarını ilk `lanes` şeride dağıtır.
+
+        Girdi yardımcı bir iş parçacığında çekilir (stdin gibi bloklayan akış
+        döngüyü durdurmaz); kuyruk şerit sayısının birkaç katıyla sınırlıdır.
+        cancel set edilince yeni alıcı başlatılmaz; görev iptal edilirse yürüyen
+        gönderimler de kesilir. on_result(numara, başarılı, başlangıç).
+        """
+        import asyncio
+        width = min(lanes or self.size, self.size)
+        jobs: "asyncio.Queue" = asyncio.Queue(maxsize=width * 4)
+        for s in self.sessions:                 # yeni kampanya: inpage yeniden denensin
+            s.inpage_fails = 0
+
+        def _stopped() -> bool:
+            return cancel is not None and cancel.is_set()
+
+        async def _lane(lane: int):
+            while True:
+                item = await jobs.get()
+                if item is None or _stopped():
+                    return
+                num, payload = item
+                started, t0, ok = time.time(), time.perf_counter(), False
+                try:
+                    ok = await afn(self, lane, num, payload)
+                except Exception as e:
+                    print(f"HATA → {num}: {e}")
+                finally:
+                    _METRICS.observe("message", (time.perf_counter() - t0) * 1000)
+                    if on_result:
+                        on_result(num, ok, started)
+
+        async def _put(item) -> bool:
+            """Kuyruk doluysa bekler; iptal edildiyse ya da şerit kalmadıysa False."""
+            while item is None or not _stopped():
+                if all(t.done() for t in tasks):
+                    return False
+                try:
+                    await asyncio.wait_for(jobs.put(item), 0.2)
+                    return True
+                except asyncio.TimeoutError:
+                    pass
+            return False
+
+        tasks = [asyncio.create_task(_lane(i)) for i in range(width)]
+        it = iter(items)
+        try:
+            while not _stopped():
+                item = await asyncio.to_thread(next, it, None)
+                if item is None or not await _put(item):
+                    break
+            for _ in tasks:
+                if not await _put(None):
+                    break
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def close(self):
+        import asyncio
+        await asyncio.gather(*(s.close() for s in self.sessions), return_exceptions=True)
+
+
+_CDP_LOOP = None
+_CDP_ENGINE: Optional[CDPEngine] = None
+_CDP_LOCK = threading.Lock()
+
+
+def _cdp_loop():
+    """Motorun olay döngüsü: süreç boyunca tek bir arka plan iş parçacığında."""
+    global _CDP_LOOP
+    import asyncio
+    with _CDP_LOCK:
+        if _CDP_LOOP is None:
+            _CDP_LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_CDP_LOOP.run_forever, daemon=True,
+                             name="wa-cdp-loop").start()
+    return _CDP_LOOP
+
+
+def cdp_run(coro, timeout: Optional[float] = None):
+    """Eşyordamı motor döngüsünde çalıştırıp sonucunu bekler (senkron köprü).
+
+    Bekleme kesilirse (Ctrl+C, zaman aşımı) eşyordam da iptal edilir.
+    """
+    import asyncio
+    fut = asyncio.run_coroutine_threadsafe(coro, _cdp_loop())
+    try:
+        return fut.result(timeout)
+    except BaseException:
+        fut.cancel()
+        raise
+
+
+def get_engine(lanes: int = 1) -> CDPEngine:
+    """En az `lanes` şeritli canlı bir motor varsa bağlantılarıyla yeniden kullanır.
+
+    Yalnızca daha fazla şerit istenirse motor kapatılıp yeniden kurulur; tek
+    alıcılık gönderimler çok şeritli motorun 0. şeridinden gider.
+    """
+    global _CDP_ENGINE
+    if _CDP_ENGINE is None or _CDP_ENGINE.size < lanes or _CDP_ENGINE.closed:
+        if _CDP_ENGINE is not None:
+            cdp_run(_CDP_ENGINE.close())
+        _CDP_ENGINE = cdp_run(CDPEngine.attach(lanes))
+    return _CDP_ENGINE
+
+
+# ------------------------------------------------------------
+# 3-b) Zamanlanmış çoklu mesaj yardımcısı
+# ------------------------------------------------------------
+class ScheduledJob:
+    """Zamanlayıcı kuyruğundaki tek iş; sonucu `future` üzerinden alınır."""
+    __slots__ = ("id", "run_at", "name", "fn", "args", "future")
+
+    def __init__(self, id: int, run_at: float, name: str, fn: Callable, args: tuple):
+        from concurrent.futures import Future
+        self.id, self.name, self.fn, self.args = id, name, fn, args
+        self.run_at = run_at           # time.time() cinsinden
+        self.future: Future = Future()
+
+
+class Scheduler:
+    """Öncelik kuyruğu (heapq) + tek dağıtıcı iş parçacığı.
+
+    Mesaj başına bir threading.Timer yerine tüm işler tek bir yığında
+    bekler; dağıtıcı sıradaki işin zamanına kadar uyur. İşler sırayla
+    çalıştığından aynı tarayıcıyı iki iş asla aynı anda sürmez.
+    `idle` olayı: bekleyen ve çalışan iş kalmadığında set edilir.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []      # (run_at, job_id)
+        self._jobs: Dict[int, ScheduledJob] = {}
+        self._ids = itertools.count(1)
+        self._cv = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.idle = threading.Event()
+        self.idle.set()
+
+    def schedule(self, when, fn: Callable, *args, name: str = "") -> ScheduledJob:
+        """`when` (datetime veya epoch sn) geldiğinde fn(*args) çalıştırır."""
+        run_at = when.timestamp() if hasattr(when, "timestamp") else float(when)
+        with self._cv:
+            job = ScheduledJob(next(self._ids), run_at, name, fn, args)
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (run_at, job.id))
+            self.idle.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, daemon=True, name="wa-scheduler")
+                self._thread.start()
+            self._cv.notify()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Henüz başlamamış bir işi iptal eder."""
+        with self._cv:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            job.future.cancel()
+            self._cv.notify()         # yığının tepesi değişmiş olabilir
+            return True
+
+    def list_pending(self) -> List[ScheduledJob]:
+        with self._cv:
+            return sorted(self._jobs.values(), key=lambda j: j.run_at)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Tüm işler bitene dek bekler (Ctrl+C ile kesilebilir)."""
+        end = None if timeout is None else time.monotonic() + timeout
+        while not self.idle.wait(1):
+            if end is not None and time.monotonic() >= end:
+                return False
+        return True
+
+    def _next_job(self) -> ScheduledJob:
+        with self._cv:
+            while True:
+                # iptal edilmiş işler yığında kalır; tepeye çıkınca atılır
+                while self._heap and self._heap[0][1] not in self._jobs:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self.idle.set()
+                    self._cv.wait()
+                    continue
+                run_at, job_id = self._heap[0]
+                delay = run_at - time.time()
+                if delay <= 0:
+                    heapq.heappop(self._heap)
+                    return self._jobs.pop(job_id)
+                self._cv.wait(delay)
+
+    def _loop(self):
+        while True:
+            job = self._next_job()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                job.future.set_result(job.fn(*job.args))
+            except BaseException as e:
+                print(f"Zamanlanmış iş hatası ({job.name or job.id}): {e}")
+                job.future.set_exception(e)
+
+
+_SCHEDULER: Optional[Scheduler] = None
+
+
+def get_scheduler() -> Scheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = Scheduler()
+    return _SCHEDULER
+
+
+def _start_warm_up(timeout: float, alert: Callable[[str], None]) -> threading.Thread:
+    """warm_up()'ı kendi iş parçacığında başlatır; zamanlayıcıyı bekletmez."""
+    t = threading.Thread(target=warm_up, args=(timeout, alert), daemon=True,
+                         name="wa-warm-up")
+    t.start()
+    return t
+
+
+def schedule_warm_up(run_at: float, lead: float = WARMUP_LEAD_SEC,
+                     alert: Callable[[str], None] = print) -> Optional[ScheduledJob]:
+    """run_at'tan `lead` sn önce warm_up() planlar (zaman geçmişse hemen).
+
+    Isıtma dakikalarca sürebilir; dağıtıcı iş parçacığında çalışsaydı o
+    sırada vakti gelen gönderimler beklerdi. İş yalnızca _start_warm_up()'ı
+    çağırır, sonucu (iş parçacığı) future'da döner.
+    """
+    timeout = min(WARMUP_TIMEOUT, max(lead * 0.75, 10))
+    return get_scheduler().schedule(max(run_at - lead, time.time()), _start_warm_up,
+                                    timeout, alert, name="warm-up")
+
+
+def schedule_multiple_messages(
+    numbers: List[str],
+    msgs: List[Tuple[str, int, int, int, int, int]],
+    gap_sec: int,
+    wait_sec: int,
+    resume: bool = False,
+    alert: Callable[[str], None] = print,
+    progress: Optional[Callable[[str, bool], None]] = None,
+) -> List[ScheduledJob]:
+    """
+    msgs → [(mesaj, yıl, ay, gün, saat, dakika), ...]
+    Verilen her tarih-saatte send_bulk() tetikler; her birinden
+    WARMUP_LEAD_SEC önce tarayıcı ısıtılır (sorun varsa alert() çağrılır).
+    progress, send_bulk()'a aynen iletilir.
+    """
+    import datetime as dt
+
+    sched = get_scheduler()
+    jobs = []
+    for txt, y, mo, d, h, mi in msgs:
+        run_at = dt.datetime(y, mo, d, h, mi, 0)
+        schedule_warm_up(run_at.timestamp(), alert=alert)
+        jobs.append(sched.schedule(run_at, send_bulk,
+                                   numbers, txt, wait_sec, gap_sec, 1, None, resume,
+                                   None, progress, name=f"{h:02d}:{mi:02d}"))
+    return jobs
+
+
+# ------------------------------------------------------------
+# 3-d) Arka plan servisi (daemon) + yerel HTTP API
+# ------------------------------------------------------------
+# Servis tarayıcıyı açık ve oturumu sıcak tutar; CLI ve GUI yalnızca iş
+# gönderen ince istemcilerdir. Uç noktalar (yalnızca 127.0.0.1):
+#   GET    /health       → servis / tarayıcı durumu
+#   GET    /jobs         → tüm işler
+#   POST   /jobs         → yeni iş {numbers, messages, wait_sec, gap_sec,
+#                                   workers, resume, at (epoch sn, ops.)}
+#   GET    /jobs/<id>    → iş durumu ve ilerleme
+#   DELETE /jobs/<id>    → işi iptal et
+#   GET    /metrics      → aşama gecikmeleri ve sayaçlar (Prometheus metni)
+# Her istek "Authorization: Bearer <anahtar>" taşımalıdır; anahtar servis her
+# açılışta profil klasöründeki daemon.token dosyasına (yalnız kullanıcıya açık)
+# yazılır. Windows'ta 0o600 kipi yok sayılır: koruma, profilin bulunduğu
+# %APPDATA% klasörünün varsayılan ACL'si ile yalnız o kullanıcıya (ve
+# yöneticilere) açık olmasına dayanır; paylaşılan bir klasöre taşımayın.
+# Host başlığı 127.0.0.1:<port> olmayan, Origin taşıyan (tarayıcıdan gelen)
+# ya da gövdesi application/json olmayan istekler reddedilir: makinede açık
+# herhangi bir web sayfası servise iş gönderemez.
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+DAEMON_KEEPALIVE_SEC = 60     # tarayıcı bu aralıkla yoklanır, ölmüşse yeniden açılır
+
+
+def _daemon_token_path() -> Path:
+    return _profile_dir() / "daemon.token"
+
+
+def _new_daemon_token() -> str:
+    """Rastgele erişim anahtarı üretip yalnız sahibinin okuyabileceği dosyaya yazar.
+
+    POSIX'te dosya kipi 0o600'dür; Windows'ta kip etkisizdir ve gizlilik,
+    %APPDATA% altındaki profil klasörünün kullanıcıya özel ACL'sinden gelir.
+    """
+    import secrets
+    token = secrets.token_urlsafe(32)
+    path = _daemon_token_path()
+    path.unlink(missing_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as fh:
+        fh.write(token)
+    return token
+
+
+def _daemon_token() -> str:
+    """İstemci tarafı: çalışan servisin anahtarı (dosya yoksa boş)."""
+    try:
+        return _daemon_token_path().read_text().strip()
+    except OSError:
+        return ""
+
+
+class DaemonJob:
+    def __init__(self, id: int, numbers: List[str], messages: List[str],
+                 wait_sec: int = 10, gap_sec: float = 1.0, workers: int = 1,
+                 resume: bool = False, at: float = 0.0):
+        self.id, self.numbers, self.messages = id, numbers, messages
+        self.wait_sec, self.gap_sec, self.workers = wait_sec, gap_sec, workers
+        self.resume, self.at = resume, at
+        self.status = "queued"         # queued / running / done / cancelled / failed
+        self.sent = self.failed = 0
+        self.error = ""
+        self.created = time.time()
+        self.started = self.finished = 0.0
+        self.cancel_event = threading.Event()
+        self.sched_id = 0
+
+    def __repr__(self) -> str:
+        return f"DaemonJob(id={self.id}, status={self.status!r})"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id, "status": self.status, "total": len(self.numbers),
+            "sent": self.sent, "failed": self.failed, "error": self.error,
+            "at": self.at, "created": self.created,
+            "started": self.started, "finished": self.finished,
+        }
+
+
+class SenderDaemon:
+    """Tarayıcının sahibi olan uzun ömürlü gönderici; işler zamanlayıcıda sıralanır."""
+
+    def __init__(self):
+        self.jobs: Dict[int, DaemonJob] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, numbers: List[str], messages: List[str], wait_sec: int = 10,
+               gap_sec: float = 1.0, workers: int = 1, resume: bool = False,
+               at: Optional[float] = None) -> DaemonJob:
+        with self._lock:
+            job = DaemonJob(next(self._ids), list(numbers), list(messages),
+                            int(wait_sec), float(gap_sec), int(workers),
+                            bool(resume), float(at or 0))
+            self.jobs[job.id] = job
+        if job.at:
+            schedule_warm_up(job.at)
+        job.sched_id = get_scheduler().schedule(
+            job.at or time.time(), self._run, job, name=f"daemon-{job.id}").id
+        return job
+
+    def _run(self, job: DaemonJob):
+        if job.cancel_event.is_set():
+            return
+        job.status, job.started = "running", time.time()
+
+        def _progress(_num: str, ok: bool):
+            if ok:
+                job.sent += 1
+            else:
+                job.failed += 1
+
+        try:
+            send_bulk_multi(job.numbers, job.messages, job.wait_sec, job.gap_sec,
+                            workers=job.workers, resume=job.resume,
+                            cancel=job.cancel_event, progress=_progress)
+            job.status = "cancelled" if job.cancel_event.is_set() else "done"
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+        job.finished = time.time()
+
+    def cancel(self, job_id: int) -> Optional[DaemonJob]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.status == "queued":
+            get_scheduler().cancel(job.sched_id)
+            job.status, job.finished = "cancelled", time.time()
+        return job
+
+    def keep_warm(self):
+        """Boştayken tarayıcıyı yoklar; kapanmışsa yeniden başlatır."""
+        while True:
+            time.sleep(DAEMON_KEEPALIVE_SEC)
+            if _SEND_LOCK.acquire(blocking=False):
+                try:
+                    state = probe_session(get_driver())
+                    if state != "ready":
+                        print(f"Uyarı: WhatsApp Web durumu → {state}")
+                except Exception as e:
+                    print(f"Tarayıcı yeniden başlatılamadı: {e}")
+                finally:
+                    _SEND_LOCK.release()
+
+
+def _daemon_handler(daemon: SenderDaemon, token: str) -> type:
+    """Verilen servise bağlı HTTP işleyici sınıfı.
+
+    http.server yalnızca servis açılırken içe aktarılır (başlangıç süresi).
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class _DaemonHandler(BaseHTTPRequestHandler):
+        daemon: SenderDaemon
+        token: str
+
+        def log_message(self, fmt, *args):     # konsolu erişim günlüğüyle doldurma
+            pass
+
+        def _reply(self, code: int, obj, ctype: str = "application/json; charset=utf-8"):
+            if isinstance(obj, str):
+                body = obj.encode("utf-8")
+            else:
+                body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self, body: bool = False) -> bool:
+            """Host / Origin / anahtar (ve gövdeli isteklerde Content-Type) denetimi."""
+            import hmac
+            host = f"{DAEMON_HOST}:{self.server.server_address[1]}"
+            auth = self.headers.get("Authorization", "")
+            if self.headers.get("Host") != host or self.headers.get("Origin") is not None:
+                self._reply(403, {"error": "forbidden"})
+            elif not hmac.compare_digest(auth.encode(), f"Bearer {self.token}".encode()):
+                self._reply(401, {"error": "unauthorized"})
+            elif body and self.headers.get_content_type() != "application/json":
+                self._reply(415, {"error": "application/json bekleniyor"})
+            else:
+                return True
+            return False
+
+        def _job(self) -> Optional[DaemonJob]:
+            parts = self.path.strip("/").split("/")
+            if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+                return self.daemon.jobs.get(int(parts[1]))
+            return None
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/health":
+                self._reply(200, {"ok": True, "driver": _driver_alive(_DRIVER),
+                                  "jobs": len(self.daemon.jobs)})
+            elif self.path == "/jobs":
+                self._reply(200, [j.to_dict() for j in self.daemon.jobs.values()])
+            elif self.path == "/metrics":
+                self._reply(200, _METRICS.prometheus(), "text/plain; version=0.0.4")
+            else:
+                job = self._job()
+                self._reply(200, job.to_dict()) if job else self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self._authorized(body=True):
+                return
+            if self.path != "/jobs":
+                return self._reply(404, {"error": "not found"})
+            try:
+                spec = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if not isinstance(spec, dict):
+                    raise ValueError("gövde bir JSON nesnesi olmalı")
+                if not spec.get("numbers") or not spec.get("messages"):
+                    raise ValueError("numbers ve messages zorunlu")
+                job = self.daemon.submit(**spec)
+            except (ValueError, TypeError) as e:
+                return self._reply(400, {"error": str(e)})
+            self._reply(201, job.to_dict())
+
+        def do_DELETE(self):
+            if not self._authorized():
+                return
+            job = self._job()
+            if job is None:
+                return self._reply(404, {"error": "not found"})
+            self._reply(200, self.daemon.cancel(job.id).to_dict())
+
+    _DaemonHandler.daemon = daemon
+    _DaemonHandler.token = token
+    return _DaemonHandler
+
+
+def run_daemon(port: int = DAEMON_PORT):
+    """Tarayıcıyı ısıtır ve HTTP API'yi sonsuza dek sunar (Ctrl+C ile çık)."""
+    from http.server import ThreadingHTTPServer
+
+    daemon = SenderDaemon()
+    server = ThreadingHTTPServer((DAEMON_HOST, port),
+                                 _daemon_handler(daemon, _new_daemon_token()))
+    print(f"Servis hazırlanıyor… (http://{DAEMON_HOST}:{port})")
+    get_driver()
+    threading.Thread(target=daemon.keep_warm, daemon=True, name="wa-keepalive").start()
+    print("Servis hazır. İşler bekleniyor (Ctrl+C ile çık).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        _daemon_token_path().unlink(missing_ok=True)
+        _close_driver()
+
+
+# ---- ince istemci -------------------------------------------------------
+def daemon_request(method: str, path: str, body=None, port: int = DAEMON_PORT,
+                   timeout: float = 5):
+    import urllib.request
+
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(
+        f"http://{DAEMON_HOST}:{port}{path}", data=data, method=method,
+        headers={"Content-Type": "application/json",
+                 "Authorization": f"Bearer {_daemon_token()}"})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return json.loads(r.read().decode("utf-8"))
+
+
+def daemon_available(port: int = DAEMON_PORT) -> bool:
+    """Yerelde çalışan bir servis var mı? (--no-daemon ile devre dışı)"""
+    if "--no-daemon" in sys.argv:
+        return False
+    try:
+        return bool(daemon_request("GET", "/health", port=port, timeout=0.3).get("ok"))
+    except (OSError, ValueError):
+        return False
+
+
+def daemon_submit(numbers: List[str], messages: List[str], wait_sec: int,
+                  gap_sec: float, workers: int = 1, resume: bool = False,
+                  at: Optional[float] = None) -> dict:
+    return daemon_request("POST", "/jobs", {
+        "numbers": numbers, "messages": [m for m in messages if m.strip()],
+        "wait_sec": wait_sec, "gap_sec": gap_sec, "workers": workers,
+        "resume": resume, "at": at,
+    })
+
+
+def daemon_status(job_id: int) -> dict:
+    return daemon_request("GET", f"/jobs/{job_id}")
+
+
+def daemon_cancel(job_id: int) -> dict:
+    return daemon_request("DELETE", f"/jobs/{job_id}")
+
+
+def daemon_watch(job_id: int, interval: float = 1.0) -> dict:
+    """İş bitene dek ilerlemeyi yazdırır; Ctrl+C işi iptal eder."""
+    try:
+        while True:
+            st = daemon_status(job_id)
+            print(f"\r#{job_id} {st['status']}: {st['sent']} gönderildi, "
+                  f"{st['failed']} hata / {st['total']}", end="", flush=True)
+            if st["status"] in ("done", "cancelled", "failed"):
+                print()
+                return st
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nİptal ediliyor…")
+        return daemon_cancel(job_id)
+
+
+# ------------------------------------------------------------
+# 3-e) Çevrimdışı kıyaslama: yerel sahte WhatsApp Web
+# ------------------------------------------------------------
+# Gerçek hesap ve ağ olmadan gönderim hızını ölçmek için kodun dayandığı DOM
+# sözleşmesini taklit eden küçük bir sayfa: #side, #main > footer içindeki
+# düzenlenebilir kutu, span[data-icon='send'], .message-out balonları
+# (msg-time → msg-check), geçersiz numara penceresi, /send?phone=&text= yolu
+# ve uygulama içi /send bağlantılarının yakalanması. Gecikmeler ayarlanabilir.
+FAKE_WA_DELAYS = {
+    "app_ms": 300,          # sayfa yüklenip #side belirene dek
+    "chat_ms": 80,          # sohbet açılması (ya da geçersiz numara penceresi)
+    "btn_ms": 30,           # metin yazıldıktan sonra gönder ikonunun belirmesi
+    "ack_ms": 150,          # balonun saat → tik'e dönmesi
+}
+FAKE_WA_INVALID_PREFIX = "999"   # bu önekle başlayan numaralar "geçersiz"
+
+_FAKE_WA_HTML = r"""<!doctype html>
+<html><head><meta charset="utf-8"><title>WhatsApp (sahte)</title></head>
+<body><div id="app"></div>
+<script>
+const CFG = __CONFIG__;
+const sleep = ms => new Promise(r => setTimeout(r, ms));
+const app = document.getElementById('app');
+
+function popup(text) {
+  const p = document.createElement('div');
+  p.setAttribute('data-animate-modal-popup', 'true');
+  p.textContent = text;
+  const ok = document.createElement('button');
+  ok.textContent = 'OK';
+  ok.onclick = () => p.remove();
+  p.appendChild(ok);
+  document.body.appendChild(p);
+}
+
+async function openChat(phone, text) {
+  await sleep(CFG.chat_ms);
+  if (!phone || phone.startsWith(CFG.invalid_prefix))
+    return popup('Phone number shared via url is invalid.');
+  const main = document.createElement('div');
+  main.id = 'main';
+  const list = document.createElement('div');
+  const footer = document.createElement('footer');
+  const box = document.createElement('div');
+  box.setAttribute('role', 'textbox');
+  box.setAttribute('contenteditable', 'true');
+  footer.appendChild(box);
+  main.append(list, footer);
+  const old = document.getElementById('main');
+  old ? old.replaceWith(main) : app.appendChild(main);
+
+  let pending = null;
+  const btn = () => footer.querySelector("span[data-icon='send']");
+  const refresh = () => {
+    const has = box.textContent.trim().length > 0;
+    if (!has && btn()) btn().remove();
+    if (has && !btn() && !pending) pending = setTimeout(() => {
+      pending = null;
+      if (!box.textContent.trim() || btn()) return;
+      const b = document.createElement('span');
+      b.setAttribute('data-icon', 'send');
+      b.onclick = send;
+      footer.appendChild(b);
+    }, CFG.btn_ms);
+  };
+  const send = () => {
+    const msg = box.textContent;
+    if (!msg.trim()) return;
+    const bubble = document.createElement('div');
+    bubble.className = 'message-out';
+    bubble.textContent = msg;
+    const st = document.createElement('span');
+    st.setAttribute('data-icon', 'msg-time');
+    bubble.appendChild(st);
+    list.appendChild(bubble);
+    box.textContent = '';
+    refresh();
+    fetch('/__sent', {method: 'POST', body: phone, keepalive: true});
+    setTimeout(() => st.setAttribute('data-icon', 'msg-check'), CFG.ack_ms);
+  };
+  box.addEventListener('paste', e => {
+    e.preventDefault();
+    box.textContent += e.clipboardData.getData('text/plain');
+    refresh();
+  });
+  box.addEventListener('input', refresh);
+  box.addEventListener('keydown', e => {
+    if (e.key === 'Enter' && !e.shiftKey) { e.preventDefault(); send(); }
+  });
+  if (text) { box.textContent = text; refresh(); }
+  box.focus();
+}
+
+(async () => {
+  await sleep(CFG.app_ms);
+  const side = document.createElement('div');
+  side.id = 'side';
+  app.appendChild(side);
+  // uygulama içi /send?phone= bağlantıları sayfadan çıkmadan sohbet açar
+  document.addEventListener('click', e => {
+    const a = e.target.closest && e.target.closest("a[href*='/send?phone=']");
+    if (!a) return;
+    e.preventDefault();
+    openChat(new URL(a.href).searchParams.get('phone') || '', '');
+  });
+  const q = new URLSearchParams(location.search);
+  if (location.pathname === '/send')
+    openChat(q.get('phone') || '', q.get('text') || '');
+})();
+</script></body></html>
+"""
+
+
+def _fake_wa_handler() -> type:
+    """Sahte sayfanın HTTP işleyicisi; ayarlar ve sayaç sunucu nesnesindedir."""
+    from http.server import BaseHTTPRequestHandler
+
+    class _FakeWAHandler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def do_GET(self):
+            path = urllib.parse.urlsplit(self.path).path
+            if path not in ("/", "/send"):
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = _FAKE_WA_HTML.replace("__CONFIG__", json.dumps(self.server.config)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path == "/__sent":
+                with self.server.lock:
+                    self.server.sent += 1
+            self.send_response(204)
+            self.end_headers()
+
+    return _FakeWAHandler
+
+
+def start_fake_whatsapp(port: int = 0, **delays) -> "ThreadingHTTPServer":
+    """Sahte sayfayı arka planda sunar.
+
+    Adres server.server_address'te, iletilen mesaj sayısı server.sent'tedir.
+    """
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((DAEMON_HOST, port), _fake_wa_handler())
+    server.config = {**FAKE_WA_DELAYS, **delays, "invalid_prefix": FAKE_WA_INVALID_PREFIX}
+    server.sent = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-wa").start()
+    return server
+
+
+def run_benchmark(count: int = 50, modes=("inpage", "url"), pools=(1,),
+                  invalid_every: int = 0, headless: bool = True,
+                  driver_executable_path: Optional[str] = None,
+                  browser_executable_path: Optional[str] = None,
+                  **delays) -> List[dict]:
+    """Gerçek göndericiyi sahte sayfaya karşı çalıştırır → koşu başına özet.
+
+    Geçici bir profil kullanılır; gerçek oturuma, günlüğe ve negatif önbelleğe
+    dokunulmaz. Her koşudan önce ölçülmeyen kısa bir ısınma turu yapılır.
+    driver_executable_path / browser_executable_path verilmezse
+    WA_CHROMEDRIVER / WA_CHROME_BINARY kullanılır; ikisi de yoksa uc
+    chromedriver'ı indirir (ağ gerekir).
+    """
+    global WA_URL, NAV_MODE, LEAN_MODE, _PROFILE, _POOL, _JOURNAL, _NEG_CACHE
+    global CHROMEDRIVER_PATH, CHROME_BINARY
+    import shutil, tempfile
+
+    server = start_fake_whatsapp(**delays)
+    tmp = Path(tempfile.mkdtemp(prefix="wab_bench_"))
+    saved = WA_URL, NAV_MODE, LEAN_MODE, _PROFILE, CHROMEDRIVER_PATH, CHROME_BINARY
+    CHROMEDRIVER_PATH = driver_executable_path or CHROMEDRIVER_PATH
+    CHROME_BINARY = browser_executable_path or CHROME_BINARY
+    if CHROMEDRIVER_PATH is None:
+        print("Uyarı: chromedriver yolu yok (--chromedriver / WA_CHROMEDRIVER); "
+              "uc sürücüyü internetten indirecek.")
+    WA_URL = "http://{}:{}".format(*server.server_address)
+    LEAN_MODE = headless                # CI'da ekran yok
+    _PROFILE = str(tmp / "whatsapp_profile")
+    Path(_PROFILE).mkdir()
+    _JOURNAL = _NEG_CACHE = None
+    runs: List[dict] = []
+    try:
+        for r, (mode, size) in enumerate(itertools.product(modes, pools)):
+            NAV_MODE = mode
+            if size > 1 and (_POOL is None or _POOL.size != size):
+                if _POOL is not None:
+                    _POOL.close()
+                _POOL = DriverPool(size, rate_per_min=0)   # hesap sınırı yok
+            warm = [f"905{r:02d}9{i:06d}" for i in range(size * 2)]
+            send_bulk(warm, "ısınma", 10, 0, workers=size, campaign=f"warm-{r}")
+
+            numbers = [
+                (FAKE_WA_INVALID_PREFIX if invalid_every and i % invalid_every == 0
+                 else "905") + f"{r:02d}{i:07d}"
+                for i in range(1, count + 1)
+            ]
+            m = Metrics(keep_samples=True)
+            _METRICS.attach(m)
+            sent_before = server.sent
+            t0 = time.perf_counter()
+            try:
+                res = send_bulk(numbers, "kıyaslama mesajı", 10, 0, workers=size,
+                                campaign=f"bench-{mode}-{size}")
+            finally:
+                elapsed = time.perf_counter() - t0
+                _METRICS.detach(m)
+            runs.append({
+                "nav": mode, "pool": size, "messages": len(numbers),
+                "ok": sum(res.values()), "delivered": server.sent - sent_before,
+                "elapsed_sec": round(elapsed, 2),
+                "msg_per_sec": round(len(numbers) / elapsed, 2) if elapsed else 0.0,
+                **m.summary(),
+            })
+    finally:
+        _close_driver()
+        server.shutdown()
+        WA_URL, NAV_MODE, LEAN_MODE, _PROFILE, CHROMEDRIVER_PATH, CHROME_BINARY = saved
+        _JOURNAL = _NEG_CACHE = None
+        shutil.rmtree(tmp, ignore_errors=True)
+    return runs
+
+
+def print_benchmark(runs: List[dict]):
+    print(f"{'yol':<8}{'havuz':>6}{'mesaj':>7}{'başarılı':>10}{'iletilen':>10}"
+          f"{'süre(sn)':>10}{'mesaj/sn':>10}")
+    for r in runs:
+        print(f"{r['nav']:<8}{r['pool']:>6}{r['messages']:>7}{r['ok']:>10}"
+              f"{r['delivered']:>10}{r['elapsed_sec']:>10.2f}{r['msg_per_sec']:>10.2f}")
+    for r in runs:
+        print(f"\n[{r['nav']} × {r['pool']}] aşama gecikmeleri (ms): p50 / p95 / p99")
+        for stage, st in sorted(r["stages"].items()):
+            print(f"  {stage:<20}{st['count']:>6}  {st['p50_ms']:>8.0f} "
+                  f"{st['p95_ms']:>8.0f} {st['p99_ms']:>8.0f}")
+
+
+def bench_cli():
+    """--bench: kıyaslamayı komut satırından çalıştırır.
+
+    Seçenekler: --bench-count N, --bench-modes inpage,url, --bench-pools 1,2,
+    --bench-delays app_ms=300,chat_ms=80, --bench-invalid N (her N'inci numara
+    geçersiz), --bench-out sonuc.json, --headed (görünür tarayıcı),
+    --chromedriver YOL ve --chrome YOL (indirme yapılmasın; çevrimdışı CI).
+    """
+    delays = {}
+    for kv in filter(None, _argv_value("--bench-delays", "").split(",")):
+        k, _, v = kv.partition("=")
+        delays[k.strip()] = int(v)
+    runs = run_benchmark(
+        count=int(_argv_value("--bench-count", "50")),
+        modes=_argv_value("--bench-modes", "inpage,url").split(","),
+        pools=[int(x) for x in _argv_value("--bench-pools", "1").split(",")],
+        invalid_every=int(_argv_value("--bench-invalid", "0")),
+        headless="--headed" not in sys.argv,
+        driver_executable_path=_argv_value("--chromedriver"),
+        browser_executable_path=_argv_value("--chrome"),
+        **delays,
+    )
+    print_benchmark(runs)
+    out = _argv_value("--bench-out")
+    if out:
+        Path(out).write_text(json.dumps(runs, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Sonuçlar → {out}")
+
+
+# ------------------------------------------------------------
+# 4) CLI modu (GUI yoksa --cli ile)
+# ------------------------------------------------------------
+def multiline_input(prompt: str, paragraphs: int = 2) -> str:
+    """Konsolda çok satırlı metin okur. Boş satır paragraf sonu demektir."""
+    print(f"{prompt} (her paragrafı boş satırla bitir):")
+    paras: List[str] = []
+    buf: List[str] = []
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            break
+        if line.strip() == "":
+            if buf:                      # paragraf bitti
+                paras.append("\n".join(buf).strip())
+                buf = []
+                if len(paras) == paragraphs:
+                    break
+        else:
+            buf.append(line)
+    if buf:                              # elde kalan satırlar
+        paras.append("\n".join(buf).strip())
+    return "\n\n".join(paras)
+
+
+def cli_mode():
+    print("=== WhatsApp Toplu Mesaj Botu – CLI (v3.2) ===")
+    # --resume: aynı numara/mesajlarla yarıda kalan kampanyayı kaldığı yerden sürdür
+    resume = "--resume" in sys.argv
+
+    # numaralar tarayıcı açılmadan önce tek seferde temizlenir, tekrarlar atılır
+    norm = normalize_numbers(input("Alıcı numaraları (virgülle): ").split(","))
+    if norm.rejected or norm.duplicates:
+        print(norm.report())
+    numbers = norm.numbers
+
+    msg1 = multiline_input("1. Mesaj")
+    if not numbers or not msg1:
+        sys.exit("Numara ve 1. mesaj zorunlu.")
+
+    # 2. mesaj (opsiyonel)
+    choice2 = input("2. mesaj da göndermek ister misin? (y/n): ").strip().lower()
+    msg2, time2 = "", ""
+    if choice2 == "y":
+        msg2  = multiline_input("2. Mesaj")
+        time2 = input("2. Mesaj saati (HH:MM): ").strip()
+
+    # 3. mesaj (opsiyonel)
+    choice3 = input("3. mesaj da göndermek ister misin? (y/n): ").strip().lower()
+    msg3, time3 = "", ""
+    if choice3 == "y":
+        msg3  = multiline_input("3. Mesaj")
+        time3 = input("3. Mesaj saati (HH:MM): ").strip()
+
+    mode   = input("Mod? instantly / scheduled (i/s): ").strip().lower()
+    wait_s = int(input("Gönder butonu timeout (sn) [10]: ") or 10)
+
+    # ----------------------------- ANINDA MOD -----------------------------
+    if mode in ("i", "a"):                    # "a" (anında) eski yanıt olarak kabul
+        gap_s = float(input("Mesajlar arası saniye [1]: ") or 1)
+        workers = int(input("Paralel tarayıcı (hesap) sayısı [1]: ") or 1)
+
+        if daemon_available():                # sıcak servis varsa işi ona teslim et
+            job = daemon_submit(numbers, [msg1, msg2, msg3], wait_s, gap_s,
+                                workers, resume)
+            print(f"Servise gönderildi: iş #{job['id']}")
+            daemon_watch(job["id"])
+            os._exit(0)
+
+        # her sohbet bir kez açılır, 1-2-3 mesajı ardışık gönderilir
+        send_bulk_multi(numbers, [msg1, msg2, msg3], wait_s, gap_s,
+                        workers=workers, resume=resume)
+
+        _close_driver()
+        os._exit(0)                           # süreçten kesin çıkış
+
+    # -------------------------- ZAMANLANMIŞ MOD ---------------------------
+    else:
+        # 1) Date
+        date_str = input("Gönderim tarihi (YYYY-MM-DD): ").strip()
+        try:
+            year, month, day = map(int, date_str.split("-"))
+        except ValueError:
+            sys.exit("Tarih formatı geçersiz (YYYY-MM-DD olmalı).")
+
+        # 2) 1. Message time
+        t1 = input("1. Mesaj saati (HH:MM): ").strip()
+        h1, m1 = map(int, t1.split(":"))
+
+        # 3) Wait time between messages
+        gap_s = int(input("Mesajlar arası saniye (1-60) [5]: ") or 5)
+
+        # 4) Messages list: (mesaj, Y, A, G, H, M)
+        msgs: List[Tuple[str, int, int, int, int, int]] = [
+            (msg1, year, month, day, h1, m1)
+        ]
+        if msg2 and time2:
+            h2, m2 = map(int, time2.split(":"))
+            msgs.append((msg2, year, month, day, h2, m2))
+        if msg3 and time3:
+            h3, m3 = map(int, time3.split(":"))
+            msgs.append((msg3, year, month, day, h3, m3))
+
+        if daemon_available():                # servis zamanı gelince kendisi gönderir
+            for txt, y, mo, d, h, mi in msgs:
+                job = daemon_submit(numbers, [txt], wait_s, gap_s, resume=resume,
+                                    at=datetime.datetime(y, mo, d, h, mi).timestamp())
+                print(f"Servise gönderildi: iş #{job['id']} → {h:02d}:{mi:02d}")
+            os._exit(0)
+
+        # 5) Timers
+        schedule_multiple_messages(numbers, msgs, gap_s, wait_s, resume=resume)
+        print("Timers started…  (Ctrl+C ile çık)")
+
+        # 6) Zamanlayıcıdaki tüm işler bitene kadar bekle
+        get_scheduler().wait()
+
+        _close_driver()
+        os._exit(0)
+
+
+def _argv_value(flag: str, default: Optional[str] = None) -> Optional[str]:
+    """'--flag değer' biçimindeki komut satırı argümanını döndürür."""
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def contacts_cli() -> bool:
+    """--import DOSYA [--tag GRUP] / --export DOSYA [--tag GRUP]; iş yapıldıysa True."""
+    tag = _argv_value("--tag")
+    src, dst = _argv_value("--import"), _argv_value("--export")
+    if src:
+        import csv
+        t0 = time.time()
+        try:
+            stats = import_contacts(
+                src, tags=(tag,) if tag else (),
+                progress=lambda st: print(f"\r{st['read']} satır okundu…", end="", flush=True),
+            )
+        except (OSError, ValueError, csv.Error) as e:
+            sys.exit(f"İçe aktarılamadı: {e}")
+        print(f"\nİçe aktarıldı ({time.time() - t0:.1f} sn): "
+              f"{stats['added']} yeni, {stats['duplicate']} tekrar, "
+              f"{stats['invalid']} geçersiz.")
+    if dst:
+        try:
+            print(f"{export_contacts(dst, tag=tag)} kayıt → {dst}")
+        except OSError as e:
+            sys.exit(f"Dışa aktarılamadı: {e}")
+    return bool(src or dst)
+
+
+# ------------------------------------------------------------
+# 4-a) Başsız toplu mod: --batch SPEC (cron / boru hattı)
+# ------------------------------------------------------------
+# Alıcılar dosyadan ya da stdin'den satır satır okunur ve okundukça gönderilir;
+# liste hiçbir zaman bütünüyle belleğe alınmaz. Tekrar denetimi için görülen
+# numaralar tamsayı olarak tutulur; DEDUPE_MEMORY_MAX aşılınca geçici bir
+# SQLite dosyasına taşınır (bellek sınırlı, disk alıcı sayısıyla büyür).
+# Her alıcının sonucu stdout'a bir
+# JSON satırı olarak yazılır; print günlükleri bu modda stderr'e gider.
+BATCH_DEFAULTS = {
+    "wait_sec": 10, "gap_sec": 1.0, "workers": 1, "resume": False,
+    "recipients": "-", "format": "auto", "dedupe": True,
+}
+DEDUPE_MEMORY_MAX = 1_000_000  # bellekteki tekrar kümesi bundan büyürse diske taşınır
+_FIELD_SPLIT = re.compile(r"[,;\t|]")
+# ayırıcısız "0555 111 22 33 Ali Veli" → numara + isim (isim rakamla başlamaz)
+_LINE_NAME = re.compile(r"([+(\d][\d\s()./-]*?)\s+([^\d\s+(].*)")
+
+
+def load_batch_spec(path) -> dict:
+    """Kampanya dosyası (.json / .toml) → varsayılanlarla tamamlanmış sözlük.
+
+    Zorunlu: "message" ya da "messages" ({alan} şablonları olabilir).
+    İsteğe bağlı: wait_sec, gap_sec, workers, campaign, resume, recipients,
+    format (auto/lines/csv/jsonl), dedupe, country_code, nav, lean, engine.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".toml":
+        try:
+            import tomllib                      # Python 3.11+
+        except ImportError:
+            raise ValueError("TOML için Python 3.11+ gerekir; JSON kullanın") from None
+        with open(path, "rb") as f:
+            spec = tomllib.load(f)
+    else:
+        spec = json.loads(path.read_text(encoding="utf-8"))
+    messages = spec.get("messages") or spec.get("message") or []
+    if isinstance(messages, str):
+        messages = [messages]
+    messages = [m for m in messages if m.strip()]
+    if not messages:
+        raise ValueError(f"{path}: 'message' ya da 'messages' zorunlu")
+    return {**BATCH_DEFAULTS, **spec, "messages": messages}
+
+
+def read_recipient_rows(lines: Iterable[str], fmt: str = "auto"
+                        ) -> Tuple[Optional[List[str]],
+                                   Iterator[Tuple[str, Optional[Dict[str, str]]]]]:
+    """Metin satırları → (alan adları, (ham numara, {alan: değer}) akışı).
+
+    fmt: "lines" (numara[ isim] ya da numara,isim), "csv" (başlıklı), "jsonl"
+    ({"number": …}) ya da "auto" (ilk dolu satıra bakılır). Alan adları
+    başlıktan bilinir (csv; lines → yalnızca "name"); jsonl'de satırdan
+    satıra değiştiği için None. Satırlar geldikçe okunur; bozuk JSON satırı
+    → (satır, None).
+    """
+    it = iter(lines)
+    first = next((ln for ln in it if ln.strip()), None)
+    if first is None:
+        return [], iter(())
+    it = itertools.chain([first], it)
+    if fmt == "auto":
+        head = first.strip()
+        if head.startswith("{"):
+            fmt = "jsonl"
+        elif any(c.strip().lower() in _PHONE_COLS for c in _FIELD_SPLIT.split(head)):
+            fmt = "csv"
+        else:
+            fmt = "lines"
+    if fmt == "csv":
+        head, rows = _read_header(_csv_reader(it, first), required=True)
+        columns = head.columns + ([] if head.name is None else ["name"])
+        return columns, _iter_rows(rows, "csv", head)
+    return (None if fmt == "jsonl" else ["name"]), _iter_rows(it, fmt)
+
+
+def _iter_rows(it, fmt: str, head: Optional[CSVHeader] = None
+               ) -> Iterator[Tuple[str, Optional[Dict[str, str]]]]:
+    """read_recipient_rows() için biçime göre satır üreteci."""
+    if fmt == "jsonl":
+        for line in it:
+            if not line.strip():
+                continue
+            try:
+                rec = {str(k).lower(): v for k, v in json.loads(line).items()}
+            except (ValueError, AttributeError):
+                yield line.strip(), None
+                continue
+            raw = next((str(rec[c]) for c in _PHONE_COLS if rec.get(c)), "")
+            yield raw, rec
+    elif fmt == "csv":
+        for row in it:
+            if any(row):
+                yield (row[head.phone] if len(row) > head.phone else ""), head.record(row)
+    else:
+        for line in it:
+            line = line.strip()
+            parts = _FIELD_SPLIT.split(line, 1)
+            if len(parts) == 1:
+                m = _LINE_NAME.fullmatch(line)
+                parts = list(m.groups()) if m else parts
+            if parts[0]:
+                yield parts[0].strip(), {"name": parts[1].strip() if len(parts) > 1 else ""}
+
+
+class _BatchRecord(dict):
+    """Girdi alanları + girdideki satır numarası (JSONL çıktısında "row")."""
+    __slots__ = ("row",)
+
+
+class _SeenNumbers:
+    """Tekrar denetimi kümesi: önce bellekte, büyüyünce geçici SQLite'ta.
+
+    sqlite3.connect("") kapanınca silinen özel bir disk veritabanı açar;
+    üreteç farklı iş parçacıklarından çekilebildiği için bağlantı iş
+    parçacığına bağlı değildir (erişim yine de sırayla olur).
+    """
+    __slots__ = ("_mem", "_db", "limit")
+
+    def __init__(self, limit: int = DEDUPE_MEMORY_MAX):
+        self._mem: set = set()
+        self._db = None
+        self.limit = limit
+
+    def add(self, num: int) -> bool:
+        """Numara ilk kez görüldüyse ekler ve True döner."""
+        if self._db is not None:
+            return self._db.execute("INSERT OR IGNORE INTO seen VALUES (?)",
+                                    (num,)).rowcount == 1
+        if num in self._mem:
+            return False
+        self._mem.add(num)
+        if len(self._mem) > self.limit:
+            self._spill()
+        return True
+
+    def _spill(self):
+        import sqlite3
+        self._db = sqlite3.connect("", check_same_thread=False)
+        self._db.execute("CREATE TABLE seen (n INTEGER PRIMARY KEY)")
+        self._db.executemany("INSERT INTO seen VALUES (?)", ((n,) for n in self._mem))
+        self._mem = set()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def run_batch(spec: dict, lines: Iterable[str], out=None,
+              cancel: Optional[threading.Event] = None,
+              chunk: int = 1) -> Dict[str, int]:
+    """Kampanyayı akış halinde gönderir; her alıcı için out'a bir JSON satırı.
+
+    Satır: {"row", "number", "status", "ts"} (+ "reason", "input").
+    status: sent, failed, invalid, skipped, duplicate, rejected.
+    chunk: normalleştirme parti boyu; 1 → boru hattında satır beklenmeden gönderilir.
+    Gönderim send_bulk_template() ile yapılır.
+    → {"sent", "failed", "skipped", "duplicate", "rejected"}
+    """
+    out = out or sys.stdout
+    cc = str(spec.get("country_code") or DEFAULT_CC)
+    tpls = [MessageTemplate(m) for m in spec["messages"]]
+    mh = _msg_hash(*spec["messages"])
+    neg = get_negative_cache()
+    counts = {"duplicate": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def _emit(row: int, num: Optional[str], status: str, **extra):
+        line = json.dumps({"row": row, "number": num, "status": status,
+                           "ts": round(time.time(), 3), **extra}, ensure_ascii=False)
+        with lock:
+            out.write(line + "\n")
+            out.flush()                         # boru hattı sonucu hemen görsün
+
+    columns, rows = read_recipient_rows(lines, spec["format"])
+    uses_name = any("name" in t.fields for t in tpls)
+    if columns is not None:                     # başlık belli: tek alıcıya gitmeden denetle
+        columns += ["name"] * uses_name         # boş isimler rehberden doldurulur
+        check_template_fields(tpls, columns)
+
+    def _items():
+        seen = _SeenNumbers()
+        try:
+            numbered = ((raw, (row, raw, rec)) for row, (raw, rec) in enumerate(rows, 1))
+            for num, (row, raw, rec) in normalize_pairs(numbered, cc, chunk):
+                if num is None or rec is None:
+                    counts["rejected"] += 1
+                    _emit(row, None, "rejected", input=raw,
+                          reason="bozuk JSON" if rec is None else _reject_reason(raw, cc))
+                    continue
+                if spec["dedupe"] and not seen.add(int(num)):
+                    counts["duplicate"] += 1
+                    _emit(row, num, "duplicate")
+                    continue
+                rec = _BatchRecord(rec)
+                rec.row = row
+                yield num, rec
+        finally:
+            seen.close()
+
+    records = _items()
+    if uses_name:
+        records = with_contact_names(records, batch=chunk)
+    stats = send_bulk_template(
+        tpls, records, int(spec["wait_sec"]), float(spec["gap_sec"]),
+        int(spec["workers"]), spec.get("campaign") or f"batch-{mh}",
+        bool(spec["resume"]), cancel, columns=columns,
+        on_record=lambda num, rec, ok: _emit(
+            rec.row, num, "sent" if ok else "invalid" if num in neg else "failed"),
+        skipped=lambda num, rec, why: _emit(rec.row, num, "skipped", reason=why))
+    return {**stats, **counts}
+
+
+def batch_cli():
+    """--batch SPEC [--recipients DOSYA|-] [--resume]: etkileşimsiz kampanya.
+
+    Çıkış kodu: 0 → sorun yok, 1 → başarısız / reddedilen alıcı var,
+    2 → kampanya dosyası, girdi biçimi ya da şablon alanları hatalı.
+    """
+    global LEAN_MODE, NAV_MODE, ENGINE
+    import signal
+
+    try:
+        spec = load_batch_spec(_argv_value("--batch"))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Kampanya dosyası okunamadı: {e}", file=sys.stderr)
+        os._exit(2)
+    if "--resume" in sys.argv:
+        spec["resume"] = True
+    LEAN_MODE = bool(spec.get("lean", LEAN_MODE))
+    NAV_MODE = spec.get("nav", NAV_MODE)
+    ENGINE = spec.get("engine", ENGINE)
+    src = _argv_value("--recipients", spec["recipients"])
+    # normal dosya → büyük partiler; stdin / FIFO → satır satır (beklemeden gönder)
+    chunk = IMPORT_CHUNK if src != "-" and Path(src).is_file() else 1
+
+    out, code = sys.stdout, 0
+    cancel = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: cancel.set())
+    with contextlib.redirect_stdout(sys.stderr):
+        f = sys.stdin if src == "-" else open(src, "r", encoding="utf-8-sig", newline="")
+        try:
+            stats = run_batch(spec, f, out, cancel, chunk)
+            print(json.dumps(stats, ensure_ascii=False))
+            code = 1 if stats["failed"] or stats["rejected"] else 0
+        except KeyboardInterrupt:
+            cancel.set()
+            code = 1
+        except ValueError as e:
+            print(f"Girdi okunamadı: {e}")
+            code = 2
+        finally:
+            if f is not sys.stdin:
+                f.close()
+            _close_driver()
+    out.flush()
+    os._exit(code)
+
+
+def bench_startup(repeat: int = 5) -> Dict[str, float]:
+    """Başlangıç süresini ayrı süreçlerde ölçer → {durum: medyan ms}.
+
+    "import" ölçümü ayrıca tarayıcı yığınının, Tkinter'in ve tembel yüklenen
+    standart modüllerin içe aktarmada yüklenmediğini doğrular.
+    """
+    import statistics, subprocess
+    here = Path(__file__).resolve().parent
+    check = ("import sys; sys.path.insert(0, {!r}); import whatsapp_bot; "
+             "heavy = {{'selenium', 'undetected_chromedriver', 'tkinter', 'sqlite3', "
+             "'csv', 'hashlib', 'logging', 'inspect'}} & set(sys.modules); "
+             "sys.exit(f'içe aktarmada yüklendi: {{heavy}}' if heavy else 0)").format(str(here))
+    cases = {
+        "python": [sys.executable, "-c", "pass"],
+        "import": [sys.executable, "-c", check],
+        "--help": [sys.executable, str(here / LAUNCHER), "--help"],
+    }
+    out: Dict[str, float] = {}
+    for name, cmd in cases.items():
+        xs = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+            xs.append((time.perf_counter() - t0) * 1000)
+        out[name] = round(statistics.median(xs), 1)
+        print(f"{name:<8}{out[name]:>8.1f} ms")
+    return out
+
+
+LAUNCHER = "whatsapp_bot_launcher.py"    # ince başlatıcı; gövde bu modülde (bayt kodu önbellekte)
+
+USAGE = f"""Kullanım: python {LAUNCHER} [seçenekler]
+
+  (seçeneksiz)            GUI (Tkinter yoksa konsol modu)
+  --cli                   konsol modu
+  --lean                  başsız, yalın tarayıcı profili
+  --cdp                   asyncio + DevTools motoru (pip install websockets)
+  --resume                kampanyada zaten gönderilmiş alıcıları atla
+  --daemon [--port N]     tarayıcıyı sıcak tutan yerel gönderim servisi
+  --no-daemon             çalışan servisi kullanma
+  --batch SPEC            başsız toplu gönderim (JSON/TOML kampanya dosyası);
+                          alıcılar --recipients DOSYA ya da stdin'den akar,
+                          sonuçlar stdout'a JSONL olarak yazılır
+  --import DOSYA          rehbere CSV/VCF içe aktar   (--tag GRUP)
+  --export DOSYA          rehberi CSV'ye dışa aktar   (--tag GRUP)
+  --bench                 sahte WhatsApp Web'e karşı çevrimdışı kıyaslama
+                          (--chromedriver YOL / WA_CHROMEDRIVER: sürücü indirilmez)
+  --bench-startup         başlangıç / içe aktarma süresi kıyaslaması
+
+Bağımlılıklar (pip install -r requirements.txt):
+  undetected-chromedriver + selenium   her gönderim modu için gerekli
+  websockets                           yalnızca --cdp için (yoksa Selenium motoru)
+"""
+
+
+def main():
+    """Komut satırı giriş noktası."""
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(USAGE)
+    elif "--bench-startup" in sys.argv:
+        bench_startup()
+    elif contacts_cli():
+        pass
+    else:
+        gui = not _SENDING_FLAGS.intersection(sys.argv) and _gui_available()
+        # Gönderen modlar: bağımlılığı iş parçacıkları başlamadan bir kez sor
+        # (GUI tarayıcısız da açılır; eksikse gönderim hatası pencerede görünür)
+        if not gui and not _selenium_installed():
+            sys.exit(SELENIUM_MISSING)
+        if "--batch" in sys.argv:
+            batch_cli()
+        elif "--daemon" in sys.argv:
+            run_daemon(int(_argv_value("--port", str(DAEMON_PORT))))
+        elif "--bench" in sys.argv:
+            bench_cli()
+        elif gui:
+            gui_main()
+        else:
+            if "--cli" not in sys.argv:
+                print(INSTALL_MSG)
+            cli_mode()
+
+
+_SENDING_FLAGS = {"--batch", "--daemon", "--bench", "--cli"}
+
+
+# ------------------------------------------------------------
+# 5) Tkinter GUI
+# ------------------------------------------------------------
+# İşçi iş parçacıkları Tk'ye hiç dokunmaz: olayları kuyruğa atar, ana döngü
+# kuyruğu GUI_TICK_MS'de bir toplu boşaltır ve ekranı tur başına bir kez çizer.
+GUI_TICK_MS = 100             # olay kuyruğunu boşaltma aralığı
+GUI_BATCH_MAX = 2000          # tek turda işlenen en fazla olay (pencere donmasın)
+GUI_RATE_WINDOW = 30          # hız / kalan süre hesabı için kayan pencere (sn)
+
+
+class ProgressStats:
+    """Gönderim ilerlemesi: sayaçlar, anlık hız ve tahmini kalan süre."""
+
+    def __init__(self, total: int = 0, window: float = GUI_RATE_WINDOW):
+        self.total = total
+        self.window = window
+        self.done = self.failed = 0
+        self.started = time.time()
+        self._recent: "collections.deque[Tuple[float, int]]" = collections.deque()
+
+    def add(self, ok: bool, at: Optional[float] = None):
+        self.update(self.done + 1, self.failed + (not ok), at)
+
+    def update(self, done: int, failed: int, at: Optional[float] = None):
+        """Mutlak sayaçlarla güncelle (servis durumundan gelenler için)."""
+        if done > self.done:
+            self._recent.append((at or time.time(), done - self.done))
+        self.done, self.failed = done, failed
+
+    def rate(self) -> float:
+        """Son `window` saniyedeki gönderim hızı (alıcı/sn)."""
+        now = time.time()
+        while self._recent and self._recent[0][0] < now - self.window:
+            self._recent.popleft()
+        span = min(self.window, now - self.started)
+        return sum(n for _, n in self._recent) / span if span > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        r = self.rate()
+        return max(self.total - self.done, 0) / r if r > 0 else None
+
+    def text(self) -> str:
+        eta = self.eta()
+        left = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "--:--:--"
+        return (f"{self.done}/{self.total}  ·  {self.failed} hata  ·  "
+                f"{self.rate() * 60:.1f} alıcı/dk  ·  kalan ≈ {left}")
+
+
+class SortedIndex:
+    """Sıralı numara dizini: bisect ile O(log n) arama ve önek aralığı."""
+
+    def __init__(self, items=()):
+        self.items: List[str] = sorted(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: str) -> Optional[int]:
+        """Ekler ve konumunu döndürür; zaten varsa None."""
+        i = bisect.bisect_left(self.items, item)
+        if i < len(self.items) and self.items[i] == item:
+            return None
+        self.items.insert(i, item)
+        return i
+
+    def remove_many(self, items) -> int:
+        drop = set(items)
+        before = len(self.items)
+        if len(drop) == 1:                      # tek kayıt: listeyi yeniden kurma
+            i = bisect.bisect_left(self.items, next(iter(drop)))
+            if i < before and self.items[i] in drop:
+                del self.items[i]
+        else:
+            self.items = [x for x in self.items if x not in drop]
+        return before - len(self.items)
+
+    def prefix(self, prefix: str) -> List[str]:
+        """`prefix` ile başlayan kayıtlar (sıralı dilim)."""
+        if not prefix:
+            return self.items
+        lo = bisect.bisect_left(self.items, prefix)
+        hi = bisect.bisect_left(self.items, prefix + "\uffff", lo)
+        return self.items[lo:hi]
+
+
+class RecipientList:
+    """Gönderim listesi: ekleme sırası korunur, tekrarlar atlanır.
+
+    Metin kutusu yerine liste + küme tutulur; ekleme O(1), toplu silme
+    tek geçişte O(n), gönderim için yeniden ayrıştırma gerekmez.
+    """
+
+    def __init__(self):
+        self._items: List[str] = []
+        self._set: set = set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    def __contains__(self, number: str) -> bool:
+        return number in self._set
+
+    def add_many(self, numbers) -> int:
+        added = 0
+        for n in numbers:
+            if n and n not in self._set:
+                self._set.add(n)
+                self._items.append(n)
+                added += 1
+        return added
+
+    def remove_many(self, numbers) -> int:
+        drop = self._set.intersection(numbers)
+        if drop:
+            self._items = [n for n in self._items if n not in drop]
+            self._set -= drop
+        return len(drop)
+
+    def clear(self):
+        self._items, self._set = [], set()
+
+    def numbers(self) -> List[str]:
+        return list(self._items)
+
+
+class VirtualList:
+    """Yalnızca görünen satırları çizen Listbox sarmalayıcısı.
+
+    Veri `source`tan (len + dilim destekleyen dizi) okunur; Listbox'ta her an
+    en fazla `height` satır bulunur, bu yüzden 100k+ kayıtta da kaydırma ve
+    yenileme sabit maliyetlidir. Seçim değer olarak tutulur, kaydırınca kaybolmaz;
+    Shift / Ctrl olmadan yapılan tıklama ya da ok tuşu seçimi ekran dışında
+    kalan satırları da bırakır (Listbox'ın kendi davranışı gibi).
+    """
+
+    def __init__(self, parent, height: int = 10, width: int = 25):
+        import tkinter as tk
+        self.frame = tk.Frame(parent)
+        self.lb = tk.Listbox(self.frame, height=height, width=width,
+                             selectmode=tk.EXTENDED, exportselection=False)
+        self.bar = tk.Scrollbar(self.frame, orient="vertical", command=self._on_scroll)
+        self.lb.pack(side="left", fill="both", expand=True)
+        self.bar.pack(side="right", fill="y")
+        self.height = height
+        self.top = 0
+        self.source = []
+        self.selected: set = set()
+        self.lb.bind("<<ListboxSelect>>", self._on_select)
+        for seq in ("<ButtonPress-1>", "<Up>", "<Down>", "<space>", "<Select>"):
+            self.lb.bind(seq, self._on_plain_select, add="+")
+        self.lb.bind("<MouseWheel>", lambda e: self._scroll_by(-3 if e.delta > 0 else 3))
+        self.lb.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.lb.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.lb.bind("<Prior>", lambda e: self._scroll_by(-self.height))
+        self.lb.bind("<Next>", lambda e: self._scroll_by(self.height))
+
+    def set_source(self, source, keep_position: bool = False):
+        self.source = source
+        if not keep_position:
+            self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        n = len(self.source)
+        self.top = max(0, min(self.top, n - self.height))
+        rows = self.source[self.top:self.top + self.height]
+        self.lb.delete(0, "end")
+        if rows:
+            self.lb.insert("end", *rows)
+        for i, v in enumerate(rows):
+            if v in self.selected:
+                self.lb.selection_set(i)
+        self.bar.set(*((self.top / n, (self.top + len(rows)) / n) if n else (0, 1)))
+
+    def _scroll_by(self, rows: int):
+        self.top += rows
+        self.refresh()
+        return "break"                          # sayfanın tekerlek kaydırmasına geçme
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == "moveto":
+            self.top = int(float(value) * len(self.source))
+        else:                                   # "scroll", n, units|pages
+            self.top += int(value) * (self.height if unit == "pages" else 1)
+        self.refresh()
+
+    def _on_plain_select(self, event):
+        """Değiştiricisiz seçim: görünmeyen satırların seçimi düşer.
+
+        Sınıf bağlamasından önce çalışır; görünen satırları Listbox kendisi
+        günceller, ardından _on_select eşitler.
+        """
+        if not event.state & (0x0001 | 0x0004):       # Shift | Control
+            visible = set(self.source[self.top:self.top + self.height])
+            self.selected.intersection_update(visible)
+
+    def _on_select(self, _=None):
+        picked = set(self.lb.curselection())
+        for i, v in enumerate(self.source[self.top:self.top + self.height]):
+            if i in picked:
+                self.selected.add(v)
+            else:
+                self.selected.discard(v)
+
+    def value_at(self, y: int) -> Optional[str]:
+        if not self.lb.size():
+            return None
+        return self.lb.get(self.lb.nearest(y))
+
+    def selection(self) -> List[str]:
+        return list(self.selected)
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.lb.selection_clear(0, "end")
+
+
+def gui_main():
+    """Tkinter arayüzünü kurar ve ana döngüyü çalıştırır."""
+    import threading, tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+    from datetime import datetime
+
+    root = tk.Tk()
+    root.title("WhatsApp Toplu Mesaj Botu – GUI (v3.2)")
+    root.geometry("900x650")
+    root.resizable(False, False)
+
+    # ==== Kaydırılabilir Canvas + Scrollbar =========================
+    canvas = tk.Canvas(root, highlightthickness=0)
+    vbar   = tk.Scrollbar(root, orient="vertical", command=canvas.yview)
+    canvas.configure(yscrollcommand=vbar.set)
+
+    vbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+
+    scroll_frame = tk.Frame(canvas)                       # <<< TÜM ARAYÜZ BURADA
+    win_id = canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
+
+    # içerik büyüdükçe scrollregion’u güncelle
+    def _on_frame_config(event):
+        canvas.configure(scrollregion=canvas.bbox("all"))
+    scroll_frame.bind("<Configure>", _on_frame_config)
+
+    # canvas genişleyince iç çerçevenin genişliğini eşitle
+    def _on_canvas_config(event):
+        canvas.itemconfigure(win_id, width=event.width)
+    canvas.bind("<Configure>", _on_canvas_config)
+
+    # fare tekerleği
+    def _on_mousewheel(event):
+        canvas.yview_scroll(-1 * (event.delta // 120), "units")
+    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
+    canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll( 1, "units"))
+    # ===============================================================
+
+    # ------------ yardımcı toast (bloklamayan bilgi penceresi) -----
+    def toast(msg: str, msec: int = 1500):
+        top = tk.Toplevel(root)
+        top.overrideredirect(True)
+        top.attributes("-topmost", True)
+        tk.Label(top, text=msg, bg="#ffffe0", relief="solid", bd=1)\
+          .pack(ipadx=10, ipady=5)
+        root.update_idletasks()
+        x = root.winfo_x() + (root.winfo_width() // 2) - (top.winfo_reqwidth() // 2)
+        y = root.winfo_y() + (root.winfo_height() // 2) - (top.winfo_reqheight() // 2)
+        top.geometry(f"+{x}+{y}")
+        top.after(msec, top.destroy)
+
+    # --- REHBER BLOKU ---------------------------------------------
+    frm_book = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_book.pack(anchor="w", fill="x")
+
+    tk.Label(frm_book, text="Registered numbers:").grid(row=0, column=0, sticky="w")
+
+    # arama: sıralı dizinde önek aralığı (bisect), yalnızca görünen satırlar çizilir
+    search_var = tk.StringVar()
+    ent_search = tk.Entry(frm_book, textvariable=search_var, width=25)
+    ent_search.grid(row=1, column=0, sticky="w", padx=(0, 10))
+
+    lst_contacts = VirtualList(frm_book, height=8, width=25)
+    lst_contacts.frame.grid(row=2, column=0, rowspan=4, padx=(0, 10), sticky="n")
+    lbl_contacts = tk.Label(frm_book, text="", anchor="w")
+    lbl_contacts.grid(row=6, column=0, sticky="w")
+
+    store = get_contacts()
+    index = SortedIndex()
+
+    def _search_prefix() -> str:
+        # '0555…' / '+90 555' yazımı rehberdeki '90555…' biçimine çevrilir
+        return _loose_number(search_var.get())
+
+    def _apply_filter(*_):
+        view = index.prefix(_search_prefix())
+        lst_contacts.set_source(view)
+        lbl_contacts.config(text=f"{len(view)} / {len(index)}")
+
+    def _on_search(*_):
+        lst_contacts.clear_selection()          # süzgeçle gizlenen satır seçili kalmasın
+        _apply_filter()
+    search_var.trace_add("write", _on_search)
+
+    def _populate_contacts():
+        index.items = store.numbers()
+        lst_contacts.selected.intersection_update(index.items)
+        _apply_filter()
+    _populate_contacts()
+
+    def _add_recipients(nums):
+        added = recipients.add_many(nums)
+        _refresh_recipients(keep_position=True)
+        return added
+
+    def _add_clicked_to_numbers(event):
+        num = lst_contacts.value_at(event.y)
+        if num:
+            _add_recipients([num])
+    lst_contacts.lb.bind("<Double-1>", _add_clicked_to_numbers)
+
+    def _add_selected_to_numbers():
+        sel = lst_contacts.selection()
+        if not sel:
+            toast("Listeden numara seç!", 1500); return
+        toast(f"{_add_recipients(sorted(sel))} numara eklendi ✓", 1200)
+
+    def _add_matches_to_numbers():
+        view = index.prefix(_search_prefix())
+        toast(f"{_add_recipients(view)} numara eklendi ✓", 1200)
+
+    # ---------- yeni numara ekleme --------------------------------
+    ent_new = tk.Entry(frm_book, width=20)
+    ent_new.grid(row=2, column=1, sticky="w")
+
+    tk.Label(frm_book, text="Group:").grid(row=3, column=1, sticky="w")
+    ent_tag = tk.Entry(frm_book, width=20)
+    ent_tag.grid(row=4, column=1, sticky="w")
+
+    def _save_new_number():
+        num = _clean_number(ent_new.get())
+        if not num:
+            toast(f"Geçersiz numara: {_reject_reason(ent_new.get())}", 2000); return
+        tag = ent_tag.get().strip()
+        if not store.add(num, tags=(tag,) if tag else ()):
+            toast("Zaten kayıtlı.", 1500); return
+        index.add(num)                          # tüm listeyi yeniden okuma
+        _apply_filter()
+        _add_recipients([num])
+        ent_new.delete(0, tk.END)
+        toast("Kaydedildi ✓", 1200)
+
+    def _add_group_to_numbers():
+        tag = ent_tag.get().strip()
+        nums = store.numbers(tag) if tag else []
+        if not nums:
+            toast("Grup boş ya da yok.", 1500); return
+        toast(f"{_add_recipients(nums)} numara eklendi ✓", 1200)
+
+    # ---------- seçili numaraları sil -----------------------------
+    def _delete_selected():
+        sel = lst_contacts.selection()
+        if not sel:
+            toast("Listeden numara seç!", 1500); return
+        store.remove_many(sel)
+        index.remove_many(sel)
+        lst_contacts.clear_selection()
+        _apply_filter()
+        recipients.remove_many(sel)             # gönderim listesinden de çıkar
+        _refresh_recipients(keep_position=True)
+        toast(f"{len(sel)} numara silindi ✓", 1200)
+
+    # ---------- düğmeler ------------------------------------------
+    tk.Button(
+        frm_book, text="Save", command=_save_new_number,
+        bg="#0066cc", fg="white", width=8
+    ).grid(row=2, column=2, padx=5)
+
+    tk.Button(
+        frm_book, text="Delete", command=_delete_selected,
+        bg="#cc0000", fg="white", width=8
+    ).grid(row=2, column=3, padx=5)
+
+    tk.Button(
+        frm_book, text="Add group", command=_add_group_to_numbers, width=8
+    ).grid(row=4, column=2, padx=5)
+
+    tk.Button(
+        frm_book, text="Add selected", command=_add_selected_to_numbers, width=10
+    ).grid(row=5, column=2, padx=5)
+
+    tk.Button(
+        frm_book, text="Add matches", command=_add_matches_to_numbers, width=10
+    ).grid(row=5, column=3, padx=5)
+
+    # ---------- toplu içe / dışa aktarma --------------------------
+    def _run_bg(fn, on_done):
+        """fn() arka planda çalışır; sonucu ana döngü kuyruktan alır (Tk güvenli).
+
+        fn hata verirse on_done çağrılmaz, hata kullanıcıya gösterilir.
+        """
+        out: "queue.Queue" = queue.Queue()
+
+        def _work():
+            try:
+                out.put((True, fn()))
+            except BaseException as e:
+                out.put((False, e))
+        threading.Thread(target=_work, daemon=True).start()
+
+        def _poll():
+            try:
+                ok, res = out.get_nowait()
+            except queue.Empty:
+                root.after(200, _poll)
+            else:
+                if ok:
+                    on_done(res)
+                else:
+                    messagebox.showerror("WhatsApp", f"İşlem başarısız: {res}")
+        _poll()
+
+    def _import_file():
+        path = filedialog.askopenfilename(
+            filetypes=[("CSV / vCard", "*.csv *.vcf *.vcard"), ("All", "*.*")])
+        if not path:
+            return
+        tag = ent_tag.get().strip()
+        toast("İçe aktarılıyor…", 1200)
+
+        def _done(st):
+            _populate_contacts()
+            toast(f"{st['added']} yeni, {st['duplicate']} tekrar, "
+                  f"{st['invalid']} geçersiz", 2500)
+        _run_bg(lambda: import_contacts(path, store, (tag,) if tag else ()), _done)
+
+    def _export_file():
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("vCard", "*.vcf")])
+        if not path:
+            return
+        tag = ent_tag.get().strip() or None
+        _run_bg(lambda: export_contacts(path, store, tag),
+                lambda n: toast(f"{n} kayıt dışa aktarıldı ✓", 1500))
+
+    tk.Button(frm_book, text="Import…", command=_import_file, width=8)\
+        .grid(row=3, column=2, padx=5)
+    tk.Button(frm_book, text="Export…", command=_export_file, width=8)\
+        .grid(row=3, column=3, padx=5)
+
+    # --- alıcılar (gönderim listesi) -----------------------------
+    frm_n = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_n.pack(anchor="w", fill="x")
+    tk.Label(frm_n, text="Write or paste numbers one below the other, then Add:")\
+        .grid(row=0, column=0, columnspan=3, sticky="w")
+    txt_paste = tk.Text(frm_n, width=40, height=4)
+    txt_paste.grid(row=1, column=0, rowspan=3, sticky="nw")
+    lbl_rejected = tk.Label(frm_n, text="", anchor="w", justify="left", fg="#b00000")
+    lbl_rejected.grid(row=4, column=0, rowspan=2, sticky="nw")
+
+    recipients = RecipientList()
+    lst_recipients = VirtualList(frm_n, height=8, width=24)
+    lst_recipients.frame.grid(row=1, column=2, rowspan=4, padx=(10, 0), sticky="n")
+    lbl_recipients = tk.Label(frm_n, text="0 recipients", anchor="w")
+    lbl_recipients.grid(row=5, column=2, sticky="w", padx=(10, 0))
+
+    def _refresh_recipients(keep_position: bool = False):
+        lst_recipients.set_source(recipients, keep_position)
+        lbl_recipients.config(text=f"{len(recipients)} recipients")
+
+    def _add_pasted():
+        norm = normalize_numbers(txt_paste.get("1.0", tk.END).splitlines())
+        txt_paste.delete("1.0", tk.END)
+        if norm.rejected:                       # reddedilenler düzeltilmek üzere kutuda kalır
+            txt_paste.insert("1.0", "\n".join(raw for _, raw, _ in norm.rejected))
+        lbl_rejected.config(text=norm.report(limit=3) if norm.rejected else "")
+        toast(f"{_add_recipients(norm.numbers)} numara eklendi ✓"
+              + (f", {len(norm.rejected)} geçersiz" if norm.rejected else ""), 1500)
+
+    def _remove_recipients():
+        sel = lst_recipients.selection()
+        if not sel:
+            toast("Listeden numara seç!", 1500); return
+        recipients.remove_many(sel)
+        lst_recipients.clear_selection()
+        _refresh_recipients(keep_position=True)
+
+    def _clear_recipients():
+        recipients.clear()
+        lst_recipients.clear_selection()
+        _refresh_recipients()
+
+    tk.Button(frm_n, text="Add →", command=_add_pasted, width=8)\
+        .grid(row=1, column=1, padx=5, sticky="n")
+    tk.Button(frm_n, text="Remove", command=_remove_recipients, width=8)\
+        .grid(row=2, column=1, padx=5, sticky="n")
+    tk.Button(frm_n, text="Clear", command=_clear_recipients, width=8)\
+        .grid(row=3, column=1, padx=5, sticky="n")
+
+    # --- mesaj kutuları ------------------------------------------
+    def _msg_block(parent, title):
+        frm = tk.Frame(parent, padx=5, pady=5); frm.pack(anchor="w", fill="x")
+        tk.Label(frm, text=title).pack(anchor="w")
+        txt = tk.Text(frm, width=66, height=6); txt.pack(fill="x")
+        return txt
+
+    txt_msg1 = _msg_block(scroll_frame, "1. Message:")
+    txt_msg2 = _msg_block(scroll_frame, "2. Message:")
+    txt_msg3 = _msg_block(scroll_frame, "3. Message:")
+
+    # --- mod seçimi ----------------------------------------------
+    mode_var = tk.StringVar(value="instant")
+    frm_mode = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_mode.pack(anchor="w")
+    tk.Radiobutton(frm_mode, text="Instant", variable=mode_var,
+                   value="instant").grid(row=0, column=0, padx=5)
+    tk.Radiobutton(frm_mode, text="Scheduled", variable=mode_var,
+                   value="scheduled").grid(row=0, column=1, padx=5)
+    resume_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frm_mode, text="Resume (skip already sent)",
+                   variable=resume_var).grid(row=0, column=2, padx=15)
+
+    # --- tarih spinbox'ları --------------------------------------
+    frm_date = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_date.pack(anchor="w")
+    tk.Label(frm_date, text="Date (YYYY-MM-DD):").grid(row=0, column=0, sticky="w")
+    sb_year  = tk.Spinbox(frm_date, from_=datetime.now().year,
+                          to=datetime.now().year + 5, width=5, format="%04.0f")
+    sb_month = tk.Spinbox(frm_date, from_=1, to=12, width=3, format="%02.0f")
+    sb_day   = tk.Spinbox(frm_date, from_=1, to=31, width=3, format="%02.0f")
+    for sb, val, col in [(sb_year, datetime.now().year, 1),
+                         (sb_month, f"{datetime.now().month:02d}", 3),
+                         (sb_day,   f"{datetime.now().day:02d}",   5)]:
+        sb.delete(0, tk.END); sb.insert(0, val); sb.grid(row=0, column=col, padx=2)
+    tk.Label(frm_date, text="-").grid(row=0, column=2)
+    tk.Label(frm_date, text="-").grid(row=0, column=4)
+
+    # --- saat spinbox'ları ---------------------------------------
+    def _time_row(parent, default_h):
+        frm = tk.Frame(parent, padx=5, pady=2); frm.pack(anchor="w")
+        tk.Label(frm, text="Hour (HH:MM):").grid(row=0, column=0, sticky="w")
+        sb_h = tk.Spinbox(frm, from_=0, to=23, width=3, format="%02.0f"); sb_h.insert(0, default_h)
+        sb_m = tk.Spinbox(frm, from_=0, to=59, width=3, format="%02.0f"); sb_m.insert(0, "00")
+        sb_h.grid(row=0, column=1, padx=(5,2)); tk.Label(frm,text=":").grid(row=0,column=2)
+        sb_m.grid(row=0,column=3,padx=2)
+        return sb_h, sb_m
+
+    sb1_h, sb1_m = _time_row(scroll_frame, "09")
+    sb2_h, sb2_m = _time_row(scroll_frame, "10")
+    sb3_h, sb3_m = _time_row(scroll_frame, "11")
+
+    # --- ek ayarlar ----------------------------------------------
+    frm_gap = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_gap.pack(anchor="w")
+    tk.Label(frm_gap, text="Time between messages (1-60):")\
+        .grid(row=0, column=0, sticky="w")
+    sb_gap = tk.Spinbox(frm_gap, from_=1, to=60, width=3); sb_gap.insert(0,"5")
+    sb_gap.grid(row=0, column=1, padx=(5,25))
+
+    frm_set = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_set.pack(anchor="w")
+    tk.Label(frm_set, text="Send button timeout (sn):")\
+        .grid(row=0,column=0,sticky="w")
+    ent_wait = tk.Entry(frm_set,width=5); ent_wait.insert(0,"10")
+    ent_wait.grid(row=0,column=1,padx=(5,25))
+    tk.Label(frm_set, text="mode standby (sn):")\
+        .grid(row=1,column=0,sticky="w",pady=(5,0))
+    ent_gap = tk.Entry(frm_set,width=5); ent_gap.insert(0,"1")
+    ent_gap.grid(row=1,column=1,padx=(5,25))
+    tk.Label(frm_set, text="Parallel browsers:")\
+        .grid(row=2,column=0,sticky="w",pady=(5,0))
+    sb_workers = tk.Spinbox(frm_set, from_=1, to=8, width=3)
+    sb_workers.grid(row=2,column=1,padx=(5,25))
+    lean_var = tk.BooleanVar(value=LEAN_MODE)
+    tk.Checkbutton(frm_set, text="Lean browser (headless, no media)",
+                   variable=lean_var).grid(row=3,column=0,columnspan=2,sticky="w")
+
+    # --- Gönder & Sıfırla ----------------------------------------
+    btn_send = tk.Button(scroll_frame, text="Start sending",
+                         bg="green", fg="white", width=42)
+    btn_send.pack(pady=20)
+
+    # --- ilerleme: çubuk, özet satırı, alıcı bazında durum tablosu -----
+    frm_prog = tk.Frame(scroll_frame, padx=5, pady=5)
+    frm_prog.pack(anchor="w", fill="x")
+    pb = ttk.Progressbar(frm_prog, mode="determinate", length=600)
+    pb.pack(fill="x")
+    lbl_prog = tk.Label(frm_prog, text="", anchor="w")
+    lbl_prog.pack(fill="x")
+    frm_tbl = tk.Frame(frm_prog)
+    frm_tbl.pack(fill="x")
+    tbl = ttk.Treeview(frm_tbl, columns=("number", "status", "time"),
+                       show="headings", height=8)
+    for col, title, w in (("number", "Number", 220), ("status", "Status", 120),
+                          ("time", "Time", 100)):
+        tbl.heading(col, text=title)
+        tbl.column(col, width=w, anchor="w")
+    tbl_bar = tk.Scrollbar(frm_tbl, orient="vertical", command=tbl.yview)
+    tbl.configure(yscrollcommand=tbl_bar.set)
+    tbl.pack(side="left", fill="x", expand=True)
+    tbl_bar.pack(side="right", fill="y")
+
+    events: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()   # işçi → arayüz
+    prog = ProgressStats()
+    on_finish: List[Callable[[], None]] = []     # başarılı "done" olayında bir kez çağrılır
+
+    def _progress_reset(total: int):
+        nonlocal prog
+        prog = ProgressStats(total)
+        pb.configure(maximum=max(total, 1), value=0)
+        tbl.delete(*tbl.get_children())
+        lbl_prog.config(text=prog.text() if total else "")
+
+    def _post_result(num: str, ok: bool):        # işçi iş parçacığından çağrılır
+        events.put(("result", num, ok, time.time()))
+
+    def _drain():
+        """Kuyruktaki olayları toplu işler; tabloyu ve çubuğu bir kez çizer."""
+        rows, finished, failed = [], False, False
+        for _ in range(GUI_BATCH_MAX):
+            try:
+                ev = events.get_nowait()
+            except queue.Empty:
+                break
+            if ev[0] == "result":
+                _, num, ok, at = ev
+                prog.add(ok, at)
+                rows.append((num, "Gönderildi" if ok else "HATA",
+                             time.strftime("%H:%M:%S", time.localtime(at))))
+            elif ev[0] == "alert":
+                messagebox.showwarning("WhatsApp", ev[1])
+            elif ev[0] == "done":               # ("done", hatasız mı)
+                finished, failed = True, failed or not ev[1]
+        last = None
+        for row in rows:
+            last = tbl.insert("", "end", values=row)
+        if last is not None:
+            tbl.see(last)
+        if rows or finished:
+            pb.configure(value=prog.total if finished else prog.done)
+            lbl_prog.config(text=prog.text())
+        if finished and failed:                 # gönderim yarıda kaldı: uygulama açık kalsın
+            on_finish.clear()
+            btn_send.config(state=tk.NORMAL)
+        elif finished and on_finish:
+            on_finish.pop()()
+        root.after(GUI_TICK_MS, _drain)
+    _drain()
+
+    daemon_jobs: List[int] = []          # servise gönderilip izlenen işler
+
+    def restart_all():
+        for w in (txt_paste, txt_msg1, txt_msg2, txt_msg3):
+            w.delete("1.0", tk.END)
+        lbl_rejected.config(text="")
+        _clear_recipients()
+        for sb,val in [(sb1_h,"09"),(sb1_m,"00"),(sb2_h,"10"),(sb2_m,"00"),
+                       (sb3_h,"11"),(sb3_m,"00"),(sb_gap,"5")]:
+            sb.delete(0, tk.END); sb.insert(0,val)
+        for ent,val in [(ent_wait,"10"),(ent_gap,"1")]:
+            ent.delete(0, tk.END); ent.insert(0,val)
+        sb_workers.delete(0, tk.END); sb_workers.insert(0, "1")
+        mode_var.set("instant")
+        resume_var.set(False)
+        lean_var.set("--lean" in sys.argv)
+        for jid in daemon_jobs:              # servisteki işleri iptal et
+            try: daemon_cancel(jid)
+            except OSError: pass
+        daemon_jobs.clear()
+        on_finish.clear()
+        _progress_reset(0)
+        _close_driver()
+        btn_send.config(state=tk.NORMAL)
+        toast("Sıfırlandı ✓", 1500)
+
+    tk.Button(scroll_frame, text="Restart", bg="orange",
+              width=42, command=restart_all).pack(pady=(0,30))
+
+    # ----------------------------- ana işlev ------------------------------
+    def run_gui():
+        if txt_paste.get("1.0", tk.END).strip():   # eklenmemiş yapıştırılan numaralar
+            _add_pasted()
+        nums = recipients.numbers()
+        msg1 = txt_msg1.get("1.0", tk.END).strip()
+        msg2 = txt_msg2.get("1.0", tk.END).strip()
+        msg3 = txt_msg3.get("1.0", tk.END).strip()
+
+        if not nums or not msg1:
+            toast("Numara ve 1. mesaj zorunlu!", 2000); return
+
+        wait_s = int(ent_wait.get() or 10)
+        resume = resume_var.get()
+        global LEAN_MODE
+        LEAN_MODE = lean_var.get()              # sonraki tarayıcı başlatmada geçerli
+        btn_send.config(state=tk.DISABLED)
+
+        def _scheduled_msgs() -> List[Tuple[str,int,int,int,int,int]]:
+            year  = int(sb_year.get()); month = int(sb_month.get()); day = int(sb_day.get())
+            msgs: List[Tuple[str,int,int,int,int,int]] = [
+                (msg1, year, month, day, int(sb1_h.get()), int(sb1_m.get()))
+            ]
+            if msg2:
+                msgs.append((msg2, year, month, day, int(sb2_h.get()), int(sb2_m.get())))
+            if msg3:
+                msgs.append((msg3, year, month, day, int(sb3_h.get()), int(sb3_m.get())))
+            return msgs
+
+        # ------------------- SERVİS (DAEMON) MODU -----------------
+        if daemon_available():
+            if mode_var.get() == "instant":
+                jobs = [daemon_submit(nums, [msg1, msg2, msg3], wait_s,
+                                      float(ent_gap.get() or 1),
+                                      int(sb_workers.get() or 1), resume)]
+            else:
+                jobs = [daemon_submit(nums, [txt], wait_s, int(sb_gap.get()),
+                                      resume=resume,
+                                      at=datetime(y, mo, d, h, mi).timestamp())
+                        for txt, y, mo, d, h, mi in _scheduled_msgs()]
+            daemon_jobs[:] = [j["id"] for j in jobs]
+            _progress_reset(sum(j["total"] for j in jobs))
+            toast("Servise gönderildi: #" + ", #".join(map(str, daemon_jobs)), 2000)
+
+            def _watch():
+                if not daemon_jobs:               # Restart ile iptal edildi
+                    return
+                try:
+                    sts = [daemon_status(i) for i in daemon_jobs]
+                except OSError:
+                    toast("Servise ulaşılamıyor!", 2000)
+                    btn_send.config(state=tk.NORMAL); return
+                failed = sum(st["failed"] for st in sts)
+                prog.update(sum(st["sent"] for st in sts) + failed, failed)
+                pb.configure(value=prog.done)
+                lbl_prog.config(text=prog.text())
+                if all(st["status"] in ("done", "cancelled", "failed") for st in sts):
+                    daemon_jobs.clear()
+                    toast("Tüm mesajlar gönderildi ✓", 1500)
+                    btn_send.config(state=tk.NORMAL)
+                else:
+                    root.after(1000, _watch)
+            _watch()
+            return
+
+        def exit_app():
+            _close_driver()
+            try:
+                root.destroy()
+            finally:
+                import os
+                os._exit(0)
+
+        def _finished():
+            toast("Tüm mesajlar gönderildi ✓", 1500)
+            root.after(1500, exit_app)
+        on_finish[:] = [_finished]
+
+        # ---------------------- ANINDA MOD ------------------------
+        if mode_var.get() == "instant":
+            gap = float(ent_gap.get() or 1)
+            workers = int(sb_workers.get() or 1)
+            _progress_reset(len(nums))
+
+            def _job():                          # Tk'ye dokunmaz; yalnızca kuyruğa yazar
+                ok = False
+                try:
+                    send_bulk_multi(nums, [msg1, msg2, msg3], wait_s, gap,
+                                    workers=workers, resume=resume,
+                                    progress=_post_result)
+                    ok = True
+                except BaseException as e:      # SystemExit dahil: iş parçacığı sessizce ölmesin
+                    events.put(("alert", f"Gönderim durdu: {e or type(e).__name__}"))
+                finally:
+                    events.put(("done", ok))
+
+            threading.Thread(target=_job, daemon=True).start()
+            toast("Gönderim başladı…", 1500)
+
+        # ------------------- ZAMANLANMIŞ MOD ----------------------
+        else:
+            gap_sec = int(sb_gap.get())
+            msgs = _scheduled_msgs()
+            _progress_reset(len(nums) * len(msgs))
+
+            jobs = schedule_multiple_messages(
+                nums, msgs, gap_sec, wait_s, resume=resume,
+                alert=lambda m: events.put(("alert", m)),   # ısıtma uyarıları
+                progress=_post_result)
+            left, clean = [len(jobs)], [True]
+
+            def _job_done(fut):                  # zamanlayıcı iş parçacığında
+                err = None if fut.cancelled() else fut.exception()
+                if err is not None:
+                    clean[0] = False
+                    events.put(("alert", f"Gönderim durdu: {err or type(err).__name__}"))
+                left[0] -= 1
+                if not left[0]:
+                    events.put(("done", clean[0]))
+            for job in jobs:
+                job.future.add_done_callback(_job_done)
+            toast("Zamanlayıcılar ayarlandı…", 1500)
+
+    btn_send.config(command=run_gui)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Toplu WhatsApp mesaj gönderici — ince başlatıcı.
+
+Asıl kod whatsapp_bot.py içindedir: içe aktarılan modül bayt kodu önbelleğinden
+(__pycache__) yüklenir, böylece her çalıştırmada 4 bin satır yeniden derlenmez.
+
+    python whatsapp_bot_launcher.py --help
+"""
+
+from whatsapp_bot import main
+
+if __name__ == "__main__":
+    main()